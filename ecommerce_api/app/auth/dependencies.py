@@ -2,33 +2,50 @@ import logging
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.auth.models import User
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 
 # Set up module-level logger
 logger = logging.getLogger(__name__)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/signin")
 
+# Authenticated users keyed by user ID, so role checks skip the users table on hits
+user_cache = TTLCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS
+)
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
+
+def invalidate_user(user_id: int) -> None:
     """
-    Extracts and validates the current user from a JWT token.
+    Drops a user from the authentication cache.
+
+    Must be called after committing any change to a user's role, password or account.
+
+    Args:
+        user_id (int): ID of the user that changed.
+    """
+    user_cache.delete(user_id)
+
+
+def decode_user_id(token: str) -> int:
+    """
+    Validates a JWT access token and returns the user ID it was issued for.
 
     Args:
         token (str): The JWT access token extracted from the request.
-        db (Session): The database session for querying the user.
 
     Returns:
-        User: The authenticated user object.
+        int: The token subject as a user ID.
 
     Raises:
-        HTTPException: If token is invalid or user does not exist.
+        HTTPException: If the token is invalid.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -41,38 +58,132 @@ def get_current_user(
             logger.warning("Token missing 'sub' claim.")
             raise credentials_exception
     except JWTError as e:
-        logger.warning(f"JWT decoding failed: {str(e)}")
+        logger.warning("JWT decoding failed: %s", e)
         raise credentials_exception
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    if not user:
-        logger.warning(f"User not found for token subject: {user_id}")
+    try:
+        return int(user_id)
+    except (TypeError, ValueError):
+        logger.warning("Invalid token subject: %s", user_id)
         raise credentials_exception
+
+
+def cache_user(user_id: int, db_user: User) -> User:
+    """
+    Stores a detached copy of a freshly loaded user in `user_cache`.
+
+    Args:
+        user_id (int): The token subject.
+        db_user (User): The user row, or None if it does not exist.
+
+    Returns:
+        User: The cached copy (without the password hash).
+
+    Raises:
+        HTTPException: If the user does not exist.
+    """
+    if not db_user:
+        logger.warning("User not found for token subject: %s", user_id)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+        )
+    user = User(id=db_user.id, name=db_user.name, email=db_user.email, role=db_user.role)
+    user_cache.set(user_id, user)
     return user
 
 
-def get_current_admin_user(user: User = Depends(get_current_user)) -> User:
+def require_role(user: User, role: str) -> User:
     """
-    Verifies that the authenticated user has admin privileges.
+    Verifies that the authenticated user has the given role.
 
     Args:
         user (User): The currently authenticated user.
+        role (str): Required role, "admin" or "user".
 
     Returns:
-        User: The user object if admin.
+        User: The user object if the role matches.
 
     Raises:
-        HTTPException: If the user is not an admin.
+        HTTPException: If the user has a different role.
     """
-    if user.role != "admin":
-        logger.warning(f"Access denied for user {user.email} — requires admin role.")
+    if user.role != role:
+        logger.warning("Access denied for user %s — requires %s role.", user.email, role)
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin privileges required",
+            detail="Admin privileges required" if role == "admin" else "User privileges required",
         )
     return user
 
 
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Extracts and validates the current user from a JWT token.
+
+    Users are served from `user_cache` when possible. Cached entries are
+    detached copies without the password hash.
+
+    Args:
+        token (str): The JWT access token extracted from the request.
+        db (Session): The database session for querying the user.
+
+    Returns:
+        User: The authenticated user object.
+
+    Raises:
+        HTTPException: If token is invalid or user does not exist.
+    """
+    user_id = decode_user_id(token)
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
+    return cache_user(user_id, db.query(User).filter(User.id == user_id).first())
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """
+    Async variant of `get_current_user` for handlers running on the async engine.
+
+    Args:
+        token (str): The JWT access token extracted from the request.
+        db (AsyncSession): Async database session for querying the user.
+
+    Returns:
+        User: The authenticated user object.
+
+    Raises:
+        HTTPException: If token is invalid or user does not exist.
+    """
+    user_id = decode_user_id(token)
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
+    result = await db.execute(select(User).where(User.id == user_id))
+    return cache_user(user_id, result.scalars().first())
+
+
+def get_current_admin_user(user: User = Depends(get_current_user)) -> User:
+    """
+    Verifies that the authenticated user has admin privileges.
+
+    Args:
+        user (User): The currently authenticated user.
+
+    Returns:
+        User: The user object if admin.
+
+    Raises:
+        HTTPException: If the user is not an admin.
+    """
+    return require_role(user, "admin")
+
+
 def get_current_normal_user(user: User = Depends(get_current_user)) -> User:
     """
     Verifies that the authenticated user has a normal (non-admin) role.
@@ -86,10 +197,20 @@ def get_current_normal_user(user: User = Depends(get_current_user)) -> User:
     Raises:
         HTTPException: If the user is not a normal user.
     """
-    if user.role != "user":
-        logger.warning(f"Access denied for user {user.email} — requires user role.")
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="User privileges required",
-        )
-    return user
+    return require_role(user, "user")
+
+
+async def get_current_normal_user_async(user: User = Depends(get_current_user_async)) -> User:
+    """
+    Async variant of `get_current_normal_user`.
+
+    Args:
+        user (User): The currently authenticated user.
+
+    Returns:
+        User: The user object if role is 'user'.
+
+    Raises:
+        HTTPException: If the user is not a normal user.
+    """
+    return require_role(user, "user")
@@ -3,6 +3,7 @@ from datetime import datetime, timedelta , timezone
 
 from app.core.database import get_db
 from fastapi import APIRouter, HTTPException, Depends
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from jose import JWTError, jwt
@@ -18,11 +19,12 @@ from app.auth.schemas import (
     RefreshTokenRequest
 )
 from app.auth.utils import (
-    verify_password,
+    verify_and_update_password,
     create_access_token,
     create_refresh_token
 )
 
+from app.auth.dependencies import invalidate_user
 from app.auth.models import PasswordResetToken
 from app.core.config import settings
 
@@ -33,10 +35,13 @@ logger = logging.getLogger(__name__)
 
 
 @router.post("/signup", response_model=UserOut)
-def signup(user: UserCreate, db: Session = Depends(get_db)):
+async def signup(user: UserCreate, db: Session = Depends(get_db)):
     """
     Registers a new user with hashed password and role.
 
+    The handler is async so the bcrypt hash is awaited without holding a
+    request thread; the database calls run on the threadpool.
+
     Args:
         user (UserCreate): Incoming user data.
         db (Session): SQLAlchemy database session.
@@ -45,9 +50,9 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
         UserOut: The created user record.
 
     Raises:
-        HTTPException: If email already exists.
+        HTTPException: If email already exists, or 503 if password hashing is saturated.
     """
-    hashed_pw = utils.hash_password(user.password)
+    hashed_pw = await utils.hash_password(user.password)
     new_user = models.User(
         name=user.name,
         email=user.email,
@@ -56,21 +61,24 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
     )
     try:
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
-        logger.info(f"New user registered: {new_user.email} ({new_user.role})")
+        await run_in_threadpool(db.commit)
+        await run_in_threadpool(db.refresh, new_user)
+        logger.info("New user registered: %s (%s)", new_user.email, new_user.role.value)
         return new_user
     except IntegrityError:
-        db.rollback()
-        logger.warning(f"Signup failed: Email already exists - {user.email}")
+        await run_in_threadpool(db.rollback)
+        logger.warning("Signup failed: Email already exists - %s", user.email)
         raise HTTPException(status_code=400, detail="Email already registered")
 
 
 @router.post("/signin", response_model=TokenResponse)
-def signin(credentials: UserSignin, db: Session = Depends(get_db)):
+async def signin(credentials: UserSignin, db: Session = Depends(get_db)):
     """
     Authenticates a user and returns access + refresh tokens.
 
+    The handler is async so the bcrypt check is awaited without holding a
+    request thread; the database calls run on the threadpool.
+
     Args:
         credentials (UserSignin): Email and password.
         db (Session): Database session.
@@ -79,16 +87,31 @@ def signin(credentials: UserSignin, db: Session = Depends(get_db)):
         TokenResponse: JWT access and refresh tokens.
 
     Raises:
-        HTTPException: Invalid credentials.
+        HTTPException: Invalid credentials, or 503 if password hashing is saturated.
     """
-    user = db.query(models.User).filter(models.User.email == credentials.email).first()
+    user = await run_in_threadpool(
+        lambda: db.query(models.User).filter(models.User.email == credentials.email).first()
+    )
 
-    if not user or not verify_password(credentials.password, user.hashed_password):
-        logger.warning(f"Failed login attempt for {credentials.email}")
+    valid, new_hash = (False, None)
+    if user:
+        valid, new_hash = await verify_and_update_password(credentials.password, user.hashed_password)
+
+    if not valid:
+        logger.warning("Failed login attempt for %s", credentials.email)
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    logger.info(f"User signed in: {user.email}")
+    # Read before any commit expires the instance
     payload = {"sub": str(user.id), "role": user.role}
+    email = user.email
+
+    if new_hash:
+        # Cost factor changed since this hash was stored
+        user.hashed_password = new_hash
+        await run_in_threadpool(db.commit)
+        logger.info("Upgraded password hash for %s", email)
+
+    logger.info("User signed in: %s", email)
     access_token = create_access_token(payload)
     refresh_token = create_refresh_token(payload)
 
@@ -113,7 +136,7 @@ def forgot_password(req: ForgotPasswordRequest, db: Session = Depends(get_db)):
     """
     user = db.query(models.User).filter(models.User.email == req.email).first()
     if not user:
-        logger.warning(f"Password reset requested for unknown email: {req.email}")
+        logger.warning("Password reset requested for unknown email: %s", req.email)
         raise HTTPException(status_code=404, detail="User not found")
 
     token = utils.generate_reset_token()
@@ -128,15 +151,18 @@ def forgot_password(req: ForgotPasswordRequest, db: Session = Depends(get_db)):
     db.add(reset_entry)
     db.commit()
 
-    logger.info(f"Password reset token generated for {user.email}")
+    logger.info("Password reset token generated for %s", user.email)
     return {"message": "Reset token generated", "reset_token": token}
 
 
 @router.post("/reset-password")
-def reset_password(req: ResetPasswordRequest, db: Session = Depends(get_db)):
+async def reset_password(req: ResetPasswordRequest, db: Session = Depends(get_db)):
     """
     Resets a user's password using a valid reset token.
 
+    The handler is async so the bcrypt hash is awaited without holding a
+    request thread; the database calls run on the threadpool.
+
     Args:
         req (ResetPasswordRequest): Token and new password.
         db (Session): Database session.
@@ -145,28 +171,35 @@ def reset_password(req: ResetPasswordRequest, db: Session = Depends(get_db)):
         dict: Success message.
 
     Raises:
-        HTTPException: Invalid/expired token or user not found.
+        HTTPException: Invalid/expired token, user not found, or 503 if
+            password hashing is saturated.
     """
-    token_entry = db.query(PasswordResetToken).filter(
-        PasswordResetToken.token == req.token,
-        PasswordResetToken.used == False,
-        PasswordResetToken.expiration_time > datetime.now(timezone.utc) 
-    ).first()
+    token_entry = await run_in_threadpool(
+        lambda: db.query(PasswordResetToken).filter(
+            PasswordResetToken.token == req.token,
+            PasswordResetToken.used == False,
+            PasswordResetToken.expiration_time > datetime.now(timezone.utc)
+        ).first()
+    )
 
     if not token_entry:
         logger.warning("Invalid or expired reset token used.")
         raise HTTPException(status_code=400, detail="Invalid or expired token")
 
-    user = db.query(models.User).filter(models.User.id == token_entry.user_id).first()
+    user = await run_in_threadpool(
+        lambda: db.query(models.User).filter(models.User.id == token_entry.user_id).first()
+    )
     if not user:
         logger.error("User not found during password reset.")
         raise HTTPException(status_code=404, detail="User not found")
 
-    user.hashed_password = utils.hash_password(req.new_password)
+    user_id = user.id
+    user.hashed_password = await utils.hash_password(req.new_password)
     token_entry.used = True
-    db.commit()
+    await run_in_threadpool(db.commit)
+    invalidate_user(user_id)
 
-    logger.info(f"Password reset successful for user ID {user.id}")
+    logger.info("Password reset successful for user ID %s", user_id)
     return {"message": "Password has been reset successfully"}
 
 
@@ -199,10 +232,10 @@ def refresh_token(request: RefreshTokenRequest):
             raise credentials_exception
 
     except JWTError as e:
-        logger.warning(f"JWT decode failed in refresh: {str(e)}")
+        logger.warning("JWT decode failed in refresh: %s", e)
         raise credentials_exception
 
-    logger.info(f"Issued new access token for user ID {user_id}")
+    logger.info("Issued new access token for user ID %s", user_id)
     new_access_token = create_access_token(data={"sub": user_id, "role": role})
 
     return {
@@ -1,14 +1,146 @@
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta , timezone
+from typing import Optional
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
 from passlib.context import CryptContext 
 from jose import jwt
 from app.core.config import settings
+from app.core.metrics import BCRYPT_DURATION, BCRYPT_REJECTED
+import asyncio
+import multiprocessing
+import threading
+import time
 import uuid
 
 # Set up password hashing context using bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+# bcrypt runs in a dedicated process pool so logins can use every core without
+# holding the GIL. Handlers await the pool's futures, so a hash in progress
+# holds no request thread; callers beyond the workers plus the queue limit are
+# turned away instead of piling up.
+_hash_pool: Optional[ProcessPoolExecutor] = None
+_hash_pool_lock = threading.Lock()
+_hash_slots = threading.BoundedSemaphore(settings.BCRYPT_WORKERS + settings.BCRYPT_QUEUE_LIMIT)
+
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    """
+    Returns the password hashing pool, starting it on first use.
 
+    The workers are spawned rather than forked: by first use the server
+    already runs threads (the log listener, the request threadpool), and a
+    fork would copy their locks in whatever state they happen to be.
 
-def hash_password(password: str) -> str:
+    Returns:
+        ProcessPoolExecutor: Pool of `BCRYPT_WORKERS` worker processes.
+    """
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            _hash_pool = ProcessPoolExecutor(
+                max_workers=settings.BCRYPT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _hash_pool
+
+
+def shutdown_hash_pool() -> None:
+    """
+    Stops the password hashing worker processes, if they were started.
+    """
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is not None:
+            _hash_pool.shutdown(wait=True)
+            _hash_pool = None
+
+
+async def _run_bcrypt(fn, *args):
+    """
+    Runs a bcrypt function in the worker pool, or on the request threadpool
+    if the pool is disabled.
+
+    The pool's future is awaited, so no thread waits for the hash.
+
+    Args:
+        fn: Module-level function to run.
+        *args: Arguments for `fn`.
+
+    Returns:
+        The result of `fn`.
+
+    Raises:
+        HTTPException: 503 if the hashing queue is full.
+    """
+    started = time.perf_counter()
+    if settings.BCRYPT_WORKERS <= 0:
+        try:
+            return await run_in_threadpool(fn, *args)
+        finally:
+            BCRYPT_DURATION.labels(fn.__name__.lstrip("_")).observe(time.perf_counter() - started)
+    if not _hash_slots.acquire(blocking=False):
+        BCRYPT_REJECTED.inc()
+        raise HTTPException(
+            status_code=503,
+            detail="Authentication service busy, please retry",
+            headers={"Retry-After": "1"}
+        )
+    try:
+        return await asyncio.wrap_future(_get_hash_pool().submit(fn, *args))
+    finally:
+        _hash_slots.release()
+        BCRYPT_DURATION.labels(fn.__name__.lstrip("_")).observe(time.perf_counter() - started)
+
+
+def _bcrypt_rounds(hashed_pw: str) -> Optional[int]:
+    """
+    Extracts the cost factor from a bcrypt hash such as `$2b$12$...`.
+    """
+    try:
+        return int(hashed_pw.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def _hash(password: str) -> str:
+    """
+    Hashes a password in a bcrypt worker process.
+
+    Args:
+        password (str): Plain-text password.
+
+    Returns:
+        str: Bcrypt hash.
+    """
+    return pwd_context.hash(password)
+
+
+def _verify_and_update(plain_pw: str, hashed_pw: str) -> tuple[bool, Optional[str]]:
+    """
+    Verifies a password in a bcrypt worker process, rehashing it if its cost is outdated.
+
+    Args:
+        plain_pw (str): Password supplied by the user.
+        hashed_pw (str): Stored bcrypt hash.
+
+    Returns:
+        tuple[bool, Optional[str]]: Whether the password matches, and a new
+        hash at BCRYPT_ROUNDS if the stored one used a different cost.
+    """
+    if not pwd_context.verify(plain_pw, hashed_pw):
+        return False, None
+    if _bcrypt_rounds(hashed_pw) != settings.BCRYPT_ROUNDS:
+        return True, pwd_context.hash(plain_pw)
+    return True, None
+
+
+async def hash_password(password: str) -> str:
     """
     Hashes a plain-text password using bcrypt.
 
@@ -18,10 +150,10 @@ def hash_password(password: str) -> str:
     Returns:
         str: The securely hashed password.
     """
-    return pwd_context.hash(password)
+    return await _run_bcrypt(_hash, password)
 
 
-def verify_password(plain_pw: str, hashed_pw: str) -> bool:
+async def verify_password(plain_pw: str, hashed_pw: str) -> bool:
     """
     Verifies a plain-text password against a hashed one.
 
@@ -32,7 +164,22 @@ def verify_password(plain_pw: str, hashed_pw: str) -> bool:
     Returns:
         bool: True if the password is valid, False otherwise.
     """
-    return pwd_context.verify(plain_pw, hashed_pw)
+    return (await verify_and_update_password(plain_pw, hashed_pw))[0]
+
+
+async def verify_and_update_password(plain_pw: str, hashed_pw: str) -> tuple[bool, Optional[str]]:
+    """
+    Verifies a password and rehashes it if it used a different bcrypt cost.
+
+    Args:
+        plain_pw (str): The user's input password.
+        hashed_pw (str): The stored hashed password.
+
+    Returns:
+        tuple[bool, Optional[str]]: Whether the password is valid, and a
+        replacement hash to store if the cost factor has changed.
+    """
+    return await _run_bcrypt(_verify_and_update, plain_pw, hashed_pw)
 
 
 def create_token(data: dict, expires_delta: timedelta, secret_key: str) -> str:
@@ -0,0 +1,82 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.cart import routes, schemas
+from app.core.database import get_async_db
+from app.auth.dependencies import get_current_normal_user_async
+from app.auth.models import User
+
+# Async-mode counterpart of cart.routes; each handler runs the sync logic on the async engine
+router = APIRouter(prefix="/cart", tags=["Cart"])
+
+
+@router.post("/", response_model=schemas.CartOut)
+async def add_to_cart(
+    item: schemas.CartAdd,
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_normal_user_async)
+):
+    """
+    Async variant of `routes.add_to_cart`.
+    """
+    return await db.run_sync(lambda session: routes.add_to_cart(item, session, user))
+
+
+@router.get("/", response_model=list[schemas.CartOut])
+async def view_cart(
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_normal_user_async)
+):
+    """
+    Async variant of `routes.view_cart`.
+    """
+    return await db.run_sync(lambda session: routes.view_cart(session, user))
+
+
+@router.get("/summary", response_model=schemas.CartSummaryOut)
+async def cart_summary(
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_normal_user_async)
+):
+    """
+    Async variant of `routes.cart_summary`.
+    """
+    return await db.run_sync(lambda session: routes.cart_summary(session, user))
+
+
+@router.patch("/", response_model=list[schemas.CartOut])
+async def update_cart(
+    batch: schemas.CartBatchUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_normal_user_async)
+):
+    """
+    Async variant of `routes.update_cart`.
+    """
+    return await db.run_sync(lambda session: routes.update_cart(batch, session, user))
+
+
+@router.put("/{product_id}", response_model=schemas.CartOut)
+async def update_cart_quantity(
+    product_id: int,
+    item: schemas.CartQuantityUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_normal_user_async)
+):
+    """
+    Async variant of `routes.update_cart_quantity`.
+    """
+    return await db.run_sync(
+        lambda session: routes.update_cart_quantity(product_id, item, session, user)
+    )
+
+
+@router.delete("/{product_id}")
+async def remove_from_cart(
+    product_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_normal_user_async)
+):
+    """
+    Async variant of `routes.remove_from_cart`.
+    """
+    return await db.run_sync(lambda session: routes.remove_from_cart(product_id, session, user))
@@ -0,0 +1,100 @@
+from sqlalchemy.orm import Session
+from app.cart import models, schemas
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.products.models import Product
+
+# Cart summaries keyed by user ID. Dropped by the user's own cart writes and
+# checkout, and wholesale by admin product writes; the TTL bounds how long
+# stock changes from other users' checkouts take to show.
+summary_cache = TTLCache(
+    max_size=settings.CART_SUMMARY_CACHE_MAX_SIZE,
+    ttl=settings.CART_SUMMARY_CACHE_TTL_SECONDS
+)
+
+
+def get_summary(db: Session, user_id: int) -> schemas.CartSummaryOut:
+    """
+    Read-through lookup of a user's cart summary.
+
+    Args:
+        db (Session): Database session, used only on a cache miss.
+        user_id (int): ID of the cart owner.
+
+    Returns:
+        CartSummaryOut: Priced cart lines and totals.
+    """
+    summary = summary_cache.get(user_id)
+    if summary is None:
+        summary = load_summary(db, user_id)
+        summary_cache.set(user_id, summary)
+    return summary
+
+
+def load_summary(db: Session, user_id: int) -> schemas.CartSummaryOut:
+    """
+    Prices a user's cart with one query joining cart lines to their products.
+
+    Missing products and lines asking for more than the current stock are
+    flagged and left out of the total.
+
+    Args:
+        db (Session): Database session.
+        user_id (int): ID of the cart owner.
+
+    Returns:
+        CartSummaryOut: Priced cart lines and totals.
+    """
+    rows = (
+        db.query(
+            models.CartItem.product_id, models.CartItem.quantity,
+            Product.name, Product.price, Product.stock, Product.image_url
+        )
+        .outerjoin(Product, Product.id == models.CartItem.product_id)
+        .filter(models.CartItem.user_id == user_id)
+        .order_by(models.CartItem.id)
+        .all()
+    )
+
+    items = []
+    total = 0.0
+    for row in rows:
+        missing = row.price is None
+        out_of_stock = not missing and row.stock < row.quantity
+        line_total = None if missing else round(row.price * row.quantity, 2)
+        if not missing and not out_of_stock:
+            total += line_total
+        items.append(schemas.CartLineOut.model_construct(
+            product_id=row.product_id,
+            quantity=row.quantity,
+            name=row.name,
+            price=row.price,
+            image_url=row.image_url,
+            line_total=line_total,
+            missing=missing,
+            out_of_stock=out_of_stock
+        ))
+
+    return schemas.CartSummaryOut.model_construct(
+        items=items,
+        total_quantity=sum(row.quantity for row in rows),
+        total=round(total, 2),
+        ready_for_checkout=bool(items) and not any(item.missing or item.out_of_stock for item in items)
+    )
+
+
+def invalidate_summary(user_id: int) -> None:
+    """
+    Drops a user's cart summary. Call after committing any change to the cart.
+
+    Args:
+        user_id (int): ID of the cart owner.
+    """
+    summary_cache.delete(user_id)
+
+
+def invalidate_all() -> None:
+    """
+    Drops every cart summary. Call after committing product changes.
+    """
+    summary_cache.clear()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, Index
 from app.core.database import Base
 
 class CartItem(Base):
@@ -12,6 +12,9 @@ class CartItem(Base):
         quantity (int): Quantity of the product in the cart.
     """
     __tablename__ = "cart"
+    __table_args__ = (
+        Index("ix_cart_user_product", "user_id", "product_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -1,7 +1,10 @@
 import logging
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import case
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.orm import Session
-from app.cart import models, schemas
+from app.cart import cache, models, schemas
+from app.core.config import settings
 from app.core.database import get_db
 from app.auth.dependencies import get_current_normal_user
 from app.auth.models import User
@@ -19,6 +22,9 @@ def add_to_cart(
     """
     Adds a product to the user's cart. If the product already exists, updates the quantity.
 
+    Runs as a single `INSERT ... ON CONFLICT DO UPDATE` against the unique
+    (user_id, product_id) index, so concurrent adds never create duplicate lines.
+
     Args:
         item (CartAdd): Product ID and quantity to add.
         db (Session): Database session.
@@ -27,25 +33,21 @@ def add_to_cart(
     Returns:
         CartOut: Updated or newly added cart item.
     """
-    existing = db.query(models.CartItem).filter_by(
-        user_id=user.id, product_id=item.product_id
-    ).first()
-
-    if existing:
-        existing.quantity += item.quantity
-        logger.info(f"Updated quantity for product {item.product_id} in user {user.id}'s cart.")
-    else:
-        existing = models.CartItem(
-            user_id=user.id,
-            product_id=item.product_id,
-            quantity=item.quantity
-        )
-        db.add(existing)
-        logger.info(f"Added product {item.product_id} to user {user.id}'s cart.")
+    statement = insert(models.CartItem).values(
+        user_id=user.id,
+        product_id=item.product_id,
+        quantity=item.quantity
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[models.CartItem.user_id, models.CartItem.product_id],
+        set_={"quantity": models.CartItem.quantity + statement.excluded.quantity}
+    ).returning(models.CartItem.id, models.CartItem.product_id, models.CartItem.quantity)
 
+    cart_item = db.execute(statement).one()
     db.commit()
-    db.refresh(existing)
-    return existing
+    cache.invalidate_summary(user.id)
+    logger.info("Added %s of product %s to user %s's cart.", item.quantity, item.product_id, user.id)
+    return cart_item
 
 
 @router.get("/", response_model=list[schemas.CartOut])
@@ -66,6 +68,125 @@ def view_cart(
     return db.query(models.CartItem).filter_by(user_id=user.id).all()
 
 
+@router.get("/summary", response_model=schemas.CartSummaryOut)
+def cart_summary(
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_normal_user)
+):
+    """
+    Retrieves the cart priced at current product prices, with totals.
+
+    Lines and products are read with one joined query and cached per user
+    until the cart changes. Lines whose product was deleted or lacks stock
+    are flagged and excluded from the total.
+
+    Args:
+        db (Session): Database session.
+        user (User): Current authenticated user.
+
+    Returns:
+        Response: The cart as CartSummaryOut JSON.
+    """
+    return schemas.cart_summary_serializer.response(cache.get_summary(db, user.id), many=False)
+
+
+def fold_operations(operations: list[schemas.CartOperation]) -> tuple[dict[int, tuple[int, bool]], list[int]]:
+    """
+    Reduces a list of cart operations to one final change per product.
+
+    Args:
+        operations (list[CartOperation]): Operations in the order they apply.
+
+    Returns:
+        tuple: ({product_id: (quantity, replace)}, removed product IDs). With
+        `replace` False the quantity is added to the existing line.
+    """
+    changes = {}
+    for operation in operations:
+        current = changes.get(operation.product_id)
+        if operation.op == schemas.CartOperationType.remove:
+            changes[operation.product_id] = None
+        elif operation.op == schemas.CartOperationType.set:
+            changes[operation.product_id] = (operation.quantity, True)
+        elif operation.product_id not in changes:
+            changes[operation.product_id] = (operation.quantity, False)
+        elif current is None:
+            # Adding after a removal starts the line over
+            changes[operation.product_id] = (operation.quantity, True)
+        else:
+            changes[operation.product_id] = (current[0] + operation.quantity, current[1])
+
+    upserts = {product_id: change for product_id, change in changes.items() if change is not None}
+    removed = [product_id for product_id, change in changes.items() if change is None]
+    return upserts, removed
+
+
+@router.patch("/", response_model=list[schemas.CartOut])
+def update_cart(
+    batch: schemas.CartBatchUpdate,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_normal_user)
+):
+    """
+    Applies several add, set and remove operations to the cart in one transaction.
+
+    Operations are applied in order and folded into one change per product,
+    written with a single multi-row `INSERT ... ON CONFLICT DO UPDATE` and a
+    single DELETE. Removing a product that is not in the cart is a no-op.
+
+    Args:
+        batch (CartBatchUpdate): Operations to apply.
+        db (Session): Database session.
+        user (User): Current authenticated user.
+
+    Returns:
+        list[CartOut]: The whole cart after the update.
+
+    Raises:
+        HTTPException: If more than CART_MAX_OPERATIONS operations are given.
+    """
+    if len(batch.operations) > settings.CART_MAX_OPERATIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.CART_MAX_OPERATIONS} operations per request"
+        )
+
+    upserts, removed = fold_operations(batch.operations)
+    if upserts:
+        statement = insert(models.CartItem).values([
+            {"user_id": user.id, "product_id": product_id, "quantity": quantity}
+            for product_id, (quantity, _) in upserts.items()
+        ])
+        replaced = [product_id for product_id, (_, replace) in upserts.items() if replace]
+        added = models.CartItem.quantity + statement.excluded.quantity
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[models.CartItem.user_id, models.CartItem.product_id],
+            set_={"quantity": case(
+                (models.CartItem.product_id.in_(replaced), statement.excluded.quantity),
+                else_=added
+            ) if replaced else added}
+        ))
+    if removed:
+        db.query(models.CartItem).filter(
+            models.CartItem.user_id == user.id,
+            models.CartItem.product_id.in_(removed)
+        ).delete(synchronize_session=False)
+
+    # Plain rows rather than ORM objects, which the commit would expire
+    cart = (
+        db.query(models.CartItem.id, models.CartItem.product_id, models.CartItem.quantity)
+        .filter(models.CartItem.user_id == user.id)
+        .all()
+    )
+    db.commit()
+    cache.invalidate_summary(user.id)
+    logger.info(
+        "Applied %s cart operations for user %s (%s lines written, %s removed).",
+        len(batch.operations), user.id, len(upserts), len(removed)
+    )
+    return cart
+
+
 @router.put("/{product_id}", response_model=schemas.CartOut)
 def update_cart_quantity(
     product_id: int,
@@ -93,13 +214,14 @@ def update_cart_quantity(
     ).first()
     
     if not cart_item:
-        logger.warning(f"User {user.id} attempted to update non-existent cart item {product_id}.")
+        logger.warning("User %s attempted to update non-existent cart item %s.", user.id, product_id)
         raise HTTPException(status_code=404, detail="Item not found in cart")
 
     cart_item.quantity = item.quantity
     db.commit()
+    cache.invalidate_summary(user.id)
     db.refresh(cart_item)
-    logger.info(f"Updated quantity for cart item {product_id} for user {user.id}.")
+    logger.info("Updated quantity for cart item %s for user %s.", product_id, user.id)
     return cart_item
 
 
@@ -128,10 +250,11 @@ def remove_from_cart(
     ).first()
     
     if not cart_item:
-        logger.warning(f"User {user.id} attempted to delete non-existent cart item {product_id}.")
+        logger.warning("User %s attempted to delete non-existent cart item %s.", user.id, product_id)
         raise HTTPException(status_code=404, detail="Item not found in cart")
 
     db.delete(cart_item)
     db.commit()
-    logger.info(f"Removed product {product_id} from user {user.id}'s cart.")
+    cache.invalidate_summary(user.id)
+    logger.info("Removed product %s from user %s's cart.", product_id, user.id)
     return {"message": "Item removed from cart"}
@@ -1,4 +1,7 @@
-from pydantic import BaseModel, Field
+from enum import Enum
+from typing import List, Optional
+from pydantic import BaseModel, Field, model_validator
+from app.core.serialization import Serializer
 
 
 class CartAdd(BaseModel):
@@ -10,7 +13,7 @@ class CartAdd(BaseModel):
         quantity (int): Quantity of the product to add.
     """
     product_id: int
-    quantity: int
+    quantity: int = Field(..., gt=0, description="Quantity to add (must be > 0)")
 
 
 class CartOut(BaseModel):
@@ -39,3 +42,89 @@ class CartQuantityUpdate(BaseModel):
     """
     quantity: int = Field(..., gt=0, description="New quantity (must be > 0)")
 
+
+class CartOperationType(str, Enum):
+    """
+    Enum for the kinds of batched cart operations.
+
+    Attributes:
+        add (str): Add to the quantity, creating the line if needed.
+        set (str): Replace the quantity, creating the line if needed.
+        remove (str): Remove the line; a no-op if it does not exist.
+    """
+    add = "add"
+    set = "set"
+    remove = "remove"
+
+
+class CartOperation(BaseModel):
+    """
+    Schema for one operation of a batched cart update.
+
+    Fields:
+        op (CartOperationType): Operation to apply.
+        product_id (int): ID of the product the operation applies to.
+        quantity (int, optional): Quantity to add or set; required unless removing.
+    """
+    op: CartOperationType
+    product_id: int
+    quantity: Optional[int] = Field(None, gt=0)
+
+    @model_validator(mode="after")
+    def require_quantity(self) -> "CartOperation":
+        if self.op != CartOperationType.remove and self.quantity is None:
+            raise ValueError(f"quantity is required for '{self.op.value}'")
+        return self
+
+
+class CartBatchUpdate(BaseModel):
+    """
+    Schema for applying several cart operations at once.
+
+    Fields:
+        operations (List[CartOperation]): Operations, applied in order.
+    """
+    operations: List[CartOperation] = Field(..., min_length=1)
+
+
+class CartLineOut(BaseModel):
+    """
+    Schema for a cart line priced at the product's current price.
+
+    Fields:
+        product_id (int): ID of the product in the cart.
+        quantity (int): Quantity of the product in the cart.
+        name (str, optional): Product name; None if the product no longer exists.
+        price (float, optional): Current unit price; None if the product no longer exists.
+        image_url (str, optional): Product image; None if the product no longer exists.
+        line_total (float, optional): price * quantity; None if the product no longer exists.
+        missing (bool): Whether the product no longer exists.
+        out_of_stock (bool): Whether the product has less stock than the quantity.
+    """
+    product_id: int
+    quantity: int
+    name: Optional[str]
+    price: Optional[float]
+    image_url: Optional[str]
+    line_total: Optional[float]
+    missing: bool
+    out_of_stock: bool
+
+
+class CartSummaryOut(BaseModel):
+    """
+    Schema for the priced contents of a cart.
+
+    Fields:
+        items (List[CartLineOut]): Cart lines, oldest first.
+        total_quantity (int): Units across all lines.
+        total (float): Sum of the line totals of available lines.
+        ready_for_checkout (bool): Whether the cart is non-empty and no line is missing or out of stock.
+    """
+    items: List[CartLineOut]
+    total_quantity: int
+    total: float
+    ready_for_checkout: bool
+
+
+cart_summary_serializer = Serializer(CartSummaryOut)
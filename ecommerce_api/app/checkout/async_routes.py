@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.checkout import routes
+from app.core.database import get_async_db
+from app.auth.dependencies import get_current_normal_user_async
+from app.auth.models import User
+
+# Async-mode counterpart of checkout.routes; the handler runs the sync logic on the async engine
+router = APIRouter(prefix="/checkout", tags=["Checkout"])
+
+
+@router.post("/")
+async def checkout(
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_normal_user_async)
+):
+    """
+    Async variant of `routes.checkout`.
+    """
+    return await db.run_sync(lambda session: routes.checkout(session, user))
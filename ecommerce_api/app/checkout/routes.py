@@ -1,11 +1,15 @@
 import logging
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import delete, insert, select
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.auth.dependencies import get_current_normal_user
 from app.auth.models import User
+from app.cart.cache import invalidate_summary
 from app.cart.models import CartItem
 from app.orders.models import Order, OrderItem
+from app.products import cache as product_cache
+from app.products.inventory import reserve_stock
 from app.products.models import Product
 router = APIRouter(prefix="/checkout", tags=["Checkout"])
 logger = logging.getLogger(__name__)
@@ -19,6 +23,16 @@ def checkout(
     """
     Converts user's cart into a completed order and clears the cart.
 
+    The cart is claimed first: its rows are deleted with DELETE ... RETURNING,
+    which takes the database write lock, and only the returned rows are
+    priced and ordered. A concurrent checkout of the same cart waits for the
+    lock and then finds it empty, so one cart becomes at most one order.
+
+    Stock for every line is taken with one conditional UPDATE in the same
+    transaction as the order; if any product lacks stock nothing is written
+    (the cart is kept) and the whole order is rejected, so concurrent
+    checkouts cannot oversell.
+
     Args:
         db (Session): Database session.
         user (User): Authenticated user.
@@ -27,57 +41,61 @@ def checkout(
         dict: Success message with new order ID.
 
     Raises:
-        HTTPException: If the cart is empty or any product is not found.
+        HTTPException: If the cart is empty, any product is not found, or
+            any line has a non-positive quantity or more than the product's stock.
     """
-    cart_items = db.query(CartItem).filter(CartItem.user_id == user.id).all()
-
-    if not cart_items:
-        logger.warning(f"Checkout failed: Cart is empty for user {user.id}.")
+    # Cart clear, stock, order and items are written in a single transaction
+    quantities = dict(db.execute(
+        delete(CartItem)
+        .where(CartItem.user_id == user.id)
+        .returning(CartItem.product_id, CartItem.quantity)
+    ).all())
+
+    if not quantities:
+        db.rollback()
+        logger.warning("Checkout failed: Cart is empty for user %s.", user.id)
         raise HTTPException(status_code=400, detail="Cart is empty")
 
-    total = 0
-    for item in cart_items:
-        total += item.quantity * get_product_price(db, item.product_id)
+    prices = dict(db.execute(
+        select(Product.id, Product.price).where(Product.id.in_(quantities))
+    ).all())
+    missing = [product_id for product_id in quantities if product_id not in prices]
+    if missing:
+        db.rollback()
+        logger.warning("Products %s not found during checkout.", missing)
+        raise HTTPException(status_code=404, detail="Product not found")
 
-    new_order = Order(user_id=user.id, total_amount=total)
-    db.add(new_order)
-    db.commit()
-    db.refresh(new_order)
-    logger.info(f"New order {new_order.id} created for user {user.id} with total {total}.")
+    total = sum(quantity * prices[product_id] for product_id, quantity in quantities.items())
 
-    for item in cart_items:
-        price = get_product_price(db, item.product_id)
-        order_item = OrderItem(
-            order_id=new_order.id,
-            product_id=item.product_id,
-            quantity=item.quantity,
-            price_at_purchase=price
+    short = reserve_stock(db, quantities)
+    if short:
+        db.rollback()
+        logger.warning("Checkout failed: insufficient stock for products %s (user %s).", short, user.id)
+        raise HTTPException(
+            status_code=409,
+            detail=f"Insufficient stock for product(s): {', '.join(map(str, short))}"
         )
-        db.add(order_item)
 
-    db.query(CartItem).filter(CartItem.user_id == user.id).delete()
+    new_order = Order(user_id=user.id, total_amount=total)
+    db.add(new_order)
+    db.flush()
+
+    db.execute(
+        insert(OrderItem),
+        [
+            {
+                "order_id": new_order.id,
+                "product_id": product_id,
+                "quantity": quantity,
+                "price_at_purchase": prices[product_id],
+            }
+            for product_id, quantity in quantities.items()
+        ],
+    )
     db.commit()
-    logger.info(f"Cart cleared for user {user.id} after successful checkout.")
+    invalidate_summary(user.id)
+    for product_id in quantities:
+        product_cache.invalidate_product(product_id)
+    logger.info("New order %s created for user %s with total %s; cart cleared.", new_order.id, user.id, total)
 
     return {"message": "Checkout successful", "order_id": new_order.id}
-
-
-def get_product_price(db: Session, product_id: int) -> float:
-    """
-    Retrieves the current price of a product.
-
-    Args:
-        db (Session): Database session.
-        product_id (int): ID of the product.
-
-    Returns:
-        float: Current product price.
-
-    Raises:
-        HTTPException: If the product does not exist.
-    """
-    product = db.query(Product).filter(Product.id == product_id).first()
-    if not product:
-        logger.warning(f"Product {product_id} not found during checkout.")
-        raise HTTPException(status_code=404, detail="Product not found")
-    return product.price
@@ -0,0 +1,242 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    Thread-safe in-process cache with LRU eviction and per-entry expiry.
+
+    Attributes:
+        max_size (int): Maximum number of entries kept; the least recently used is evicted first.
+        ttl (float): Seconds an entry stays valid after it is stored.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that found nothing (or an expired entry).
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Returns the cached value for `key`, or None if it is missing or expired.
+
+        Args:
+            key (Hashable): Cache key.
+
+        Returns:
+            Any: The cached value, or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Stores `value` under `key`, evicting the least recently used entry if full.
+
+        Args:
+            key (Hashable): Cache key.
+            value (Any): Value to store; None cannot be cached.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """
+        Removes `key` from the cache if present.
+
+        Args:
+            key (Hashable): Cache key.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Removes every entry from the cache. Counters are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns a snapshot of the cache counters.
+
+        Returns:
+            dict: Current size, capacity, hits, misses and hit ratio.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class _Flight:
+    """
+    One in-progress load shared by every thread asking for the same key.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlightCache(TTLCache):
+    """
+    TTLCache whose misses are coalesced: concurrent lookups of the same
+    missing key run the loader once and all receive its result.
+
+    Errors raised by the loader are passed to every waiting caller and are
+    not cached. A caller that has waited `wait_timeout` seconds stops waiting
+    and runs the loader itself, so a stuck load cannot block a key forever.
+    A cache with max_size 0 stores nothing and loads every call.
+
+    Args:
+        max_size (int): Maximum number of entries.
+        ttl (float): Seconds an entry stays valid.
+        wait_timeout (float): Longest a caller waits on another caller's load.
+
+    Attributes:
+        coalesced (int): Lookups that waited on another caller's load instead of loading.
+    """
+
+    def __init__(self, max_size: int, ttl: float, wait_timeout: float = 10.0):
+        super().__init__(max_size, ttl)
+        self.wait_timeout = wait_timeout
+        self.coalesced = 0
+        self._flights: dict = {}
+        self._futures: dict = {}
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value for `key`, loading it once across threads on a miss.
+
+        Args:
+            key (Hashable): Cache key.
+            loader (Callable[[], Any]): Computes the value; must not return None.
+
+        Returns:
+            Any: The cached or loaded value.
+        """
+        if self.max_size <= 0:
+            return loader()
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            if not flight.done.wait(self.wait_timeout):
+                logger.warning("Gave up waiting %.1f s for a load of %r; loading directly.", self.wait_timeout, key)
+                return loader()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+            self.set(key, flight.value)
+            return flight.value
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    async def get_or_load_async(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async variant of `get_or_load`; coalesces callers on the running event loop.
+
+        Args:
+            key (Hashable): Cache key.
+            loader (Callable[[], Awaitable[Any]]): Coroutine function computing the value.
+
+        Returns:
+            Any: The cached or loaded value.
+        """
+        if self.max_size <= 0:
+            return await loader()
+        while True:
+            value = self.get(key)
+            if value is not None:
+                return value
+
+            future = self._futures.get(key)
+            if future is None:
+                break
+            with self._lock:
+                self.coalesced += 1
+            try:
+                return await asyncio.wait_for(asyncio.shield(future), self.wait_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Gave up waiting %.1f s for a load of %r; loading directly.", self.wait_timeout, key)
+                return await loader()
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The loading request was cancelled; try again
+
+        future = self._futures[key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await loader()
+        except Exception as error:
+            future.set_exception(error)
+            # Mark the exception as retrieved in case nobody was waiting
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            self.set(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            del self._futures[key]
+
+    def stats(self) -> dict:
+        """
+        Returns a snapshot of the cache counters.
+
+        Returns:
+            dict: TTLCache counters plus the number of coalesced lookups.
+        """
+        stats = super().stats()
+        stats["coalesced"] = self.coalesced
+        return stats
@@ -0,0 +1,213 @@
+import zlib
+from typing import Optional
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Content types worth compressing; images and already-compressed bodies are skipped
+COMPRESSIBLE_TYPES = (b"application/json", b"application/x-ndjson", b"text/")
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Picks the response encoding from an Accept-Encoding header.
+
+    Brotli is preferred when the `brotli` package is installed; codings the
+    client rejected with q=0 are never chosen.
+
+    Args:
+        accept_encoding (str): Raw Accept-Encoding header value.
+
+    Returns:
+        str: "br" or "gzip", or None to send the body uncompressed.
+    """
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip()] = quality
+
+    def allowed(coding: str) -> bool:
+        return accepted.get(coding, accepted.get("*", 0.0)) > 0
+
+    if brotli is not None and allowed("br"):
+        return "br"
+    if allowed("gzip"):
+        return "gzip"
+    return None
+
+
+class _Compressor:
+    """
+    Incremental compressor for one response body.
+
+    Args:
+        encoding (str): "br" or "gzip".
+    """
+
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._impl = brotli.Compressor(quality=settings.BROTLI_QUALITY)
+            self.compress, self._finish = self._impl.process, self._impl.finish
+        else:
+            # wbits=31 writes the gzip container instead of a raw zlib stream
+            self._impl = zlib.compressobj(settings.GZIP_LEVEL, zlib.DEFLATED, 31)
+            self.compress, self._finish = self._impl.compress, self._impl.flush
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing response bodies with brotli or gzip.
+
+    Bodies below COMPRESSION_MIN_SIZE, non-text content types and responses
+    that already carry a Content-Encoding are passed through. Streamed
+    bodies are compressed chunk by chunk. A strong ETag is weakened on
+    compressed responses, since the bytes differ from the identity
+    representation; If-None-Match uses weak comparison, so revalidation
+    keeps working.
+
+    Every response with a compressible content type gets
+    `Vary: Accept-Encoding`, including ones sent uncompressed (no accepted
+    coding, or a body below the size threshold), so a shared cache never
+    serves one client's representation to another.
+
+    Args:
+        app: The wrapped ASGI application.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or settings.COMPRESSION_MIN_SIZE <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        accept = next((value for name, value in scope["headers"] if name == b"accept-encoding"), b"")
+        encoding = choose_encoding(accept.decode("latin-1")) if accept else None
+
+        start = None
+        compressor = None
+
+        async def send_compressed(message):
+            nonlocal start, compressor
+            if message["type"] == "http.response.start":
+                headers = message.get("headers", [])
+                if is_compressible(dict(headers)):
+                    message = {**message, "headers": vary_on_encoding(headers)}
+                if encoding is None:
+                    await send(message)
+                else:
+                    start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                compressible = (
+                    is_compressible(dict(start.get("headers", [])))
+                    and (more_body or len(body) >= settings.COMPRESSION_MIN_SIZE)
+                )
+                if not compressible:
+                    await send(start)
+                    start = None
+                    await send(message)
+                    return
+                compressor = _Compressor(encoding)
+                start["headers"] = compressed_headers(start.get("headers", []), encoding)
+                if not more_body:
+                    compressed = compressor.compress(body) + compressor.finish()
+                    start["headers"].append((b"content-length", str(len(compressed)).encode()))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+                await send(start)
+
+            chunk = compressor.compress(body)
+            if not more_body:
+                chunk += compressor.finish()
+            if chunk or not more_body:
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+
+def is_compressible(headers: dict) -> bool:
+    """
+    Whether a response's body may be compressed, judging by its headers alone.
+
+    Args:
+        headers (dict): Raw response headers, keyed by lowercase name.
+
+    Returns:
+        bool: True for compressible content types without a Content-Encoding.
+    """
+    return (
+        headers.get(b"content-type", b"").startswith(COMPRESSIBLE_TYPES)
+        and b"content-encoding" not in headers
+    )
+
+
+def vary_on_encoding(headers) -> list:
+    """
+    Adds Accept-Encoding to the Vary header, merging with any existing value.
+
+    Args:
+        headers: Raw ASGI header pairs.
+
+    Returns:
+        list: New raw header pairs with a single Vary header.
+    """
+    rewritten = []
+    vary = None
+    for name, value in headers:
+        if name == b"vary":
+            vary = value
+            continue
+        rewritten.append((name, value))
+    if vary is None:
+        vary = b"Accept-Encoding"
+    elif b"accept-encoding" not in vary.lower() and vary.strip() != b"*":
+        vary += b", Accept-Encoding"
+    rewritten.append((b"vary", vary))
+    return rewritten
+
+
+def compressed_headers(headers, encoding: str) -> list:
+    """
+    Rewrites response headers for a compressed body.
+
+    Drops Content-Length (recomputed or streamed), weakens a strong ETag,
+    and adds Content-Encoding and Vary.
+
+    Args:
+        headers: Raw ASGI header pairs of the uncompressed response.
+        encoding (str): Chosen content coding.
+
+    Returns:
+        list: New raw header pairs.
+    """
+    rewritten = []
+    for name, value in headers:
+        if name == b"content-length":
+            continue
+        if name == b"etag" and not value.startswith(b"W/"):
+            value = b"W/" + value
+        rewritten.append((name, value))
+    rewritten.append((b"content-encoding", encoding.encode()))
+    return vary_on_encoding(rewritten)
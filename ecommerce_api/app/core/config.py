@@ -11,10 +11,123 @@ class Settings:
 
     Attributes:
         SECRET_KEY (str): Secret key used for signing JWTs and tokens.
+        DATABASE_URL (str): SQLAlchemy database URL.
+        DB_ASYNC (bool): Serve catalog, cart, checkout and orders with async handlers on an async engine.
+        DB_AUTO_MIGRATE (bool): Apply pending schema migrations at startup; when off, startup fails
+            until `python -m app.core.migrations` has been run.
+        SQLITE_JOURNAL_MODE (str): SQLite journal mode applied on connect (WAL lets readers run during writes).
+        SQLITE_SYNCHRONOUS (str): SQLite synchronous level (NORMAL is durable in WAL mode).
+        SQLITE_CACHE_SIZE (int): SQLite page cache size; negative values are KiB.
+        SQLITE_MMAP_SIZE (int): Bytes of the database file SQLite may memory-map.
+        SQLITE_BUSY_TIMEOUT_MS (int): Milliseconds to wait on a locked database before failing.
+        SQLITE_FOREIGN_KEYS (bool): Whether SQLite enforces foreign key constraints.
+        DB_POOL_SIZE (int): Connections kept open in the pool.
+        DB_MAX_OVERFLOW (int): Extra connections allowed beyond the pool size under load.
+            Keep DB_POOL_SIZE + DB_MAX_OVERFLOW above the request threadpool size (40):
+            sync sessions are returned from that threadpool, so a smaller pool can deadlock.
+        DB_POOL_TIMEOUT (float): Seconds to wait for a free connection before failing.
+        BCRYPT_ROUNDS (int): bcrypt cost factor; stored hashes are upgraded on login when it changes.
+        BCRYPT_WORKERS (int): Worker processes for password hashing (0 hashes inline).
+        BCRYPT_QUEUE_LIMIT (int): Hashing requests allowed to wait for a worker before returning 503.
+        BULK_IMPORT_CHUNK_SIZE (int): Rows validated and written per transaction during bulk import.
+        BULK_IMPORT_MAX_ERRORS (int): Maximum per-row errors listed in a bulk import report.
+        EXPORT_BATCH_SIZE (int): Rows fetched per batch when streaming a product export.
         ACCESS_TOKEN_EXPIRE_MINUTES (int): Duration in minutes before access tokens expire.
+        USER_CACHE_TTL_SECONDS (float): Lifetime of cached authenticated users.
+        USER_CACHE_MAX_SIZE (int): Maximum number of cached authenticated users.
+        PRODUCT_CACHE_TTL_SECONDS (float): Lifetime of cached products.
+        PRODUCT_CACHE_MAX_SIZE (int): Maximum number of cached products.
+        PRODUCT_CACHE_WARM_SIZE (int): Products loaded into the cache at startup (0 disables warm-up).
+        LISTING_CACHE_TTL_SECONDS (float): Lifetime of cached public listing pages.
+        LISTING_CACHE_MAX_SIZE (int): Maximum number of cached listing pages (0 disables the cache).
+        LISTING_CACHE_WAIT_SECONDS (float): Longest a listing request waits on a concurrent load of the
+            same page before running the query itself.
+        PRODUCT_BATCH_MAX_IDS (int): Maximum number of IDs accepted by one batch product lookup.
+        CART_MAX_OPERATIONS (int): Maximum number of operations in one batched cart update.
+        CART_SUMMARY_CACHE_TTL_SECONDS (float): Lifetime of cached cart summaries.
+        CART_SUMMARY_CACHE_MAX_SIZE (int): Maximum number of cached cart summaries.
+        IDEMPOTENCY_TTL_SECONDS (float): How long a stored response is replayed for its Idempotency-Key.
+        IDEMPOTENCY_LOCK_SECONDS (float): How long an in-flight key stays locked before a retry may take it over.
+        IDEMPOTENCY_WAIT_SECONDS (float): How long a duplicate waits for the in-flight request before getting a 409.
+        IDEMPOTENCY_POLL_SECONDS (float): Poll interval while waiting on a request held by another worker.
+        IDEMPOTENCY_SWEEP_SECONDS (float): Interval between sweeps deleting expired keys (0 disables).
+        CATALOG_CACHE_CONTROL (str): Cache-Control header on public catalog responses; the default
+            lets clients and CDNs store them but revalidate each time with If-None-Match.
+        COMPRESSION_MIN_SIZE (int): Response bodies at least this many bytes are compressed when the
+            client accepts it (brotli if installed, else gzip); 0 disables compression.
+        GZIP_LEVEL (int): zlib compression level for gzip responses (1-9).
+        BROTLI_QUALITY (int): Brotli quality for br responses (0-11); low values favour CPU.
+        SQL_DEBUG_HEADERS (bool): Add X-DB-Queries, X-DB-Time-ms and X-DB-Max-Repeats headers to responses.
+        SQL_REPEAT_THRESHOLD (int): Executions of one statement shape per request before an N+1 warning.
+        SQL_STRICT_QUERY_BUDGETS (bool): Raise instead of logging when a route exceeds its query budget (tests).
+        SLOW_REQUEST_MS (float): Requests slower than this are logged with their SQL statistics.
+        LOG_LEVEL (str): Root log level.
+        LOG_FORMAT (str): "json" for one JSON object per line, "text" for the plain format.
+        LOG_QUEUE_SIZE (int): Records buffered for the background log writer; 0 writes synchronously.
+            Records logged while the buffer is full are dropped and counted.
+        LOG_SAMPLE_RATES (str): Per-logger fraction of INFO records to keep, e.g.
+            "app.products.public_routes=0.01"; warnings and errors are never sampled.
     """
     SECRET_KEY = os.getenv("SECRET_KEY")
+    DATABASE_URL = os.getenv("DATABASE_URL")
+    DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() == "true"
+    DB_AUTO_MIGRATE = os.getenv("DB_AUTO_MIGRATE", "true").lower() == "true"
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", -64000))
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 268435456))
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+    SQLITE_FOREIGN_KEYS = os.getenv("SQLITE_FOREIGN_KEYS", "false").lower() == "true"
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 20))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 30))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+    BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", min(4, os.cpu_count() or 1)))
+    BCRYPT_QUEUE_LIMIT = int(os.getenv("BCRYPT_QUEUE_LIMIT", 16))
+    BULK_IMPORT_CHUNK_SIZE = int(os.getenv("BULK_IMPORT_CHUNK_SIZE", 1000))
+    BULK_IMPORT_MAX_ERRORS = int(os.getenv("BULK_IMPORT_MAX_ERRORS", 1000))
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
     ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
+    USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", 60))
+    USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", 10000))
+    PRODUCT_CACHE_TTL_SECONDS = float(os.getenv("PRODUCT_CACHE_TTL_SECONDS", 300))
+    PRODUCT_CACHE_MAX_SIZE = int(os.getenv("PRODUCT_CACHE_MAX_SIZE", 5000))
+    PRODUCT_CACHE_WARM_SIZE = int(os.getenv("PRODUCT_CACHE_WARM_SIZE", 1000))
+    LISTING_CACHE_TTL_SECONDS = float(os.getenv("LISTING_CACHE_TTL_SECONDS", 60))
+    LISTING_CACHE_MAX_SIZE = int(os.getenv("LISTING_CACHE_MAX_SIZE", 1000))
+    LISTING_CACHE_WAIT_SECONDS = float(os.getenv("LISTING_CACHE_WAIT_SECONDS", 10))
+    PRODUCT_BATCH_MAX_IDS = int(os.getenv("PRODUCT_BATCH_MAX_IDS", 300))
+    CART_MAX_OPERATIONS = int(os.getenv("CART_MAX_OPERATIONS", 200))
+    CART_SUMMARY_CACHE_TTL_SECONDS = float(os.getenv("CART_SUMMARY_CACHE_TTL_SECONDS", 30))
+    CART_SUMMARY_CACHE_MAX_SIZE = int(os.getenv("CART_SUMMARY_CACHE_MAX_SIZE", 10000))
+    IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", 86400))
+    IDEMPOTENCY_LOCK_SECONDS = float(os.getenv("IDEMPOTENCY_LOCK_SECONDS", 60))
+    IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", 10))
+    IDEMPOTENCY_POLL_SECONDS = float(os.getenv("IDEMPOTENCY_POLL_SECONDS", 0.05))
+    IDEMPOTENCY_SWEEP_SECONDS = float(os.getenv("IDEMPOTENCY_SWEEP_SECONDS", 300))
+    CATALOG_CACHE_CONTROL = os.getenv("CATALOG_CACHE_CONTROL", "public, no-cache")
+    COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+    GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", 6))
+    BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", 4))
+    SQL_DEBUG_HEADERS = os.getenv("SQL_DEBUG_HEADERS", "false").lower() == "true"
+    SQL_REPEAT_THRESHOLD = int(os.getenv("SQL_REPEAT_THRESHOLD", 5))
+    SQL_STRICT_QUERY_BUDGETS = os.getenv("SQL_STRICT_QUERY_BUDGETS", "false").lower() == "true"
+    SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", 500))
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+    LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
+
+    def validate(self) -> None:
+        """
+        Checks that the settings required to serve requests are present.
+
+        Raises:
+            RuntimeError: If a required setting is missing.
+        """
+        missing = [name for name in ("SECRET_KEY", "DATABASE_URL") if not getattr(self, name)]
+        if missing:
+            raise RuntimeError(f"Missing required settings: {', '.join(missing)}")
 
 
 # Global settings instance for import across the project
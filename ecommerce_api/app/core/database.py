@@ -1,39 +1,180 @@
-import os
-from sqlalchemy import create_engine
+import time
+from typing import Optional
+import anyio
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
+from app.core.config import settings
+from app.core.metrics import DB_SESSION_WAIT
 
-# Load environment variables from .env file
-load_dotenv()
 
-DATABASE_URL = os.getenv("DATABASE_URL")
+def apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    Applies the configured SQLite performance profile to a new connection.
+
+    Args:
+        dbapi_connection: Raw sqlite3 connection being opened.
+        connection_record: Pool record for the connection (unused).
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA cache_size={settings.SQLITE_CACHE_SIZE}")
+    cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA foreign_keys={'ON' if settings.SQLITE_FOREIGN_KEYS else 'OFF'}")
+    cursor.close()
+
+
+def create_db_engine(database_url: str) -> Engine:
+    """
+    Creates the application engine with the configured pool and SQLite profile.
+
+    Args:
+        database_url (str): SQLAlchemy database URL.
+
+    Returns:
+        Engine: Configured SQLAlchemy engine.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite":
+        return create_engine(
+            url,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_pre_ping=True
+        )
+
+    options = {"connect_args": {"check_same_thread": False}}  # SQLite-specific setting
+    if url.database not in (None, "", ":memory:"):
+        # File databases get a real queue pool; in-memory ones keep SQLAlchemy's default
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT
+        )
+    sqlite_engine = create_engine(url, **options)
+    event.listen(sqlite_engine, "connect", apply_sqlite_pragmas)
+    return sqlite_engine
 
-# Create SQLAlchemy engine (for SQLite, use connect_args for threading)
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False}  # SQLite-specific setting
-)
 
-# Creates a new session factory instance for each request
+def create_async_db_engine(database_url: str) -> AsyncEngine:
+    """
+    Creates an async engine for the same database, with the same pool and SQLite profile.
+
+    SQLite URLs are switched to the aiosqlite driver.
+
+    Args:
+        database_url (str): SQLAlchemy database URL.
+
+    Returns:
+        AsyncEngine: Configured async SQLAlchemy engine.
+    """
+    url = make_url(database_url)
+    if url.drivername == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT
+    }
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        options = {}
+    async_engine = create_async_engine(url, **options)
+    if url.get_backend_name() == "sqlite":
+        event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+    return async_engine
+
+
+# Engines are created on first use (normally the startup lifespan), so importing
+# the app never opens or configures a database
+engine: Optional[Engine] = None
+async_engine: Optional[AsyncEngine] = None
+
+# Session factories, bound to their engines by `get_engine`
 SessionLocal = sessionmaker(
     autocommit=False,
+    autoflush=False
+)
+AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
-    bind=engine
+    expire_on_commit=False
 )
 
+
+def get_engine() -> Engine:
+    """
+    Returns the application engine, creating the configured engines on first call.
+
+    Also binds `SessionLocal` (and `AsyncSessionLocal` in async mode).
+
+    Returns:
+        Engine: The sync engine for `DATABASE_URL`.
+    """
+    global engine, async_engine
+    if engine is None:
+        engine = create_db_engine(settings.DATABASE_URL)
+        SessionLocal.configure(bind=engine)
+    if settings.DB_ASYNC and async_engine is None:
+        async_engine = create_async_db_engine(settings.DATABASE_URL)
+        AsyncSessionLocal.configure(bind=async_engine)
+    return engine
+
+
+async def dispose_engines() -> None:
+    """
+    Closes every pooled connection and forgets the engines.
+
+    A later `get_engine` call creates fresh ones.
+    """
+    global engine, async_engine
+    if async_engine is not None:
+        await async_engine.dispose()
+        async_engine = None
+    if engine is not None:
+        engine.dispose()
+        engine = None
+
+
 # Declarative base class for all models
 Base = declarative_base()
 
-def get_db():
+# Sync handlers hop between threadpool threads (dependencies, handler, response
+# validation) while their session holds a pooled connection. Admitting at most
+# pool-capacity sessions at once, and waiting for a slot on the event loop rather
+# than in a thread, keeps requests from deadlocking on connection checkout.
+session_slots = anyio.Semaphore(settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW)
+
+
+async def get_db():
     """
     Provides a new SQLAlchemy database session for dependency injection.
-    
+
+    Waits for a free session slot without occupying a worker thread.
+
     Yields:
         Session: SQLAlchemy database session.
     """
-    db = SessionLocal()
-    try:
+    started = time.perf_counter()
+    async with session_slots:
+        DB_SESSION_WAIT.observe(time.perf_counter() - started)
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+
+async def get_async_db():
+    """
+    Provides a new async database session for dependency injection.
+
+    Yields:
+        AsyncSession: SQLAlchemy async database session.
+    """
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
+
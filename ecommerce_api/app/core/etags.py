@@ -0,0 +1,67 @@
+from typing import Optional
+from fastapi import Request, Response
+from app.core.config import settings
+
+
+def make_etag(*parts) -> str:
+    """
+    Builds a strong ETag from version components.
+
+    Args:
+        *parts: Values identifying the representation, e.g. an ID and a version.
+
+    Returns:
+        str: Quoted entity tag, e.g. '"p42.7"'.
+    """
+    return '"' + ".".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Checks the request's If-None-Match header against an ETag.
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match, so a
+    W/ prefix added by an intermediary still matches.
+
+    Args:
+        request (Request): Incoming request.
+        etag (str): Current entity tag of the resource.
+
+    Returns:
+        bool: True if the client's copy is current.
+    """
+    header: Optional[str] = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in header.split(","))
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: Optional[str] = None) -> None:
+    """
+    Adds ETag and Cache-Control headers to a response.
+
+    Args:
+        response (Response): Outgoing response.
+        etag (str): Entity tag of the representation.
+        cache_control (str, optional): Cache-Control value; defaults to CATALOG_CACHE_CONTROL.
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control or settings.CATALOG_CACHE_CONTROL
+
+
+def not_modified(etag: str, cache_control: Optional[str] = None) -> Response:
+    """
+    Builds an empty 304 response for a client whose copy is current.
+
+    Args:
+        etag (str): Entity tag the client sent.
+        cache_control (str, optional): Cache-Control value; defaults to CATALOG_CACHE_CONTROL.
+
+    Returns:
+        Response: 304 Not Modified with the validator headers.
+    """
+    response = Response(status_code=304)
+    set_cache_headers(response, etag, cache_control)
+    return response
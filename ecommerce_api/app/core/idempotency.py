@@ -0,0 +1,380 @@
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+import anyio
+from fastapi import HTTPException
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, String, Text, delete, select, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Engine, Row
+from app.auth.dependencies import decode_user_id
+from app.core.config import settings
+from app.core.database import Base, get_engine
+from app.core.metrics import IDEMPOTENT_REQUESTS
+from app.core.serialization import FastJSONResponse
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+REPLAYED_HEADER = (b"idempotent-replayed", b"true")
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+_VALID_KEY = re.compile(r"^[\x21-\x7e]{1,255}$")
+
+
+class IdempotencyRecord(Base):
+    """
+    SQLAlchemy model for the 'idempotency_keys' table.
+
+    A row is inserted when a request with a new key starts. It has no status
+    code while that request is in flight and stores the response once it
+    completes.
+
+    Attributes:
+        user_id (int): Owner of the key; keys are scoped per user.
+        key (str): Client-chosen Idempotency-Key header value.
+        fingerprint (str): Hash of the method, path, query and body of the first request.
+        status_code (int): Stored response status, None while in flight.
+        headers (str): Stored response headers as a JSON list of [name, value].
+        body (bytes): Stored response body.
+        expires_at (datetime): When the row may be swept or its key reused.
+    """
+    __tablename__ = "idempotency_keys"
+
+    user_id = Column(Integer, primary_key=True)
+    key = Column(String, primary_key=True)
+    fingerprint = Column(String, nullable=False)
+    status_code = Column(Integer, nullable=True)
+    headers = Column(Text, nullable=True)
+    body = Column(LargeBinary, nullable=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+def claim(engine: Engine, user_id: int, key: str, fingerprint: str) -> Optional[Row]:
+    """
+    Claims a key for a new request, unless a live row already holds it.
+
+    Expired rows, including in-flight rows left by a crashed worker, are
+    taken over.
+
+    Args:
+        engine (Engine): Application engine.
+        user_id (int): Owner of the key.
+        key (str): Idempotency key.
+        fingerprint (str): Fingerprint of the request.
+
+    Returns:
+        Row: The existing row's fingerprint, status_code, headers and body, or
+        None if the key was claimed.
+    """
+    now = datetime.now(timezone.utc)
+    statement = insert(IdempotencyRecord).values(
+        user_id=user_id,
+        key=key,
+        fingerprint=fingerprint,
+        expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS)
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[IdempotencyRecord.user_id, IdempotencyRecord.key],
+        set_={
+            "fingerprint": statement.excluded.fingerprint,
+            "status_code": None,
+            "headers": None,
+            "body": None,
+            "expires_at": statement.excluded.expires_at,
+        },
+        where=IdempotencyRecord.expires_at < now
+    ).returning(IdempotencyRecord.user_id)
+
+    with engine.begin() as conn:
+        if conn.execute(statement).first() is not None:
+            return None
+        row = conn.execute(
+            select(IdempotencyRecord.fingerprint, IdempotencyRecord.status_code,
+                   IdempotencyRecord.headers, IdempotencyRecord.body)
+            .where(IdempotencyRecord.user_id == user_id, IdempotencyRecord.key == key)
+        ).first()
+    return row
+
+
+def complete(engine: Engine, user_id: int, key: str, status_code: int, headers: list, body: bytes) -> None:
+    """
+    Stores the response of a claimed key for IDEMPOTENCY_TTL_SECONDS.
+
+    Args:
+        engine (Engine): Application engine.
+        user_id (int): Owner of the key.
+        key (str): Idempotency key.
+        status_code (int): Response status.
+        headers (list): Raw ASGI response header pairs.
+        body (bytes): Response body.
+    """
+    with engine.begin() as conn:
+        conn.execute(
+            update(IdempotencyRecord)
+            .where(IdempotencyRecord.user_id == user_id, IdempotencyRecord.key == key)
+            .values(
+                status_code=status_code,
+                headers=json.dumps([[name.decode("latin-1"), value.decode("latin-1")] for name, value in headers]),
+                body=body,
+                expires_at=datetime.now(timezone.utc) + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+            )
+        )
+
+
+def release(engine: Engine, user_id: int, key: str) -> None:
+    """
+    Frees a claimed key whose request failed, so a retry runs it again.
+
+    Args:
+        engine (Engine): Application engine.
+        user_id (int): Owner of the key.
+        key (str): Idempotency key.
+    """
+    with engine.begin() as conn:
+        conn.execute(
+            delete(IdempotencyRecord)
+            .where(IdempotencyRecord.user_id == user_id, IdempotencyRecord.key == key)
+        )
+
+
+def sweep_expired(engine: Engine) -> int:
+    """
+    Deletes every expired idempotency key.
+
+    Args:
+        engine (Engine): Application engine.
+
+    Returns:
+        int: Number of keys deleted.
+    """
+    with engine.begin() as conn:
+        return conn.execute(
+            delete(IdempotencyRecord).where(IdempotencyRecord.expires_at < datetime.now(timezone.utc))
+        ).rowcount
+
+
+async def run_sweeper(interval: float) -> None:
+    """
+    Sweeps expired idempotency keys every `interval` seconds until cancelled.
+
+    Args:
+        interval (float): Seconds between sweeps.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            swept = await anyio.to_thread.run_sync(sweep_expired, get_engine())
+            if swept:
+                logger.info("Swept %s expired idempotency keys.", swept)
+        except Exception:
+            logger.exception("Idempotency key sweep failed.")
+
+
+def fingerprint_request(scope, body: bytes) -> str:
+    """
+    Args:
+        scope: ASGI HTTP scope.
+        body (bytes): Full request body.
+
+    Returns:
+        str: Hash identifying the request, so a key cannot be reused for a different one.
+    """
+    digest = hashlib.sha256()
+    for part in (scope["method"].encode(), scope["path"].encode(), scope.get("query_string", b""), body):
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class IdempotencyMiddleware:
+    """
+    ASGI middleware making write requests safe to retry with an Idempotency-Key header.
+
+    The first request with a key runs normally and its response is stored;
+    any repeat with the same key and the same request gets the stored
+    response back without running the route again, marked with an
+    `Idempotent-Replayed: true` header. A duplicate that arrives while the
+    first is still running waits for it (up to IDEMPOTENCY_WAIT_SECONDS)
+    instead of racing it. Keys are scoped per user; 5xx responses are not
+    stored, so those requests can be retried. Requests without the header
+    or without a valid bearer token pass through untouched.
+
+    Args:
+        app: The wrapped ASGI application.
+        prefixes (tuple[str, ...]): Path prefixes whose write requests honour the header.
+    """
+
+    def __init__(self, app, prefixes: tuple[str, ...]):
+        self.app = app
+        self.prefixes = prefixes
+        # Requests in flight in this process, so local duplicates wake up
+        # as soon as the first finishes instead of polling
+        self._inflight: dict[tuple[int, str], asyncio.Event] = {}
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in WRITE_METHODS
+            or not scope["path"].startswith(self.prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        raw_key = headers.get(IDEMPOTENCY_HEADER)
+        user_id = self.user_id(headers.get(b"authorization", b""))
+        if raw_key is None or user_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = raw_key.decode("latin-1")
+        if not _VALID_KEY.match(key):
+            await FastJSONResponse(
+                {"detail": "Idempotency-Key must be 1-255 printable ASCII characters"}, status_code=400
+            )(scope, receive, send)
+            return
+
+        body, receive = await buffer_body(receive)
+        fingerprint = fingerprint_request(scope, body)
+        engine = get_engine()
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+
+        while True:
+            record = await anyio.to_thread.run_sync(claim, engine, user_id, key, fingerprint)
+            if record is None:
+                await self.execute(scope, receive, send, engine, user_id, key)
+                return
+            if record.fingerprint != fingerprint:
+                IDEMPOTENT_REQUESTS.labels("mismatch").inc()
+                await FastJSONResponse(
+                    {"detail": "Idempotency-Key was already used for a different request"}, status_code=422
+                )(scope, receive, send)
+                return
+            if record.status_code is not None:
+                IDEMPOTENT_REQUESTS.labels("replayed").inc()
+                logger.info("Replaying stored response for idempotency key %s of user %s.", key, user_id)
+                await replay(record, send)
+                return
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                IDEMPOTENT_REQUESTS.labels("in_progress").inc()
+                await FastJSONResponse(
+                    {"detail": "A request with this Idempotency-Key is still in progress"}, status_code=409
+                )(scope, receive, send)
+                return
+            event = self._inflight.get((user_id, key))
+            if event is not None:
+                with anyio.move_on_after(remaining):
+                    await event.wait()
+            else:
+                # Held by another worker process
+                await asyncio.sleep(min(settings.IDEMPOTENCY_POLL_SECONDS, remaining))
+
+    @staticmethod
+    def user_id(authorization: bytes) -> Optional[int]:
+        """
+        Args:
+            authorization (bytes): Raw Authorization header value.
+
+        Returns:
+            int: The bearer token's user ID, or None if there is no valid token.
+        """
+        scheme, _, token = authorization.decode("latin-1").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return None
+        try:
+            return decode_user_id(token)
+        except HTTPException:
+            return None
+
+    async def execute(self, scope, receive, send, engine: Engine, user_id: int, key: str) -> None:
+        """
+        Runs a request that claimed its key and stores its response.
+
+        The key is released instead if the request fails with a 5xx, raises
+        or is cancelled, and local duplicates waiting on it are woken up.
+
+        Args:
+            scope: ASGI HTTP scope.
+            receive: ASGI receive callable replaying the buffered body.
+            send: ASGI send callable.
+            engine (Engine): Application engine.
+            user_id (int): Owner of the key.
+            key (str): Idempotency key.
+        """
+        event = self._inflight[user_id, key] = asyncio.Event()
+        start = {}
+        chunks = []
+
+        async def send_and_capture(message):
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        stored = False
+        try:
+            await self.app(scope, receive, send_and_capture)
+            status_code = start.get("status", 500)
+            if status_code < 500:
+                await anyio.to_thread.run_sync(
+                    complete, engine, user_id, key, status_code, list(start.get("headers", [])), b"".join(chunks)
+                )
+                stored = True
+                IDEMPOTENT_REQUESTS.labels("executed").inc()
+        finally:
+            if not stored:
+                with anyio.CancelScope(shield=True):
+                    await anyio.to_thread.run_sync(release, engine, user_id, key)
+            del self._inflight[user_id, key]
+            event.set()
+
+
+async def buffer_body(receive):
+    """
+    Reads the whole request body and returns a receive callable that replays it.
+
+    Args:
+        receive: ASGI receive callable.
+
+    Returns:
+        tuple: (body bytes, replacement receive callable).
+    """
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        more_body = message.get("more_body", False)
+    body = b"".join(chunks)
+    replayed = False
+
+    async def replay_receive():
+        nonlocal replayed
+        if not replayed:
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return body, replay_receive
+
+
+async def replay(record, send) -> None:
+    """
+    Sends a stored response.
+
+    Args:
+        record: Row with status_code, headers and body.
+        send: ASGI send callable.
+    """
+    headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in json.loads(record.headers)]
+    await send({"type": "http.response.start", "status": record.status_code, "headers": headers + [REPLAYED_HEADER]})
+    await send({"type": "http.response.body", "body": record.body or b""})
@@ -0,0 +1,245 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Expanded IN lists differ only in their number of placeholders
+IN_LIST_PATTERN = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    Raised in strict mode when a request runs more statements than its budget.
+    """
+
+
+class QueryStats:
+    """
+    SQL statements executed while handling one request.
+
+    Attributes:
+        statements (int): Number of statements executed.
+        db_time (float): Seconds spent inside the database driver.
+        shapes (Counter): Execution count per normalized statement text.
+        executed (list, optional): (statement, parameters) of every statement,
+            kept only when capturing.
+        parent (QueryStats, optional): Enclosing stats that also receive every statement.
+    """
+
+    def __init__(self, capture: bool = False, parent: Optional["QueryStats"] = None):
+        self.statements = 0
+        self.db_time = 0.0
+        self.shapes: Counter = Counter()
+        self.executed: Optional[list] = [] if capture else None
+        self.parent = parent
+
+    def record(self, statement: str, elapsed: float, parameters=None) -> None:
+        """
+        Adds one executed statement.
+
+        Args:
+            statement (str): Parameterized SQL text as sent to the driver.
+            elapsed (float): Seconds the statement took.
+            parameters: Driver parameters, kept when capturing.
+        """
+        self.statements += 1
+        self.db_time += elapsed
+        self.shapes[normalize_statement(statement)] += 1
+        if self.executed is not None:
+            self.executed.append((statement, parameters))
+        if self.parent is not None:
+            self.parent.record(statement, elapsed, parameters)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """
+        Returns statement shapes that ran more than `threshold` times, most frequent first.
+
+        Args:
+            threshold (int): Executions allowed per shape.
+
+        Returns:
+            list[tuple[str, int]]: (shape, count) pairs.
+        """
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+
+current_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_stats", default=None)
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Reduces SQL text to its shape so repeated queries can be grouped.
+
+    Args:
+        statement (str): Parameterized SQL text.
+
+    Returns:
+        str: Statement with collapsed whitespace and IN lists.
+    """
+    statement = WHITESPACE_PATTERN.sub(" ", statement).strip()
+    return IN_LIST_PATTERN.sub("(?...)", statement)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """
+    Starts timing a statement when a request is being tracked.
+    """
+    if current_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """
+    Records a finished statement on the tracked request's stats.
+    """
+    stats = current_stats.get()
+    if stats is None:
+        return
+    started = conn.info.get("query_start_time")
+    if started:
+        stats.record(statement, time.perf_counter() - started.pop(), parameters)
+
+
+@event.listens_for(Engine, "handle_error")
+def handle_error(context):
+    """
+    Drops the start time of a statement that raised, since after_cursor_execute never runs for it.
+    """
+    if context.connection is None or context.execution_context is None or current_stats.get() is None:
+        return
+    started = context.connection.info.get("query_start_time")
+    if started:
+        started.pop()
+
+
+@contextmanager
+def track_queries(capture: bool = False) -> Iterator[QueryStats]:
+    """
+    Collects every statement executed in the current context.
+
+    The stats object is shared with threads and tasks started inside the
+    block, so sync route handlers running in the threadpool are counted too.
+    Blocks can nest: statements count towards every enclosing block, so a
+    test tracking a TestClient call also sees what the per-request
+    middleware records.
+
+    Args:
+        capture (bool): Also keep each statement with its parameters, e.g. to
+            EXPLAIN them in tests.
+
+    Yields:
+        QueryStats: Statistics filled in as statements run.
+    """
+    stats = QueryStats(capture, parent=current_stats.get())
+    token = current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_stats.reset(token)
+
+
+@contextmanager
+def assert_max_queries(budget: int) -> Iterator[QueryStats]:
+    """
+    Fails if the enclosed block executes more than `budget` statements.
+
+    Args:
+        budget (int): Maximum number of statements allowed.
+
+    Yields:
+        QueryStats: Statistics for the block.
+
+    Raises:
+        QueryBudgetExceeded: If the budget is exceeded.
+    """
+    with track_queries() as stats:
+        yield stats
+    if stats.statements > budget:
+        raise QueryBudgetExceeded(
+            f"Expected at most {budget} queries, got {stats.statements}: {dict(stats.shapes)}"
+        )
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware recording SQL statistics for every HTTP request.
+
+    Flags repeated statement shapes (likely N+1 queries) and slow requests in
+    the log, adds X-DB-* headers in debug mode and checks per-route query
+    budgets.
+
+    Args:
+        app: The wrapped ASGI application.
+        budgets (dict[str, int], optional): Maximum statements per route, keyed
+            by "METHOD /path/template". Exceeding one is logged, or raises
+            QueryBudgetExceeded when SQL_STRICT_QUERY_BUDGETS is enabled.
+    """
+
+    def __init__(self, app, budgets: Optional[dict[str, int]] = None):
+        self.app = app
+        self.budgets = budgets or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+
+        with track_queries() as stats:
+            async def send_with_headers(message):
+                if message["type"] == "http.response.start" and settings.SQL_DEBUG_HEADERS:
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-db-queries", str(stats.statements).encode()),
+                        (b"x-db-time-ms", f"{stats.db_time * 1000:.2f}".encode()),
+                        (b"x-db-max-repeats", str(max(stats.shapes.values(), default=0)).encode()),
+                    ]
+                await send(message)
+
+            await self.app(scope, receive, send_with_headers)
+
+        self.report(scope, stats, time.perf_counter() - started)
+
+    def report(self, scope, stats: QueryStats, elapsed: float) -> None:
+        """
+        Logs N+1 suspects and slow requests, and checks the route's query budget.
+
+        Args:
+            scope (dict): ASGI scope of the finished request.
+            stats (QueryStats): Statements recorded for the request.
+            elapsed (float): Wall-clock seconds spent handling the request.
+
+        Raises:
+            QueryBudgetExceeded: If the budget is exceeded in strict mode.
+        """
+        route = scope.get("route")
+        route_key = f"{scope['method']} {route.path if route is not None else scope['path']}"
+
+        for shape, count in stats.repeated(settings.SQL_REPEAT_THRESHOLD):
+            logger.warning("Possible N+1 in %s: statement ran %s times: %s", route_key, count, shape[:200])
+
+        if elapsed * 1000 >= settings.SLOW_REQUEST_MS:
+            top = stats.shapes.most_common(1)
+            logger.warning(
+                "Slow request %s: %.1f ms, %s queries, %.1f ms in DB%s",
+                route_key, elapsed * 1000, stats.statements, stats.db_time * 1000,
+                f", most frequent ({top[0][1]}x): {top[0][0][:200]}" if top else ""
+            )
+
+        budget = self.budgets.get(route_key)
+        if budget is not None and stats.statements > budget:
+            message = f"{route_key} ran {stats.statements} queries, budget is {budget}"
+            if settings.SQL_STRICT_QUERY_BUDGETS:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
@@ -0,0 +1,258 @@
+import json
+import logging
+import queue
+import random
+import re
+import sys
+import uuid
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+from app.core.config import settings
+
+# Correlation ID of the request being handled; "-" outside a request
+request_id: ContextVar[str] = ContextVar("request_id", default="-")
+
+REQUEST_ID_HEADER = b"x-request-id"
+# Incoming IDs are echoed into logs and headers, so only short, plain ones are trusted
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+# Argument types that can be formatted later on the listener thread without
+# the caller mutating them in between
+_IMMUTABLE_ARGS = (str, int, float, bool, type(None))
+
+# Attributes every LogRecord has; anything else was passed via `extra=`
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "request_id"}
+
+TEXT_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(request_id)s | %(message)s"
+
+_listener: Optional[QueueListener] = None
+# Root handler installed by `setup_logging`, and the handlers it replaced
+_handler: Optional[logging.Handler] = None
+_previous_handlers: list[logging.Handler] = []
+# Loggers currently carrying a SamplingFilter, so a reconfiguration can remove it
+_sampled: dict[str, logging.Filter] = {}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line.
+
+    Fields passed with `extra=` are included as top-level keys.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a fraction of a logger's INFO and DEBUG records.
+
+    Warnings and errors always pass, so only high-volume success paths are
+    thinned out.
+
+    Args:
+        rate (float): Fraction of records to keep, between 0 and 1.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
+
+class RequestQueueHandler(QueueHandler):
+    """
+    Hands records to the background listener without formatting them.
+
+    The request ID is captured here, on the request's own thread or task.
+    The message is only rendered up front when an argument could change
+    before the listener gets to it. When the queue is full the record is
+    dropped and counted rather than blocking the request.
+
+    Attributes:
+        dropped (int): Records discarded because the queue was full.
+    """
+
+    def __init__(self, log_queue: queue.SimpleQueue, limit: int):
+        super().__init__(log_queue)
+        self.limit = limit
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.request_id = request_id.get()
+        if record.args and not all(isinstance(arg, _IMMUTABLE_ARGS) for arg in record.args):
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            # Tracebacks pin frames that the caller may release, render them now
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        # SimpleQueue is unbounded but several times cheaper than a bounded
+        # Queue, so the limit is checked here instead
+        if self.queue.qsize() >= self.limit:
+            self.dropped += 1
+            return
+        self.queue.put_nowait(record)
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Stamps records with the current request ID (used by the synchronous handler).
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id.get()
+        return True
+
+
+def parse_sample_rates(value: str) -> dict[str, float]:
+    """
+    Parses LOG_SAMPLE_RATES, e.g. "app.products.public_routes=0.01,app.cart.routes=0.1".
+
+    Args:
+        value (str): Comma-separated logger=rate pairs.
+
+    Returns:
+        dict[str, float]: Sampling rate keyed by logger name.
+
+    Raises:
+        ValueError: If an entry is malformed or a rate is outside 0..1.
+    """
+    rates = {}
+    for entry in filter(None, (part.strip() for part in value.split(","))):
+        name, _, rate = entry.partition("=")
+        name, rate = name.strip(), float(rate)
+        if not 0 <= rate <= 1:
+            raise ValueError(f"Sampling rate for {name} must be between 0 and 1")
+        rates[name] = rate
+    return rates
+
+
+def setup_logging(stream=None) -> None:
+    """
+    Configures the root logger from LOG_* settings.
+
+    Records are formatted as JSON or text (LOG_FORMAT) and written by a
+    background thread fed through a bounded queue (LOG_QUEUE_SIZE; 0 writes
+    synchronously). Loggers listed in LOG_SAMPLE_RATES keep only that
+    fraction of their INFO records. Safe to call again: earlier handlers
+    and sampling filters are replaced. The root handlers found here are
+    put back by `stop_logging`.
+
+    Args:
+        stream (optional): Where log lines are written; defaults to stderr.
+    """
+    global _listener, _handler
+    stop_logging()
+
+    formatter = JsonFormatter() if settings.LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT)
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(formatter)
+
+    root = logging.getLogger()
+    _previous_handlers[:] = root.handlers
+    for handler in _previous_handlers:
+        root.removeHandler(handler)
+    root.setLevel(settings.LOG_LEVEL)
+
+    if settings.LOG_QUEUE_SIZE > 0:
+        log_queue = queue.SimpleQueue()
+        _handler = RequestQueueHandler(log_queue, settings.LOG_QUEUE_SIZE)
+        _listener = QueueListener(log_queue, output)
+        _listener.start()
+    else:
+        output.addFilter(RequestIdFilter())
+        _handler = output
+    root.addHandler(_handler)
+
+    for name, sampler in _sampled.items():
+        logging.getLogger(name).removeFilter(sampler)
+    _sampled.clear()
+    for name, rate in parse_sample_rates(settings.LOG_SAMPLE_RATES).items():
+        _sampled[name] = SamplingFilter(rate)
+        logging.getLogger(name).addFilter(_sampled[name])
+
+
+def stop_logging() -> None:
+    """
+    Undoes `setup_logging`: takes its handler off the root logger, puts back
+    the handlers it replaced, then stops the background listener after it
+    has written every queued record. Records logged afterwards go to the
+    restored handlers instead of a queue nobody drains.
+    """
+    global _listener, _handler
+    root = logging.getLogger()
+    if _handler is not None:
+        root.removeHandler(_handler)
+        _handler = None
+        for handler in _previous_handlers:
+            root.addHandler(handler)
+        _previous_handlers.clear()
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def dropped_records() -> int:
+    """
+    Returns:
+        int: Records dropped so far because the log queue was full.
+    """
+    return sum(h.dropped for h in logging.getLogger().handlers if isinstance(h, RequestQueueHandler))
+
+
+class RequestIdMiddleware:
+    """
+    ASGI middleware giving every request a correlation ID.
+
+    A well-formed incoming X-Request-ID header is reused, otherwise a new ID
+    is generated. The ID is available to every log record emitted while the
+    request is handled and is returned in the X-Request-ID response header.
+
+    Args:
+        app: The wrapped ASGI application.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = next((value for name, value in scope["headers"] if name == REQUEST_ID_HEADER), b"").decode("latin-1")
+        current = incoming if _VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex
+        token = request_id.set(current)
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(REQUEST_ID_HEADER, current.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id.reset(token)
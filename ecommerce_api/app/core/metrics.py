@@ -0,0 +1,202 @@
+import time
+from typing import Optional
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.cache import TTLCache
+from app.core.logs import dropped_records
+
+# Requests that matched no route share one label so unknown paths cannot
+# create unbounded series
+UNMATCHED_ROUTE = "unmatched"
+# Methods outside this set are reported as OTHER for the same reason
+STANDARD_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "CONNECT", "TRACE"})
+OTHER_METHOD = "OTHER"
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route and status code.",
+    ["method", "route", "status"]
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route.",
+    ["method", "route"]
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled."
+)
+DB_SESSION_WAIT = Histogram(
+    "db_session_wait_seconds",
+    "Time requests waited for a database session slot (pool capacity).",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+)
+DB_POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total",
+    "Connections checked out of the pool.",
+    ["engine"]
+)
+BCRYPT_DURATION = Histogram(
+    "bcrypt_duration_seconds",
+    "Time spent hashing or verifying passwords, including queueing for a worker.",
+    ["operation"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+IDEMPOTENT_REQUESTS = Counter(
+    "idempotent_requests_total",
+    "Write requests carrying an Idempotency-Key, by outcome.",
+    ["outcome"]
+)
+BCRYPT_REJECTED = Counter(
+    "bcrypt_rejected_total",
+    "Password operations turned away because the hashing queue was full."
+)
+
+# Label lookups take a lock inside prometheus_client; resolved children are
+# kept here so the hot path is a plain dict read
+_latency_children: dict = {}
+_request_children: dict = {}
+
+
+class RuntimeCollector:
+    """
+    Reports connection pool, cache and log queue state when /metrics is scraped.
+
+    Values are read from the live objects at scrape time, so nothing is
+    recorded on the request path.
+
+    Args:
+        engines (dict[str, Engine]): Engines to report, keyed by label.
+        caches (dict[str, TTLCache]): Caches to report, keyed by label.
+    """
+
+    def __init__(self, engines: dict[str, Engine], caches: dict[str, TTLCache]):
+        self.engines = engines
+        self.caches = caches
+
+    def collect(self):
+        """
+        Yields the current pool, cache and log queue metric families.
+        """
+        checked_out = GaugeMetricFamily("db_pool_checked_out", "Connections currently checked out.", labels=["engine"])
+        overflow = GaugeMetricFamily("db_pool_overflow", "Connections open beyond the pool size.", labels=["engine"])
+        size = GaugeMetricFamily("db_pool_size", "Configured pool size.", labels=["engine"])
+        for name, engine in self.engines.items():
+            pool = engine.pool
+            if not hasattr(pool, "checkedout"):
+                continue
+            checked_out.add_metric([name], pool.checkedout())
+            overflow.add_metric([name], max(pool.overflow(), 0))
+            size.add_metric([name], pool.size())
+        yield checked_out
+        yield overflow
+        yield size
+
+        hits = CounterMetricFamily("cache_hits", "Cache lookups served from memory.", labels=["cache"])
+        misses = CounterMetricFamily("cache_misses", "Cache lookups that missed.", labels=["cache"])
+        ratio = GaugeMetricFamily("cache_hit_ratio", "Hits divided by lookups since startup.", labels=["cache"])
+        entries = GaugeMetricFamily("cache_entries", "Entries currently cached.", labels=["cache"])
+        coalesced = CounterMetricFamily(
+            "cache_coalesced", "Misses that waited for a concurrent load instead of loading.", labels=["cache"]
+        )
+        for name, cache in self.caches.items():
+            stats = cache.stats()
+            hits.add_metric([name], stats["hits"])
+            misses.add_metric([name], stats["misses"])
+            ratio.add_metric([name], stats["hit_ratio"])
+            entries.add_metric([name], stats["size"])
+            if "coalesced" in stats:
+                coalesced.add_metric([name], stats["coalesced"])
+        yield hits
+        yield misses
+        yield ratio
+        yield entries
+        yield coalesced
+
+        dropped = CounterMetricFamily("log_records_dropped", "Log records discarded because the log queue was full.")
+        dropped.add_metric([], dropped_records())
+        yield dropped
+
+
+runtime_collector = RuntimeCollector({}, {})
+REGISTRY.register(runtime_collector)
+
+
+def register_runtime_metrics(engines: dict[str, Optional[Engine]], caches: dict[str, TTLCache]) -> None:
+    """
+    Starts reporting pool and cache metrics for the given engines and caches.
+
+    Called on every startup; engines replace those of a previous startup
+    under the same label.
+
+    Args:
+        engines (dict[str, Engine]): Engines keyed by label; None entries are skipped.
+        caches (dict[str, TTLCache]): Caches keyed by label.
+    """
+    for name, engine in engines.items():
+        if engine is None:
+            runtime_collector.engines.pop(name, None)
+            continue
+        checkouts = DB_POOL_CHECKOUTS.labels(name)
+        event.listen(engine, "checkout", lambda *args, counter=checkouts: counter.inc())
+        runtime_collector.engines[name] = engine
+    runtime_collector.caches.update(caches)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    Renders every registered metric in the Prometheus text format.
+
+    Returns:
+        tuple[bytes, str]: Response body and its content type.
+    """
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts, latency and in-flight requests.
+
+    Routes are labelled by their path template (e.g. /products/{product_id}),
+    never by the raw URL.
+
+    Args:
+        app: The wrapped ASGI application.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            method = scope["method"] if scope["method"] in STANDARD_METHODS else OTHER_METHOD
+            key = (method, route.path if route is not None else UNMATCHED_ROUTE)
+            latency = _latency_children.get(key)
+            if latency is None:
+                latency = _latency_children.setdefault(key, REQUEST_LATENCY.labels(*key))
+            latency.observe(time.perf_counter() - started)
+            counter_key = key + (status,)
+            counter = _request_children.get(counter_key)
+            if counter is None:
+                counter = _request_children.setdefault(counter_key, REQUESTS.labels(*key, str(status)))
+            counter.inc()
@@ -0,0 +1,180 @@
+import logging
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from app.core.database import Base
+from app.products.search import create_search_index, replace_update_trigger
+
+# Imported so every table is registered on Base.metadata for the baseline
+from app.auth import models as auth_models  # noqa: F401
+from app.cart import models as cart_models  # noqa: F401
+from app.core.idempotency import IdempotencyRecord
+from app.orders import models as order_models  # noqa: F401
+from app.products import models as product_models  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+
+def add_column(table: str, column: str, ddl: str):
+    """
+    Builds a migration step that adds a column unless it already exists.
+
+    Args:
+        table (str): Table to alter.
+        column (str): Name of the new column.
+        ddl (str): Column type and constraints, e.g. "VARCHAR".
+
+    Returns:
+        Callable[[Connection], None]: The migration step.
+    """
+    def step(conn: Connection) -> None:
+        columns = {row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+        if column not in columns:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+    return step
+
+
+# Ordered schema migrations as (version, description, steps). A step is
+# either a SQL string or a callable taking the connection. Steps must be
+# idempotent because fresh databases get the model-declared schema from
+# create_all (the baseline) before every migration runs.
+MIGRATIONS = [
+    (
+        1,
+        "Indexes for hot query shapes and unique cart lines",
+        [
+            # Merge duplicate cart lines so the unique index can be built
+            """
+            UPDATE cart SET quantity = (
+                SELECT SUM(dup.quantity) FROM cart AS dup
+                WHERE dup.user_id = cart.user_id AND dup.product_id = cart.product_id
+            )
+            WHERE id IN (SELECT MIN(id) FROM cart GROUP BY user_id, product_id HAVING COUNT(*) > 1)
+            """,
+            """
+            DELETE FROM cart WHERE id NOT IN (
+                SELECT MIN(id) FROM cart GROUP BY user_id, product_id
+            )
+            """,
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_cart_user_product ON cart (user_id, product_id)",
+            "CREATE INDEX IF NOT EXISTS ix_orders_user_created ON orders (user_id, created_at, id)",
+            "CREATE INDEX IF NOT EXISTS ix_order_items_order_id ON order_items (order_id)",
+            "CREATE INDEX IF NOT EXISTS ix_products_category_price ON products (category, price)",
+            "CREATE INDEX IF NOT EXISTS ix_products_price ON products (price)",
+            "CREATE INDEX IF NOT EXISTS ix_products_name ON products (name)",
+        ],
+    ),
+    (
+        2,
+        "External SKU on products for bulk upserts",
+        [
+            add_column("products", "sku", "VARCHAR"),
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_products_sku ON products (sku)",
+        ],
+    ),
+    (
+        3,
+        "Full-text search index on products",
+        [create_search_index],
+    ),
+    (
+        4,
+        "Product and catalog versions for ETags",
+        [
+            add_column("products", "version", "INTEGER NOT NULL DEFAULT 1"),
+            "INSERT OR IGNORE INTO catalog_version (id, version) VALUES (1, 1)",
+        ],
+    ),
+    (
+        5,
+        "Idempotency keys for retried writes",
+        [lambda conn: IdempotencyRecord.__table__.create(conn, checkfirst=True)],
+    ),
+    (
+        6,
+        "Reindex products for search only when indexed columns change",
+        [replace_update_trigger],
+    ),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(engine: Engine) -> int:
+    """
+    Reads the applied schema version from the database without writing to it.
+
+    Args:
+        engine (Engine): Engine bound to the application database.
+
+    Returns:
+        int: The applied version, or 0 if no migration has run yet.
+    """
+    if not inspect(engine).has_table("schema_version"):
+        return 0
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT MAX(version) FROM schema_version")).scalar() or 0
+
+
+def run_migrations(engine: Engine) -> int:
+    """
+    Applies every pending migration, each in its own transaction.
+
+    Tables missing from the database (all of them, for a new database) are
+    first created from the models; this is the baseline the migrations build on.
+
+    Args:
+        engine (Engine): Engine bound to the application database.
+
+    Returns:
+        int: The schema version after migrating.
+    """
+    with engine.begin() as conn:
+        Base.metadata.create_all(bind=conn)
+        conn.execute(text("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)"))
+
+    current = get_schema_version(engine)
+    for version, description, statements in MIGRATIONS:
+        if version <= current:
+            continue
+        with engine.begin() as conn:
+            for statement in statements:
+                if callable(statement):
+                    statement(conn)
+                else:
+                    conn.execute(text(statement))
+            conn.execute(text("INSERT INTO schema_version (version) VALUES (:v)"), {"v": version})
+        logger.info("Applied migration %s: %s", version, description)
+        current = version
+    return current
+
+
+def ensure_schema(engine: Engine, migrate: bool) -> int:
+    """
+    Checks that the database schema is current, migrating it if allowed.
+
+    Args:
+        engine (Engine): Engine bound to the application database.
+        migrate (bool): Apply pending migrations instead of failing.
+
+    Returns:
+        int: The schema version in use.
+
+    Raises:
+        RuntimeError: If migrations are pending and `migrate` is False.
+    """
+    version = get_schema_version(engine)
+    if version >= LATEST_VERSION:
+        return version
+    if not migrate:
+        raise RuntimeError(
+            f"Database schema is at version {version}, expected {LATEST_VERSION}. "
+            f"Run `python -m app.core.migrations` first."
+        )
+    return run_migrations(engine)
+
+
+if __name__ == "__main__":
+    from app.core.database import get_engine
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(name)s | %(message)s")
+    print(f"Schema version: {run_migrations(get_engine())}")
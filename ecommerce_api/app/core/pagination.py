@@ -0,0 +1,53 @@
+import base64
+import json
+from fastapi import HTTPException
+
+# Types a sort value may have in a cursor; bool is excluded below
+SCALAR_TYPES = (str, int, float)
+
+
+def encode_cursor(values: list) -> str:
+    """
+    Encodes the sort key of the last row on a page into an opaque cursor token.
+
+    Args:
+        values (list): JSON-serializable key values, e.g. [sort_value, id].
+
+    Returns:
+        str: URL-safe base64 token to hand back to the client.
+    """
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, size: int) -> list:
+    """
+    Decodes a cursor token produced by `encode_cursor`.
+
+    The token must hold a list of exactly `size` values: scalar sort values
+    (string or number) followed by an integer row ID. Anything else would
+    reach the keyset comparison as an unbindable parameter.
+
+    Args:
+        token (str): Opaque cursor token received from the client.
+        size (int): Number of key values the cursor is expected to carry.
+
+    Returns:
+        list: The decoded key values.
+
+    Raises:
+        HTTPException: If the token is malformed or holds unexpected values.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    *sort_values, last_id = values
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if any(not isinstance(value, SCALAR_TYPES) or isinstance(value, bool) for value in sort_values):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
@@ -0,0 +1,142 @@
+import inspect
+import json
+from datetime import date, datetime
+from enum import Enum
+from operator import attrgetter
+from typing import Any, Iterable, Optional, get_args, get_origin
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encodes content as compact UTF-8 JSON, with orjson when it is installed.
+
+    Both encoders write datetimes in ISO 8601 and enums as their value.
+
+    Args:
+        content (Any): JSON-compatible data, datetimes and enums.
+
+    Returns:
+        bytes: Encoded JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with `dumps`; the application's default response class.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class Serializer:
+    """
+    Precompiled serializer turning trusted objects into a response schema's JSON.
+
+    The schema's fields are resolved once; each object is then read with a
+    single attrgetter call, with no per-field validation. Use it for values
+    that already have the schema's types: ORM rows, result rows or cached
+    schema instances. Nested schema fields (a model or a list of models) get
+    their own serializer.
+
+    Args:
+        schema (type[BaseModel]): Response schema whose fields are emitted, in order.
+    """
+
+    def __init__(self, schema: type[BaseModel]):
+        self.schema = schema
+        self.fields = tuple(schema.model_fields)
+        getter = attrgetter(*self.fields)
+        self.getter = getter if len(self.fields) > 1 else (lambda obj: (getter(obj),))
+        self.nested = {}
+        for name, field in schema.model_fields.items():
+            annotation = field.annotation
+            if get_origin(annotation) is list and _is_model(get_args(annotation)[0]):
+                self.nested[name] = (Serializer(get_args(annotation)[0]), True)
+            elif _is_model(annotation):
+                self.nested[name] = (Serializer(annotation), False)
+
+    def one(self, obj: Any) -> dict:
+        """
+        Args:
+            obj (Any): Object exposing the schema's fields as attributes.
+
+        Returns:
+            dict: The object's fields, ready for `dumps`.
+        """
+        values = dict(zip(self.fields, self.getter(obj)))
+        for name, (serializer, many) in self.nested.items():
+            value = values[name]
+            if value is not None:
+                values[name] = serializer.many(value) if many else serializer.one(value)
+        return values
+
+    def many(self, objs: Iterable[Any]) -> list[dict]:
+        """
+        Args:
+            objs (Iterable[Any]): Objects exposing the schema's fields.
+
+        Returns:
+            list[dict]: One dict per object.
+        """
+        if not self.nested:
+            fields, getter = self.fields, self.getter
+            return [dict(zip(fields, getter(obj))) for obj in objs]
+        return [self.one(obj) for obj in objs]
+
+    def response(self, content: Any, response: Optional[Response] = None, many: bool = True) -> Response:
+        """
+        Builds the JSON response for one object or a list of them.
+
+        FastAPI skips `response_model` validation when a route returns a
+        Response, so headers set on the injected `response` are copied over.
+
+        Args:
+            content (Any): The object, or the objects when `many` is True.
+            response (Response, optional): Injected response holding headers to keep.
+            many (bool): Whether `content` is a list of objects.
+
+        Returns:
+            Response: application/json response.
+        """
+        return json_response(dumps(self.many(content) if many else self.one(content)), response)
+
+
+def json_response(body: bytes, response: Optional[Response] = None) -> Response:
+    """
+    Wraps an already encoded JSON body in a response.
+
+    Args:
+        body (bytes): Encoded JSON.
+        response (Response, optional): Injected response holding headers to keep.
+
+    Returns:
+        Response: application/json response.
+    """
+    result = Response(content=body, media_type="application/json")
+    if response is not None:
+        result.headers.raw.extend(response.headers.raw)
+    return result
+
+
+def _is_model(annotation: Any) -> bool:
+    return inspect.isclass(annotation) and issubclass(annotation, BaseModel)
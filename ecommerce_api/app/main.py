@@ -1,28 +1,173 @@
+import asyncio
 import logging
-from fastapi import FastAPI
-from app.core.database import Base, engine
+import time
+from contextlib import asynccontextmanager, contextmanager
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from app.auth.dependencies import user_cache
+from app.auth.utils import shutdown_hash_pool
+from app.core.config import settings
+from app.core import database
+from app.core.database import SessionLocal, dispose_engines, get_engine
+from app.core.compression import CompressionMiddleware
+from app.core.idempotency import IdempotencyMiddleware, run_sweeper
+from app.core.instrumentation import QueryStatsMiddleware
+from app.core.logs import RequestIdMiddleware, setup_logging, stop_logging
+from app.core.metrics import MetricsMiddleware, register_runtime_metrics, render_metrics
+from app.core.migrations import ensure_schema
+from app.core.serialization import FastJSONResponse
+from app.cart.cache import summary_cache
+from app.products.cache import listing_cache, product_cache, warm_up
 
 from app.auth.routes import router as auth_router
 from app.products.routes import router as product_router
-from app.products.public_routes import router as public_product_router
-from app.cart.routes import router as cart_router
-from app.checkout.routes import router as checkout_router
-from app.orders.routes import router as orders_router
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s"
-)
+if settings.DB_ASYNC:
+    from app.products.async_public_routes import router as public_product_router
+    from app.cart.async_routes import router as cart_router
+    from app.checkout.async_routes import router as checkout_router
+    from app.orders.async_routes import router as orders_router
+else:
+    from app.products.public_routes import router as public_product_router
+    from app.cart.routes import router as cart_router
+    from app.checkout.routes import router as checkout_router
+    from app.orders.routes import router as orders_router
 
 logger = logging.getLogger(__name__)
 
+# Maximum SQL statements per request, keyed by "METHOD /path". Counts assume
+# a cold user cache (one lookup for the bearer token). Set
+# SQL_STRICT_QUERY_BUDGETS=true in tests to turn overruns into failures.
+QUERY_BUDGETS = {
+    "POST /auth/signup": 2,
+    "POST /auth/signin": 2,
+    "POST /auth/forgot-password": 3,
+    "POST /auth/reset-password": 5,
+    "POST /auth/refresh": 0,
+    "POST /admin/products/": 4,
+    "GET /admin/products/": 2,
+    "GET /admin/products/{product_id}": 2,
+    "PUT /admin/products/{product_id}": 5,
+    "DELETE /admin/products/{product_id}": 4,
+    "GET /products/": 3,
+    "GET /products/search": 2,
+    "GET /products/batch": 2,
+    "POST /products/batch": 1,
+    "GET /products/{product_id}": 1,
+    "POST /cart/": 2,
+    "GET /cart/": 2,
+    "GET /cart/summary": 2,
+    "PATCH /cart/": 4,
+    "PUT /cart/{product_id}": 3,
+    "DELETE /cart/{product_id}": 3,
+    "POST /checkout/": 7,
+    "GET /orders/": 3,
+    "GET /orders/summary": 2,
+    "GET /orders/{order_id}": 3,
+}
+
+
+@contextmanager
+def startup_phase(name: str, timings: dict):
+    """
+    Times one startup phase and logs its duration.
+
+    Args:
+        name (str): Phase name.
+        timings (dict): Collects the duration in milliseconds under `name`.
+    """
+    started = time.perf_counter()
+    yield
+    timings[name] = round((time.perf_counter() - started) * 1000, 2)
+    logger.info("Startup phase '%s' finished in %s ms.", name, timings[name])
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Brings the service up in explicit phases and releases resources on shutdown.
+
+    Nothing touches the database or starts a thread at import time. Startup
+    configures logging (its writer thread is stopped last on shutdown), then
+    runs config validation, engine creation, the schema-version check
+    (migrating when DB_AUTO_MIGRATE is on), cache warm-up and finally marks
+    the app ready.
+
+    The bcrypt worker processes are started by the server process, so they
+    must be joined on shutdown or they would outlive it.
+    """
+    setup_logging()
+    logger.info("Serving %s-mode routes.", "async" if settings.DB_ASYNC else "sync")
+    timings = {}
+    app.state.ready = False
+
+    with startup_phase("config", timings):
+        settings.validate()
+
+    with startup_phase("engine", timings):
+        engine = get_engine()
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        register_runtime_metrics(
+            engines={
+                "sync": engine,
+                "async": database.async_engine.sync_engine if database.async_engine is not None else None
+            },
+            caches={
+                "user": user_cache,
+                "product": product_cache,
+                "listing": listing_cache,
+                "cart_summary": summary_cache
+            }
+        )
+
+    with startup_phase("schema", timings):
+        app.state.schema_version = ensure_schema(engine, migrate=settings.DB_AUTO_MIGRATE)
+
+    with startup_phase("warm_up", timings):
+        with SessionLocal() as db:
+            warmed = warm_up(db, settings.PRODUCT_CACHE_WARM_SIZE)
+        logger.info("Warmed product cache with %s products.", warmed)
+
+    # Background task deleting expired idempotency keys
+    sweeper = None
+    if settings.IDEMPOTENCY_SWEEP_SECONDS > 0:
+        sweeper = asyncio.create_task(run_sweeper(settings.IDEMPOTENCY_SWEEP_SECONDS))
+
+    app.state.startup_timings = timings
+    app.state.ready = True
+    logger.info("Ready in %.1f ms (schema version %s).", sum(timings.values()), app.state.schema_version)
+
+    yield
+
+    app.state.ready = False
+    if sweeper is not None:
+        sweeper.cancel()
+    shutdown_hash_pool()
+    await dispose_engines()
+    logger.info("Shutdown complete.")
+    stop_logging()
+
+
 # Initialize FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+
+# Per-request SQL statistics, N+1 warnings and query budgets
+app.add_middleware(QueryStatsMiddleware, budgets=QUERY_BUDGETS)
 
-# Initialize database schema
-Base.metadata.create_all(bind=engine)
-logger.info("Database tables created.")
+# Idempotency-Key replays for cart and checkout writes; outside the query
+# budgets, and storing responses before they are compressed
+app.add_middleware(IdempotencyMiddleware, prefixes=("/cart", "/checkout"))
+
+# brotli/gzip for larger bodies; inside the metrics, so request latency includes the compression time
+app.add_middleware(CompressionMiddleware)
+
+# Prometheus metrics: request counters/latency plus pool, bcrypt and cache state
+app.add_middleware(MetricsMiddleware)
+
+# Outermost, so every log line of a request (including the SQL warnings) carries its ID
+app.add_middleware(RequestIdMiddleware)
 
 # Include routers
 app.include_router(auth_router)
@@ -31,7 +176,6 @@ app.include_router(public_product_router)
 app.include_router(cart_router)
 app.include_router(checkout_router)
 app.include_router(orders_router)
-logger.info("Routers registered.")
 
 @app.get("/")
 def read_root():
@@ -43,3 +187,44 @@ def read_root():
     """
     logger.info("Root endpoint '/' accessed.")
     return {"message": "E-commerce API is running !!!!!"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """
+    Exposes application metrics in the Prometheus text format.
+
+    Returns:
+        Response: Current metric values.
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+@app.get("/health/live", include_in_schema=False)
+def liveness():
+    """
+    Liveness probe: the process is up and serving requests.
+
+    Returns:
+        dict: Static status.
+    """
+    return {"status": "alive"}
+
+
+@app.get("/health/ready", include_in_schema=False)
+def readiness():
+    """
+    Readiness probe: startup has completed and the app can take traffic.
+
+    Returns:
+        JSONResponse: 200 with the schema version and startup phase timings
+        once ready, 503 while starting or shutting down.
+    """
+    if not getattr(app.state, "ready", False):
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    return {
+        "status": "ready",
+        "schema_version": app.state.schema_version,
+        "startup_ms": app.state.startup_timings,
+    }
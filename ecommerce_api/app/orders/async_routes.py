@@ -0,0 +1,55 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.auth.dependencies import get_current_normal_user_async
+from app.auth.models import User
+from app.orders import routes
+from app.orders.schemas import OrderOut, OrderSummaryOut
+
+# Async-mode counterpart of orders.routes; each handler runs the sync logic on the async engine
+router = APIRouter(prefix="/orders", tags=["Orders"])
+
+
+@router.get("/", response_model=List[OrderOut])
+async def get_order_history(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_normal_user_async),
+    cursor: Optional[str] = None,
+    page_size: int = Query(20, ge=1, le=100)
+):
+    """
+    Async variant of `routes.get_order_history`.
+    """
+    return await db.run_sync(
+        lambda session: routes.get_order_history(response, session, user, cursor, page_size)
+    )
+
+
+@router.get("/summary", response_model=List[OrderSummaryOut])
+async def get_order_summaries(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_normal_user_async),
+    cursor: Optional[str] = None,
+    page_size: int = Query(20, ge=1, le=100)
+):
+    """
+    Async variant of `routes.get_order_summaries`.
+    """
+    return await db.run_sync(
+        lambda session: routes.get_order_summaries(response, session, user, cursor, page_size)
+    )
+
+
+@router.get("/{order_id}", response_model=OrderOut)
+async def get_order_details(
+    order_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_normal_user_async)
+):
+    """
+    Async variant of `routes.get_order_details`.
+    """
+    return await db.run_sync(lambda session: routes.get_order_details(order_id, session, user))
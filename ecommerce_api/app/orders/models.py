@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Float, DateTime, Enum
+from sqlalchemy import Column, Integer, ForeignKey, Float, DateTime, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime , timezone
 from app.core.database import Base
@@ -32,12 +32,15 @@ class Order(Base):
         items (List[OrderItem]): Relationship to associated order items.
     """
     __tablename__ = "orders"
+    __table_args__ = (
+        Index("ix_orders_user_created", "user_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     total_amount = Column(Float)
     status = Column(Enum(OrderStatus), default=OrderStatus.paid)
-    created_at = Column(DateTime, default=datetime.now(timezone.utc))
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
     items = relationship("OrderItem", back_populates="order")
 
@@ -55,6 +58,9 @@ class OrderItem(Base):
         order (Order): Relationship back to the parent order.
     """
     __tablename__ = "order_items"
+    __table_args__ = (
+        Index("ix_order_items_order_id", "order_id"),
+    )
 
     id = Column(Integer, primary_key=True)
     order_id = Column(Integer, ForeignKey("orders.id"))
@@ -1,35 +1,125 @@
 import logging
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Session, selectinload
 from app.core.database import get_db
+from app.core.pagination import decode_cursor, encode_cursor
 from app.auth.dependencies import get_current_normal_user
 from app.auth.models import User
-from app.orders.models import Order
-from app.orders.schemas import OrderOut
+from app.orders.models import Order, OrderItem
+from app.orders.schemas import OrderOut, OrderSummaryOut, order_serializer, order_summary_serializer
 
 router = APIRouter(prefix="/orders", tags=["Orders"])
 logger = logging.getLogger(__name__)
 
 
+def paginate_orders(query, response: Response, cursor: Optional[str], page_size: int) -> list:
+    """
+    Applies newest-first keyset pagination on (created_at, id) to an orders query.
+
+    Sets the `X-Next-Cursor` response header when more orders remain.
+
+    Args:
+        query: Query whose rows expose `created_at` and `id`.
+        response (Response): Outgoing response, used to set the cursor header.
+        cursor (str, optional): Token from a previous `X-Next-Cursor` header.
+        page_size (int): Number of orders per page.
+
+    Returns:
+        list: The rows of the requested page.
+
+    Raises:
+        HTTPException: If the cursor is invalid.
+    """
+    if cursor:
+        last_created, last_id = decode_cursor(cursor, 2)
+        try:
+            last_created = datetime.fromisoformat(last_created)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(tuple_(Order.created_at, Order.id) < tuple_(last_created, last_id))
+
+    rows = query.order_by(Order.created_at.desc(), Order.id.desc()).limit(page_size + 1).all()
+    page = rows[:page_size]
+    if len(rows) > page_size:
+        last = page[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor([last.created_at.isoformat(), last.id])
+    return page
+
+
 @router.get("/", response_model=List[OrderOut])
 def get_order_history(
+    response: Response,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_normal_user)
+    user: User = Depends(get_current_normal_user),
+    cursor: Optional[str] = None,
+    page_size: int = Query(20, ge=1, le=100)
 ):
     """
-    Retrieves all past orders placed by the authenticated user.
+    Retrieves past orders placed by the authenticated user, newest first.
+
+    Order items are batch-loaded with one extra query per page. Pass the
+    `X-Next-Cursor` response header back as `cursor` to get the next page.
+
+    Args:
+        response (Response): Outgoing response, used to set the cursor header.
+        db (Session): Active database session.
+        user (User): The currently authenticated user.
+        cursor (str, optional): Token from a previous `X-Next-Cursor` header.
+        page_size (int): Number of orders per page.
+
+    Returns:
+        Response: A page of the user's previous orders as List[OrderOut] JSON.
+    """
+    logger.info("User %s is retrieving their order history.", user.id)
+    query = (
+        db.query(Order)
+        .options(selectinload(Order.items))
+        .filter(Order.user_id == user.id)
+    )
+    return order_serializer.response(paginate_orders(query, response, cursor, page_size), response)
+
+
+@router.get("/summary", response_model=List[OrderSummaryOut])
+def get_order_summaries(
+    response: Response,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_normal_user),
+    cursor: Optional[str] = None,
+    page_size: int = Query(20, ge=1, le=100)
+):
+    """
+    Retrieves the user's orders with item counts and totals, newest first.
+
+    Aggregates are computed in the database, so item rows are never loaded.
 
     Args:
+        response (Response): Outgoing response, used to set the cursor header.
         db (Session): Active database session.
         user (User): The currently authenticated user.
+        cursor (str, optional): Token from a previous `X-Next-Cursor` header.
+        page_size (int): Number of orders per page.
 
     Returns:
-        List[OrderOut]: A list of the user's previous orders.
+        Response: A page of order summaries as List[OrderSummaryOut] JSON.
     """
-    logger.info(f"User {user.id} is retrieving their order history.")
-    orders = db.query(Order).filter(Order.user_id == user.id).all()
-    return orders
+    logger.info("User %s is retrieving their order summaries.", user.id)
+    query = (
+        db.query(
+            Order.id,
+            Order.total_amount,
+            Order.status,
+            Order.created_at,
+            func.count(OrderItem.id).label("item_count"),
+            func.coalesce(func.sum(OrderItem.quantity), 0).label("total_quantity"),
+        )
+        .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+        .filter(Order.user_id == user.id)
+        .group_by(Order.id)
+    )
+    return order_summary_serializer.response(paginate_orders(query, response, cursor, page_size), response)
 
 
 @router.get("/{order_id}", response_model=OrderOut)
@@ -47,16 +137,21 @@ def get_order_details(
         user (User): The currently authenticated user.
 
     Returns:
-        OrderOut: Full details of the specified order.
+        Response: Full details of the specified order as OrderOut JSON.
 
     Raises:
         HTTPException: If the order does not exist or does not belong to the user.
     """
-    order = db.query(Order).filter(Order.id == order_id, Order.user_id == user.id).first()
+    order = (
+        db.query(Order)
+        .options(selectinload(Order.items))
+        .filter(Order.id == order_id, Order.user_id == user.id)
+        .first()
+    )
 
     if not order:
-        logger.warning(f"User {user.id} attempted to access nonexistent order {order_id}.")
+        logger.warning("User %s attempted to access nonexistent order %s.", user.id, order_id)
         raise HTTPException(status_code=404, detail="Order not found")
 
-    logger.info(f"User {user.id} viewed order {order_id}.")
-    return order
+    logger.info("User %s viewed order %s.", user.id, order_id)
+    return order_serializer.response(order, many=False)
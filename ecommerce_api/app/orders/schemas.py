@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from typing import List
 from datetime import datetime
+from app.core.serialization import Serializer
 
 
 class OrderItemOut(BaseModel):
@@ -37,3 +38,30 @@ class OrderOut(BaseModel):
     items: List[OrderItemOut]
 
     model_config = {"from_attributes": True}
+
+
+class OrderSummaryOut(BaseModel):
+    """
+    Schema representing an order without its item rows.
+
+    Fields:
+        id (int): Unique ID of the order.
+        total_amount (float): Total cost of the order.
+        status (str): Current status of the order.
+        created_at (datetime): Timestamp of when the order was placed.
+        item_count (int): Number of distinct line items in the order.
+        total_quantity (int): Total units across all line items.
+    """
+    id: int
+    total_amount: float
+    status: str
+    created_at: datetime
+    item_count: int
+    total_quantity: int
+
+    model_config = {"from_attributes": True}
+
+
+# Serialize ORM orders and summary rows without re-validating them
+order_serializer = Serializer(OrderOut)
+order_summary_serializer = Serializer(OrderSummaryOut)
@@ -0,0 +1,104 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.core.etags import etag_matches, not_modified, set_cache_headers
+from app.products import cache, public_routes, schemas, versions
+
+# Async-mode counterpart of public_routes; each handler runs the sync logic on the async engine
+router = APIRouter(prefix="/products", tags=["Public Products"])
+
+
+@router.get("/", response_model=List[schemas.ProductOut])
+async def list_products(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    category: str = None,
+    min_price: float = None,
+    max_price: float = None,
+    sort_by: str = Query("id", enum=["id", "price", "name"]),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_total: bool = False
+):
+    """
+    Async variant of `public_routes.list_products`.
+
+    Concurrent misses are coalesced on the event loop rather than by
+    blocking, since `run_sync` runs on the event loop thread.
+    """
+    version = await db.run_sync(versions.get_catalog_version)
+    etag = versions.catalog_etag(version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_cache_headers(response, etag)
+
+    listing = await cache.listing_cache.get_or_load_async(
+        public_routes.listing_key(
+            version, category, min_price, max_price, sort_by, page, page_size, cursor, include_total
+        ),
+        lambda: db.run_sync(lambda session: public_routes.load_listing(
+            session, category, min_price, max_price, sort_by, page, page_size, cursor, include_total
+        ))
+    )
+    return public_routes.listing_response(listing, response)
+
+
+@router.get("/search", response_model=List[schemas.ProductOut])
+async def search_products(
+    request: Request,
+    response: Response,
+    keyword: str,
+    db: AsyncSession = Depends(get_async_db),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100)
+):
+    """
+    Async variant of `public_routes.search_products`.
+    """
+    return await db.run_sync(
+        lambda session: public_routes.search_products(request, response, keyword, session, page, page_size)
+    )
+
+
+@router.get("/batch", response_model=schemas.ProductBatchOut)
+async def get_product_batch(
+    request: Request,
+    response: Response,
+    ids: str = Query(..., description="Comma-separated product IDs"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Async variant of `public_routes.get_product_batch`.
+    """
+    return await db.run_sync(
+        lambda session: public_routes.get_product_batch(request, response, ids, session)
+    )
+
+
+@router.post("/batch", response_model=schemas.ProductBatchOut)
+async def post_product_batch(
+    body: schemas.ProductBatchRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Async variant of `public_routes.post_product_batch`.
+    """
+    return await db.run_sync(lambda session: public_routes.post_product_batch(body, session))
+
+
+@router.get("/{product_id}", response_model=schemas.ProductOut)
+async def get_product_detail(
+    request: Request,
+    response: Response,
+    product_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Async variant of `public_routes.get_product_detail`.
+    """
+    return await db.run_sync(
+        lambda session: public_routes.get_product_detail(request, response, product_id, session)
+    )
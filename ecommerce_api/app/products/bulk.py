@@ -0,0 +1,177 @@
+import csv
+import io
+import json
+import logging
+from itertools import islice
+from typing import BinaryIO, Iterator
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.products import models, schemas, versions
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_FORMATS = ("csv", "ndjson")
+
+UPSERT_FIELDS = ("name", "description", "price", "stock", "category", "image_url")
+
+
+def iter_rows(stream: BinaryIO, fmt: str) -> Iterator[tuple[int, object]]:
+    """
+    Lazily reads raw rows from an uploaded CSV or NDJSON file.
+
+    A file that stops being readable (invalid UTF-8 or malformed CSV) yields
+    one error after the last row read and ends there; rows already decoded
+    are still imported. Decoding is buffered, so that may be fewer rows than
+    precede the bad bytes.
+
+    Args:
+        stream (BinaryIO): Uploaded file, read sequentially.
+        fmt (str): "csv" (with a header row) or "ndjson" (one JSON object per line).
+
+    Yields:
+        tuple[int, object]: 1-based data row number and the parsed row, or an
+        error message string if the line could not be parsed.
+    """
+    text_stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    rows = _iter_csv(text_stream) if fmt == "csv" else _iter_ndjson(text_stream)
+    number = 0
+    try:
+        for number, row in rows:
+            yield number, row
+    except UnicodeDecodeError as e:
+        yield number + 1, f"File is not valid UTF-8: {e}"
+    except csv.Error as e:
+        yield number + 1, f"Invalid CSV: {e}"
+
+
+def _iter_csv(text_stream: io.TextIOWrapper) -> Iterator[tuple[int, dict]]:
+    for number, row in enumerate(csv.DictReader(text_stream), start=1):
+        # Empty cells mean "not provided" so optional fields like sku stay unset
+        yield number, {key: value for key, value in row.items() if key and value != ""}
+
+
+def _iter_ndjson(text_stream: io.TextIOWrapper) -> Iterator[tuple[int, object]]:
+    number = 0
+    for line in text_stream:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            yield number, json.loads(line)
+        except ValueError as e:
+            yield number, f"Invalid JSON: {e}"
+
+
+def write_chunk(db: Session, products: list[dict]) -> None:
+    """
+    Writes validated products in one transaction using batched statements.
+
+    Rows with a SKU are upserted on it; rows without one are plain inserts.
+
+    Args:
+        db (Session): Database session.
+        products (list[dict]): Validated product fields.
+    """
+    # `import_products` passes one row per SKU; should a SKU repeat anyway,
+    # the last occurrence wins
+    by_sku = {product["sku"]: product for product in products if product.get("sku")}
+    without_sku = [product for product in products if not product.get("sku")]
+
+    if by_sku:
+        statement = sqlite_insert(models.Product)
+        statement = statement.on_conflict_do_update(
+            index_elements=[models.Product.sku],
+            set_={
+                **{field: statement.excluded[field] for field in UPSERT_FIELDS},
+                "version": models.Product.version + 1,
+            }
+        )
+        db.execute(statement, list(by_sku.values()))
+    if without_sku:
+        db.execute(insert(models.Product), without_sku)
+    versions.bump_catalog_version(db)
+    db.commit()
+
+
+def import_products(db: Session, rows: Iterator[tuple[int, object]]) -> schemas.BulkImportResult:
+    """
+    Validates rows against ProductCreate and writes them in fixed-size chunks.
+
+    Only one chunk is held in memory at a time, so memory use does not grow
+    with the size of the file.
+
+    Args:
+        db (Session): Database session.
+        rows (Iterator[tuple[int, object]]): Rows produced by `iter_rows`.
+
+    Returns:
+        BulkImportResult: Counts and per-row errors.
+    """
+    received = imported = failed = 0
+    errors: list[schemas.BulkRowError] = []
+
+    def reject(number: int, messages: list[str]) -> None:
+        nonlocal failed
+        failed += 1
+        if len(errors) < settings.BULK_IMPORT_MAX_ERRORS:
+            errors.append(schemas.BulkRowError(row=number, errors=messages))
+
+    while True:
+        chunk = list(islice(rows, settings.BULK_IMPORT_CHUNK_SIZE))
+        if not chunk:
+            break
+        received += len(chunk)
+
+        valid: list[tuple[int, dict]] = []
+        for number, raw in chunk:
+            if isinstance(raw, str):
+                reject(number, [raw])
+                continue
+            try:
+                valid.append((number, schemas.ProductCreate.model_validate(raw).model_dump()))
+            except ValidationError as e:
+                reject(number, [
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                    for error in e.errors()
+                ])
+
+        # Rows sharing a SKU would be collapsed into one write, so all but the
+        # last are reported instead of being counted as imported
+        last_row = {product["sku"]: number for number, product in valid if product.get("sku")}
+        kept: list[tuple[int, dict]] = []
+        for number, product in valid:
+            sku = product.get("sku")
+            if sku and last_row[sku] != number:
+                reject(number, [f"sku: superseded by row {last_row[sku]} with the same SKU"])
+            else:
+                kept.append((number, product))
+        valid = kept
+
+        if not valid:
+            continue
+        try:
+            write_chunk(db, [product for _, product in valid])
+            imported += len(valid)
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning("Bulk import chunk failed, retrying row by row: %s", e)
+            # Isolate the offending rows so the rest of the chunk still lands
+            for number, product in valid:
+                try:
+                    write_chunk(db, [product])
+                    imported += 1
+                except SQLAlchemyError as row_error:
+                    db.rollback()
+                    reject(number, [str(getattr(row_error, "orig", None) or row_error)])
+
+    return schemas.BulkImportResult(
+        received=received,
+        imported=imported,
+        failed=failed,
+        errors=errors,
+        errors_truncated=failed > len(errors),
+    )
@@ -0,0 +1,133 @@
+from typing import NamedTuple, Optional
+from sqlalchemy.orm import Session
+from app.core.cache import SingleFlightCache, TTLCache
+from app.core.config import settings
+from app.products import models, schemas
+
+# Products keyed by ID, stored already shaped as ProductOut so hits skip ORM hydration
+product_cache = TTLCache(
+    max_size=settings.PRODUCT_CACHE_MAX_SIZE,
+    ttl=settings.PRODUCT_CACHE_TTL_SECONDS
+)
+
+# Encoded public listing pages keyed by catalog version and normalized query
+# parameters; a catalog write changes the version, so older pages are never
+# hit again and simply age out
+listing_cache = SingleFlightCache(
+    max_size=settings.LISTING_CACHE_MAX_SIZE,
+    ttl=settings.LISTING_CACHE_TTL_SECONDS,
+    wait_timeout=settings.LISTING_CACHE_WAIT_SECONDS
+)
+
+
+class CachedListing(NamedTuple):
+    """
+    One encoded listing page.
+
+    Attributes:
+        body (bytes): JSON body.
+        headers (dict[str, str]): Pagination headers sent with it.
+    """
+    body: bytes
+    headers: dict
+
+
+def get_product(db: Session, product_id: int) -> Optional[schemas.ProductOut]:
+    """
+    Read-through lookup of a single product.
+
+    Args:
+        db (Session): Database session, used only on a cache miss.
+        product_id (int): ID of the product.
+
+    Returns:
+        ProductOut: The product, or None if it does not exist.
+    """
+    product = product_cache.get(product_id)
+    if product is not None:
+        return product
+
+    row = db.query(models.Product).filter(models.Product.id == product_id).first()
+    if not row:
+        return None
+    return refresh_product(row)
+
+
+def get_products(db: Session, product_ids: list[int]) -> dict[int, schemas.ProductOut]:
+    """
+    Read-through lookup of several products, loading all misses with one query.
+
+    Args:
+        db (Session): Database session, used only if some products are not cached.
+        product_ids (list[int]): IDs of the products.
+
+    Returns:
+        dict[int, ProductOut]: The products found, keyed by ID; missing IDs are absent.
+    """
+    found = {}
+    misses = []
+    for product_id in product_ids:
+        product = product_cache.get(product_id)
+        if product is not None:
+            found[product_id] = product
+        else:
+            misses.append(product_id)
+
+    if misses:
+        for row in db.query(models.Product).filter(models.Product.id.in_(misses)):
+            found[row.id] = refresh_product(row)
+    return found
+
+
+def refresh_product(row: models.Product) -> schemas.ProductOut:
+    """
+    Stores the current state of a product row in the cache.
+
+    Call after committing a create or update.
+
+    Args:
+        row (Product): Freshly loaded or refreshed product row.
+
+    Returns:
+        ProductOut: The cached representation.
+    """
+    product = schemas.ProductOut.model_validate(row)
+    product_cache.set(product.id, product)
+    return product
+
+
+def warm_up(db: Session, limit: int) -> int:
+    """
+    Preloads the first `limit` products in catalog order (by ID), in one query.
+
+    Args:
+        db (Session): Database session.
+        limit (int): Maximum number of products to load; capped at the cache size.
+
+    Returns:
+        int: Number of products cached.
+    """
+    limit = min(limit, product_cache.max_size)
+    if limit <= 0:
+        return 0
+    rows = db.query(models.Product).order_by(models.Product.id).limit(limit).all()
+    for row in rows:
+        refresh_product(row)
+    return len(rows)
+
+
+def invalidate_all() -> None:
+    """
+    Drops every cached product. Call after bulk writes.
+    """
+    product_cache.clear()
+
+
+def invalidate_product(product_id: int) -> None:
+    """
+    Drops a product from the cache. Call after committing a delete.
+
+    Args:
+        product_id (int): ID of the product.
+    """
+    product_cache.delete(product_id)
@@ -0,0 +1,42 @@
+from sqlalchemy import case, update
+from sqlalchemy.orm import Session
+from app.products import models
+
+
+def reserve_stock(db: Session, quantities: dict[int, int]) -> list[int]:
+    """
+    Takes stock for several products with one conditional UPDATE.
+
+    Each product's stock is decremented only if it covers the requested
+    quantity (`stock = stock - q WHERE id = :id AND stock >= q`), so the
+    check and the write are a single atomic step and concurrent reservations
+    can never drive stock below zero. Reserved products get a new version.
+    A non-positive quantity is never reserved (it would add stock back), so
+    its product is returned as not reserved.
+
+    Call inside the transaction that uses the stock, and roll it back if any
+    product is returned: the products that had enough stock are decremented.
+
+    Args:
+        db (Session): Database session.
+        quantities (dict[int, int]): Quantity to take, keyed by product ID.
+
+    Returns:
+        list[int]: IDs of the products without enough stock or with a
+            non-positive quantity; empty if all were reserved.
+    """
+    refused = [product_id for product_id, quantity in quantities.items() if quantity <= 0]
+    if refused:
+        return refused
+    wanted = case(quantities, value=models.Product.id)
+    reserved = db.execute(
+        update(models.Product)
+        .where(models.Product.id.in_(quantities), models.Product.stock >= wanted)
+        .values(stock=models.Product.stock - wanted, version=models.Product.version + 1)
+        .returning(models.Product.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    if len(reserved) == len(quantities):
+        return []
+    reserved = set(reserved)
+    return [product_id for product_id in quantities if product_id not in reserved]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float
+from sqlalchemy import Column, Integer, String, Float, Index
 from app.core.database import Base
 
 
@@ -14,8 +14,16 @@ class Product(Base):
         stock (int): Inventory count.
         category (str): Product category or type.
         image_url (str): URL to the product's image.
+        sku (str): Optional external stock-keeping unit, unique when set.
+        version (int): Incremented on every write to the product; used for its ETag.
     """
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ix_products_category_price", "category", "price"),
+        Index("ix_products_price", "price"),
+        Index("ix_products_name", "name"),
+        Index("ix_products_sku", "sku", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -24,3 +32,24 @@ class Product(Base):
     stock = Column(Integer, nullable=False)
     category = Column(String, nullable=True)
     image_url = Column(String, nullable=True)
+    sku = Column(String, nullable=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+
+class CatalogVersion(Base):
+    """
+    SQLAlchemy model for the single-row 'catalog_version' table.
+
+    The version is incremented in the same transaction as any admin write to
+    the products table, so listings can be revalidated with one primary-key
+    read. Checkout stock decrements only bump the products' own versions, so
+    the stock shown in listings and search may lag behind.
+
+    Attributes:
+        id (int): Always 1.
+        version (int): Current catalog version.
+    """
+    __tablename__ = "catalog_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False)
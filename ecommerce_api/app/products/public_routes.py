@@ -1,39 +1,165 @@
 import logging
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.core.database import get_db
-from app.products import models, schemas
+from app.core.etags import etag_matches, not_modified, set_cache_headers
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.serialization import dumps, json_response
+from app.products import cache, models, schemas, search, versions
 
 router = APIRouter(prefix="/products", tags=["Public Products"])
 logger = logging.getLogger(__name__)
 
+# Sortable columns for the public listing; `id` is always the tie-breaker
+SORT_COLUMNS = {
+    "id": models.Product.id,
+    "price": models.Product.price,
+    "name": models.Product.name,
+}
+
 
 @router.get("/", response_model=List[schemas.ProductOut])
 def list_products(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     category: str = None,
     min_price: float = None,
     max_price: float = None,
     sort_by: str = Query("id", enum=["id", "price", "name"]),
-    page: int = 1,
-    page_size: int = 10
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_total: bool = False
 ):
     """
     Retrieves a paginated list of products with optional filters.
 
+    Pages can be addressed either by `page` (offset) or by `cursor` (keyset).
+    Every response carries an `X-Next-Cursor` header while more rows remain;
+    passing it back as `cursor` continues after the last row seen, which is
+    an index seek on (sort key, id) regardless of how deep the page is.
+
+    Responses carry the catalog version as their ETag; a matching
+    `If-None-Match` gets a 304 before the listing query runs. Encoded pages
+    are cached per catalog version (see `listing_key`), and concurrent
+    misses for the same page share one query.
+
     Args:
+        request (Request): Incoming request, checked for `If-None-Match`.
+        response (Response): Outgoing response, used to set pagination and cache headers.
         db (Session): Database session.
         category (str, optional): Filter by product category.
         min_price (float, optional): Minimum price filter.
         max_price (float, optional): Maximum price filter.
         sort_by (str): Field to sort by (id, price, name).
-        page (int): Page number for pagination.
+        page (int): Page number for pagination (ignored when `cursor` is set).
         page_size (int): Number of items per page.
+        cursor (str, optional): Opaque token from a previous `X-Next-Cursor` header.
+        include_total (bool): Also count all matches into `X-Total-Count`.
+
+    Returns:
+        Response: Filtered and paginated list of products as List[ProductOut]
+        JSON, or an empty 304 response if the client's copy is current.
+
+    Raises:
+        HTTPException: If the page is out of range or the cursor is invalid.
+    """
+    version = versions.get_catalog_version(db)
+    etag = versions.catalog_etag(version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_cache_headers(response, etag)
+
+    listing = cache.listing_cache.get_or_load(
+        listing_key(version, category, min_price, max_price, sort_by, page, page_size, cursor, include_total),
+        lambda: load_listing(db, category, min_price, max_price, sort_by, page, page_size, cursor, include_total)
+    )
+    logger.info("Listing products - category: %s, page: %s, size: %s", category, page, page_size)
+    return listing_response(listing, response)
+
+
+def listing_key(
+    version: int,
+    category: Optional[str],
+    min_price: Optional[float],
+    max_price: Optional[float],
+    sort_by: str,
+    page: int,
+    page_size: int,
+    cursor: Optional[str],
+    include_total: bool
+) -> tuple:
+    """
+    Builds the listing cache key from the parameters that change the result.
+
+    Parameters the query ignores are normalized away: empty or zero filters
+    become None, prices are compared as floats and `page` is dropped when a
+    cursor is given. The catalog version comes first, so every catalog
+    write moves all listings to new keys at once.
+
+    Args:
+        version (int): Catalog version read by the request.
+        category (str, optional): Category filter.
+        min_price (float, optional): Minimum price filter.
+        max_price (float, optional): Maximum price filter.
+        sort_by (str): Sort field.
+        page (int): Page number.
+        page_size (int): Items per page.
+        cursor (str, optional): Keyset cursor.
+        include_total (bool): Whether the total count is included.
 
     Returns:
-        List[ProductOut]: Filtered and paginated list of products.
+        tuple: Hashable cache key.
+    """
+    return (
+        version,
+        category or None,
+        float(min_price) if min_price else None,
+        float(max_price) if max_price else None,
+        sort_by,
+        None if cursor else page,
+        page_size,
+        cursor or None,
+        include_total,
+    )
+
+
+def load_listing(
+    db: Session,
+    category: Optional[str],
+    min_price: Optional[float],
+    max_price: Optional[float],
+    sort_by: str,
+    page: int,
+    page_size: int,
+    cursor: Optional[str],
+    include_total: bool
+) -> cache.CachedListing:
     """
+    Runs the listing query and encodes the page.
+
+    Args:
+        db (Session): Database session.
+        category (str, optional): Filter by product category.
+        min_price (float, optional): Minimum price filter.
+        max_price (float, optional): Maximum price filter.
+        sort_by (str): Field to sort by (id, price, name).
+        page (int): Page number (ignored when `cursor` is set).
+        page_size (int): Number of items per page.
+        cursor (str, optional): Token from a previous `X-Next-Cursor` header.
+        include_total (bool): Also count all matches into `X-Total-Count`.
+
+    Returns:
+        CachedListing: JSON body and pagination headers.
+
+    Raises:
+        HTTPException: If the page is out of range or the cursor is invalid.
+    """
+    headers = {}
     query = db.query(models.Product)
 
     if category:
@@ -43,58 +169,239 @@ def list_products(
     if max_price:
         query = query.filter(models.Product.price <= max_price)
 
-    if sort_by == "price":
-        query = query.order_by(models.Product.price)
-    elif sort_by == "name":
-        query = query.order_by(models.Product.name)
+    sort_column = SORT_COLUMNS[sort_by]
+
+    if include_total:
+        headers["X-Total-Count"] = str(query.count())
+
+    if cursor:
+        cursor_sort, last_value, last_id = decode_cursor(cursor, 3)
+        if cursor_sort != sort_by:
+            raise HTTPException(status_code=400, detail="Cursor does not match sort order")
+        if sort_by == "id":
+            query = query.filter(models.Product.id > last_id)
+        else:
+            query = query.filter(
+                tuple_(sort_column, models.Product.id) > tuple_(last_value, last_id)
+            )
+        offset = 0
     else:
-        query = query.order_by(models.Product.id)
+        offset = (page - 1) * page_size
+
+    query = query.order_by(sort_column, models.Product.id)
 
-    total = query.count()  # Total matching products
-    offset = (page - 1) * page_size
+    # Fetch one extra row to learn whether another page exists without a COUNT
+    rows = query.offset(offset).limit(page_size + 1).all()
 
-    if offset >= total and total > 0:
+    if not rows and offset > 0 and query.limit(1).first() is not None:
         raise HTTPException(status_code=404, detail="Page out of range")
-    
-    logger.info(f"Listing products - category: {category}, page: {page}, size: {page_size}")
-    return query.offset(offset).limit(page_size).all()
+
+    products = rows[:page_size]
+    if len(rows) > page_size:
+        last = products[-1]
+        headers["X-Next-Cursor"] = encode_cursor([sort_by, getattr(last, sort_by), last.id])
+
+    return cache.CachedListing(dumps(schemas.product_serializer.many(products)), headers)
+
+
+def listing_response(listing: cache.CachedListing, response: Response) -> Response:
+    """
+    Args:
+        listing (CachedListing): Encoded listing page.
+        response (Response): Injected response holding the cache headers.
+
+    Returns:
+        Response: The page as List[ProductOut] JSON with its pagination headers.
+    """
+    for name, value in listing.headers.items():
+        response.headers[name] = value
+    return json_response(listing.body, response)
 
 
 @router.get("/search", response_model=List[schemas.ProductOut])
-def search_products(keyword: str, db: Session = Depends(get_db)):
+def search_products(
+    request: Request,
+    response: Response,
+    keyword: str,
+    db: Session = Depends(get_db),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100)
+):
     """
-    Searches for products by keyword in the product name.
+    Searches products by keyword across name, description and category.
+
+    Each word is matched as a prefix and results are ranked by relevance,
+    with name matches weighted highest. Revalidated like `list_products`.
 
     Args:
-        keyword (str): Search keyword.
+        request (Request): Incoming request, checked for `If-None-Match`.
+        response (Response): Outgoing response, used to set cache headers.
+        keyword (str): Search keyword(s).
         db (Session): Database session.
+        page (int): Page number of ranked results.
+        page_size (int): Number of results per page.
 
     Returns:
-        List[ProductOut]: List of matching products.
+        Response: Page of matching products as List[ProductOut] JSON, most
+        relevant first, or an empty 304 response if the client's copy is current.
     """
-    logger.info(f"Product search initiated with keyword: {keyword}")
-    return db.query(models.Product).filter(models.Product.name.ilike(f"%{keyword}%")).all()
+    etag = versions.catalog_etag(versions.get_catalog_version(db))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_cache_headers(response, etag)
+
+    logger.info("Product search initiated with keyword: %s", keyword)
+    products = search.search_products(db, keyword, limit=page_size, offset=(page - 1) * page_size)
+    return schemas.product_serializer.response(products, response)
+
+
+def parse_ids(ids: str) -> list[int]:
+    """
+    Parses a comma-separated list of product IDs.
+
+    Args:
+        ids (str): Raw `ids` query parameter, e.g. "12,7,40".
+
+    Returns:
+        list[int]: The IDs, in the given order.
+
+    Raises:
+        HTTPException: If an entry is not an integer.
+    """
+    try:
+        return [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+
+
+def lookup_batch(db: Session, ids: list[int], response: Optional[Response] = None) -> Response:
+    """
+    Resolves a list of product IDs from the cache and one `IN` query.
+
+    Duplicate IDs are returned once, at their first position.
+
+    Args:
+        db (Session): Database session.
+        ids (list[int]): Requested product IDs, in order.
+        response (Response, optional): Injected response holding headers to keep.
+
+    Returns:
+        Response: ProductBatchOut JSON with products and missing IDs in request order.
+
+    Raises:
+        HTTPException: If no IDs or more than PRODUCT_BATCH_MAX_IDS are given.
+    """
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        raise HTTPException(status_code=400, detail="No product ids given")
+    if len(ids) > settings.PRODUCT_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.PRODUCT_BATCH_MAX_IDS} product ids per request"
+        )
+
+    found = cache.get_products(db, ids)
+    result = schemas.ProductBatchOut.model_construct(
+        products=[found[product_id] for product_id in ids if product_id in found],
+        missing=[product_id for product_id in ids if product_id not in found]
+    )
+    logger.info("Batch lookup of %s products, %s missing", len(ids), len(result.missing))
+    return schemas.product_batch_serializer.response(result, response, many=False)
+
+
+@router.get("/batch", response_model=schemas.ProductBatchOut)
+def get_product_batch(
+    request: Request,
+    response: Response,
+    ids: str = Query(..., description="Comma-separated product IDs"),
+    db: Session = Depends(get_db)
+):
+    """
+    Retrieves several products by ID in one request.
+
+    Revalidated against the catalog version like `list_products`.
+
+    Args:
+        request (Request): Incoming request, checked for `If-None-Match`.
+        response (Response): Outgoing response, used to set cache headers.
+        ids (str): Comma-separated product IDs, at most PRODUCT_BATCH_MAX_IDS.
+        db (Session): Database session.
+
+    Returns:
+        Response: ProductBatchOut JSON with the products found and the missing
+        IDs, both in request order, or an empty 304 response if the client's
+        copy is current.
+
+    Raises:
+        HTTPException: If the IDs are malformed, empty or too many.
+    """
+    product_ids = parse_ids(ids)
+    etag = versions.catalog_etag(versions.get_catalog_version(db))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_cache_headers(response, etag)
+    return lookup_batch(db, product_ids, response)
+
+
+@router.post("/batch", response_model=schemas.ProductBatchOut)
+def post_product_batch(
+    body: schemas.ProductBatchRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Retrieves several products by ID, with the IDs in the request body.
+
+    Use it when the ID list is too long for a URL.
+
+    Args:
+        body (ProductBatchRequest): Product IDs, at most PRODUCT_BATCH_MAX_IDS.
+        db (Session): Database session.
+
+    Returns:
+        Response: ProductBatchOut JSON with the products found and the missing
+        IDs, both in request order.
+
+    Raises:
+        HTTPException: If no IDs or too many are given.
+    """
+    return lookup_batch(db, body.ids)
 
 
 @router.get("/{product_id}", response_model=schemas.ProductOut)
-def get_product_detail(product_id: int, db: Session = Depends(get_db)):
+def get_product_detail(
+    request: Request,
+    response: Response,
+    product_id: int,
+    db: Session = Depends(get_db)
+):
     """
     Retrieves details for a specific product by ID.
 
+    The ETag is the product's version. When the product is cached, a
+    matching `If-None-Match` gets a 304 without touching the database.
+
     Args:
+        request (Request): Incoming request, checked for `If-None-Match`.
+        response (Response): Outgoing response, used to set cache headers.
         product_id (int): ID of the product to retrieve.
         db (Session): Database session.
 
     Returns:
-        ProductOut: Product detail.
+        Response: Product detail as ProductOut JSON, or an empty 304 response
+        if the client's copy is current.
 
     Raises:
         HTTPException: If the product is not found.
     """
-    product = db.query(models.Product).filter(models.Product.id == product_id).first()
+    product = cache.get_product(db, product_id)
     if not product:
-        logger.warning(f"Product ID {product_id} not found.")
+        logger.warning("Product ID %s not found.", product_id)
         raise HTTPException(status_code=404, detail="Product not found")
 
-    logger.info(f"Fetched details for product ID {product_id}")
-    return product
+    etag = versions.product_etag(product)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_cache_headers(response, etag)
+
+    logger.info("Fetched details for product ID %s", product_id)
+    return schemas.product_serializer.response(product, response, many=False)
@@ -1,13 +1,26 @@
+import csv
+import io
+import json
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Iterator, Optional
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from app.products import models, schemas
+from app.cart import cache as cart_cache
+from app.products import bulk, cache, models, schemas, versions
 from app.auth.dependencies import get_current_admin_user
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, get_engine
+from app.core.pagination import decode_cursor, encode_cursor
 
 router = APIRouter(prefix="/admin/products", tags=["Admin - Products"])
 logger = logging.getLogger(__name__)
 
+EXPORT_COLUMNS = ("id", "name", "description", "price", "stock", "category", "image_url", "sku")
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
 
 @router.post("/", response_model=schemas.ProductOut)
 def create_product(
@@ -25,32 +38,253 @@ def create_product(
 
     Returns:
         ProductOut: The newly created product.
+
+    Raises:
+        HTTPException: If another product already has the SKU.
     """
     new_product = models.Product(**product.model_dump())
     db.add(new_product)
-    db.commit()
+    versions.bump_catalog_version(db)
+    commit_product(db, product.sku)
     db.refresh(new_product)
-    logger.info(f"Admin {user.email} created product '{new_product.name}' (ID: {new_product.id})")
-    return new_product
+    logger.info("Admin %s created product '%s' (ID: %s)", user.email, new_product.name, new_product.id)
+    return cache.refresh_product(new_product)
+
+
+def commit_product(db: Session, sku: Optional[str]) -> None:
+    """
+    Commits a product create or update, turning a SKU clash into a 409.
+
+    Only a violation of the `ix_products_sku` unique index is mapped; any
+    other integrity error is re-raised after the rollback.
+
+    Args:
+        db (Session): Database session holding the pending write.
+        sku (str, optional): SKU being written, for the error message.
+
+    Raises:
+        HTTPException: If another product already has the SKU.
+        IntegrityError: If the write violated another constraint.
+    """
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        if not is_sku_clash(e):
+            raise
+        logger.warning("Product write rejected: SKU %s is already in use.", sku)
+        raise HTTPException(status_code=409, detail=f"A product with SKU '{sku}' already exists")
+
+
+def is_sku_clash(error: IntegrityError) -> bool:
+    """
+    Whether an integrity error came from the unique index on `products.sku`.
+
+    SQLite names the column ("UNIQUE constraint failed: products.sku"),
+    PostgreSQL the index, so either is accepted.
+    """
+    message = str(error.orig)
+    return "products.sku" in message or "ix_products_sku" in message
+
+
+@router.post("/bulk", response_model=schemas.BulkImportResult)
+def bulk_import_products(
+    file: UploadFile = File(...),
+    format: str = Query(None, enum=list(bulk.SUPPORTED_FORMATS)),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_admin_user)
+):
+    """
+    Imports products from an uploaded CSV or NDJSON file. Admin only.
+
+    Rows are validated against ProductCreate and written in chunks with
+    batched statements; rows carrying a `sku` upsert the existing product
+    with that SKU. Invalid rows are skipped and reported.
+
+    Args:
+        file (UploadFile): CSV with a header row, or NDJSON with one product per line.
+        format (str, optional): "csv" or "ndjson"; inferred from the file name if omitted.
+        db (Session): Database session.
+        user: Current admin user.
+
+    Returns:
+        BulkImportResult: Counts of imported and failed rows with per-row errors.
+
+    Raises:
+        HTTPException: If the file format cannot be determined.
+    """
+    fmt = format or (file.filename or "").rsplit(".", 1)[-1].lower()
+    if fmt == "jsonl":
+        fmt = "ndjson"
+    if fmt not in bulk.SUPPORTED_FORMATS:
+        raise HTTPException(status_code=400, detail="Unsupported format, use csv or ndjson")
+
+    result = bulk.import_products(db, bulk.iter_rows(file.file, fmt))
+    if result.imported:
+        cache.invalidate_all()
+        cart_cache.invalidate_all()
+
+    logger.info(
+        "Admin %s bulk imported %s products (%s failed) from %s.",
+        user.email, result.imported, result.failed, file.filename
+    )
+    return result
+
+
+def build_product_filters(
+    category: Optional[str],
+    min_price: Optional[float],
+    max_price: Optional[float],
+    sku: Optional[str]
+) -> list:
+    """
+    Builds the WHERE clauses shared by the admin listing and export.
+
+    Args:
+        category (str, optional): Exact category to match.
+        min_price (float, optional): Minimum price, inclusive.
+        max_price (float, optional): Maximum price, inclusive.
+        sku (str, optional): Exact SKU to match.
+
+    Returns:
+        list: SQLAlchemy filter expressions.
+    """
+    clauses = []
+    if category:
+        clauses.append(models.Product.category == category)
+    if min_price is not None:
+        clauses.append(models.Product.price >= min_price)
+    if max_price is not None:
+        clauses.append(models.Product.price <= max_price)
+    if sku:
+        clauses.append(models.Product.sku == sku)
+    return clauses
 
 
 @router.get("/", response_model=list[schemas.ProductOut])
 def list_products(
+    response: Response,
     db: Session = Depends(get_db),
-    user=Depends(get_current_admin_user)
+    user=Depends(get_current_admin_user),
+    category: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    sku: Optional[str] = None,
+    cursor: Optional[str] = None,
+    page_size: int = Query(50, ge=1, le=500)
 ):
     """
-    Lists all products for administrative purposes.
+    Lists products for administrative purposes, one page at a time by ID.
+
+    Pass the `X-Next-Cursor` response header back as `cursor` to get the
+    next page. Use `/admin/products/export` to download the whole catalog.
 
     Args:
+        response (Response): Outgoing response, used to set the cursor header.
         db (Session): Database session.
         user: Current admin user.
+        category (str, optional): Filter by category.
+        min_price (float, optional): Minimum price filter.
+        max_price (float, optional): Maximum price filter.
+        sku (str, optional): Filter by SKU.
+        cursor (str, optional): Token from a previous `X-Next-Cursor` header.
+        page_size (int): Number of products per page.
+
+    Returns:
+        Response: A page of products as List[ProductOut] JSON.
+    """
+    logger.info("Admin %s requested product list.", user.email)
+    query = db.query(models.Product).filter(
+        *build_product_filters(category, min_price, max_price, sku)
+    )
+    if cursor:
+        (last_id,) = decode_cursor(cursor, 1)
+        query = query.filter(models.Product.id > last_id)
+
+    rows = query.order_by(models.Product.id).limit(page_size + 1).all()
+    products = rows[:page_size]
+    if len(rows) > page_size:
+        response.headers["X-Next-Cursor"] = encode_cursor([products[-1].id])
+    return schemas.product_serializer.response(products, response)
+
+
+@router.get("/export")
+def export_products(
+    format: str = Query("ndjson", enum=list(EXPORT_MEDIA_TYPES)),
+    user=Depends(get_current_admin_user),
+    category: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    sku: Optional[str] = None
+):
+    """
+    Streams the (optionally filtered) catalog as NDJSON or CSV. Admin only.
+
+    Rows are read from a streaming cursor in batches of EXPORT_BATCH_SIZE
+    and written to the response as they arrive, so memory stays flat
+    regardless of catalog size.
+
+    Args:
+        format (str): "ndjson" or "csv".
+        user: Current admin user.
+        category (str, optional): Filter by category.
+        min_price (float, optional): Minimum price filter.
+        max_price (float, optional): Maximum price filter.
+        sku (str, optional): Filter by SKU.
 
     Returns:
-        List[ProductOut]: All available products.
+        StreamingResponse: The exported products.
+    """
+    statement = (
+        select(*(getattr(models.Product, column) for column in EXPORT_COLUMNS))
+        .where(*build_product_filters(category, min_price, max_price, sku))
+        .order_by(models.Product.id)
+    )
+    logger.info("Admin %s started a %s product export.", user.email, format)
+    return StreamingResponse(
+        stream_export(statement, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="products.{format}"'}
+    )
+
+
+def stream_export(statement, fmt: str) -> Iterator[str]:
+    """
+    Yields the export body one batch of rows at a time.
+
+    Uses its own connection because request-scoped sessions are closed
+    before a streaming response body is sent.
+
+    Args:
+        statement: Select statement over EXPORT_COLUMNS.
+        fmt (str): "ndjson" or "csv".
+
+    Yields:
+        str: Encoded rows for one batch.
     """
-    logger.info(f"Admin {user.email} requested product list.")
-    return db.query(models.Product).all()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if fmt == "csv":
+        writer.writerow(EXPORT_COLUMNS)
+
+    with get_engine().connect() as conn:
+        result = conn.execution_options(
+            stream_results=True,
+            yield_per=settings.EXPORT_BATCH_SIZE
+        ).execute(statement)
+        for batch in result.partitions():
+            for row in batch:
+                if fmt == "csv":
+                    writer.writerow(row)
+                else:
+                    buffer.write(json.dumps(dict(row._mapping)))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
 
 
 @router.get("/{product_id}", response_model=schemas.ProductOut)
@@ -73,9 +307,9 @@ def get_product(
     Raises:
         HTTPException: If the product does not exist.
     """
-    product = db.query(models.Product).filter(models.Product.id == product_id).first()
+    product = cache.get_product(db, product_id)
     if not product:
-        logger.warning(f"Admin {user.email} tried to access nonexistent product ID {product_id}.")
+        logger.warning("Admin %s tried to access nonexistent product ID %s.", user.email, product_id)
         raise HTTPException(status_code=404, detail="Product not found")
     return product
 
@@ -100,20 +334,25 @@ def update_product(
         ProductOut: The updated product.
 
     Raises:
-        HTTPException: If the product does not exist.
+        HTTPException: If the product does not exist or another product already has the SKU.
     """
     product = db.query(models.Product).filter(models.Product.id == product_id).first()
     if not product:
-        logger.warning(f"Admin {user.email} tried to update nonexistent product ID {product_id}.")
+        logger.warning("Admin %s tried to update nonexistent product ID %s.", user.email, product_id)
         raise HTTPException(status_code=404, detail="Product not found")
 
-    for field, value in updated.model_dump(exclude_unset=True).items():
+    changes = updated.model_dump(exclude_unset=True)
+    for field, value in changes.items():
         setattr(product, field, value)
+    # Incremented in SQL so concurrent updates cannot end on the same version
+    product.version = models.Product.version + 1
+    versions.bump_catalog_version(db)
 
-    db.commit()
+    commit_product(db, changes.get("sku"))
     db.refresh(product)
-    logger.info(f"Admin {user.email} updated product ID {product_id}.")
-    return product
+    cart_cache.invalidate_all()
+    logger.info("Admin %s updated product ID %s.", user.email, product_id)
+    return cache.refresh_product(product)
 
 
 @router.delete("/{product_id}")
@@ -138,10 +377,13 @@ def delete_product(
     """
     product = db.query(models.Product).filter(models.Product.id == product_id).first()
     if not product:
-        logger.warning(f"Admin {user.email} tried to delete nonexistent product ID {product_id}.")
+        logger.warning("Admin %s tried to delete nonexistent product ID %s.", user.email, product_id)
         raise HTTPException(status_code=404, detail="Product not found")
 
     db.delete(product)
+    versions.bump_catalog_version(db)
     db.commit()
-    logger.info(f"Admin {user.email} deleted product ID {product_id}.")
+    cache.invalidate_product(product_id)
+    cart_cache.invalidate_all()
+    logger.info("Admin %s deleted product ID %s.", user.email, product_id)
     return {"message": "Product deleted successfully"}
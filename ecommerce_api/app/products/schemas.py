@@ -1,5 +1,6 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel
+from app.core.serialization import Serializer
 
 class ProductCreate(BaseModel):
     """
@@ -12,6 +13,7 @@ class ProductCreate(BaseModel):
         stock (int): Available stock quantity.
         category (str): Product category label.
         image_url (str): URL to the product image.
+        sku (str, optional): External stock-keeping unit, unique when set.
     """
     name: str
     description: str
@@ -19,6 +21,7 @@ class ProductCreate(BaseModel):
     stock: int
     category: str
     image_url: str
+    sku: Optional[str] = None
     
 
 
@@ -33,6 +36,7 @@ class ProductUpdate(BaseModel):
     stock: Optional[int] = None
     category: Optional[str] = None
     image_url: Optional[str] = None
+    sku: Optional[str] = None
 
 
 class ProductOut(ProductCreate):
@@ -44,9 +48,68 @@ class ProductOut(ProductCreate):
 
     Adds:
         id (int): Unique product identifier.
+        version (int): Product version; changes whenever the product does.
     """
     id: int
+    version: int = 1
 
     model_config = {
         "from_attributes": True
     }
+
+
+class ProductBatchRequest(BaseModel):
+    """
+    Schema for looking up several products at once.
+
+    Fields:
+        ids (List[int]): Product IDs, in the order the results should follow.
+    """
+    ids: List[int]
+
+
+class ProductBatchOut(BaseModel):
+    """
+    Schema for the result of a batch product lookup.
+
+    Fields:
+        products (List[ProductOut]): Products found, in request order.
+        missing (List[int]): Requested IDs that do not exist, in request order.
+    """
+    products: List[ProductOut]
+    missing: List[int]
+
+
+# Serializes product rows and cached ProductOut instances without re-validating them
+product_serializer = Serializer(ProductOut)
+product_batch_serializer = Serializer(ProductBatchOut)
+
+
+class BulkRowError(BaseModel):
+    """
+    Schema describing why a row of a bulk import was rejected.
+
+    Fields:
+        row (int): 1-based data row number in the uploaded file.
+        errors (List[str]): Validation or database errors for the row.
+    """
+    row: int
+    errors: List[str]
+
+
+class BulkImportResult(BaseModel):
+    """
+    Schema for the outcome of a bulk product import.
+
+    Fields:
+        received (int): Data rows read from the file.
+        imported (int): Rows inserted or upserted by SKU.
+        failed (int): Rows rejected.
+        errors (List[BulkRowError]): Per-row errors, capped at the configured limit.
+        errors_truncated (bool): Whether more rows failed than are listed.
+    """
+    received: int
+    imported: int
+    failed: int
+    errors: List[BulkRowError]
+    errors_truncated: bool
@@ -0,0 +1,192 @@
+import logging
+import re
+from sqlalchemy import or_, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from app.products.models import Product
+
+logger = logging.getLogger(__name__)
+
+# Relative bm25 weights for the indexed columns: name, description, category
+RANK_WEIGHTS = (10.0, 2.0, 5.0)
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Reindexes a product only when an indexed column changes, so stock and
+# version updates (every checkout line) leave the index alone
+UPDATE_TRIGGER_DDL = """
+    CREATE TRIGGER IF NOT EXISTS products_fts_au
+    AFTER UPDATE OF name, description, category ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description, category)
+        VALUES ('delete', old.id, old.name, old.description, old.category);
+        INSERT INTO products_fts(rowid, name, description, category)
+        VALUES (new.id, new.name, new.description, new.category);
+    END
+"""
+
+# External-content FTS5 index over `products`; triggers keep it in sync with
+# every insert, delete and indexed-column update regardless of which code
+# path writes the row.
+SEARCH_INDEX_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+        name, description, category,
+        content='products', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts(rowid, name, description, category)
+        VALUES (new.id, new.name, new.description, new.category);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description, category)
+        VALUES ('delete', old.id, old.name, old.description, old.category);
+    END
+    """,
+    UPDATE_TRIGGER_DDL,
+]
+
+
+def search_supported(bind) -> bool:
+    """
+    Checks whether the full-text index can be used on the given engine or connection.
+
+    Args:
+        bind: SQLAlchemy engine or connection.
+
+    Returns:
+        bool: True for SQLite, which ships FTS5.
+    """
+    return bind.dialect.name == "sqlite"
+
+
+def create_search_index(conn: Connection) -> None:
+    """
+    Creates the FTS5 index and its sync triggers, backfilling existing products.
+
+    Safe to run repeatedly; existing objects are left untouched. Does nothing
+    on backends other than SQLite.
+
+    Args:
+        conn (Connection): Connection inside the caller's transaction.
+    """
+    if not search_supported(conn):
+        logger.info("Full-text search index skipped: backend is not SQLite.")
+        return
+
+    exists = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'products_fts'")
+    ).first()
+    for statement in SEARCH_INDEX_DDL:
+        conn.execute(text(statement))
+    if not exists:
+        conn.execute(text("INSERT INTO products_fts(products_fts) VALUES ('rebuild')"))
+        logger.info("Full-text search index created and backfilled.")
+
+
+def replace_update_trigger(conn: Connection) -> None:
+    """
+    Recreates the index's update trigger from UPDATE_TRIGGER_DDL.
+
+    Databases indexed before the trigger was limited to the indexed columns
+    still have the version firing on every update. Does nothing on backends
+    other than SQLite.
+
+    Args:
+        conn (Connection): Connection inside the caller's transaction.
+    """
+    if not search_supported(conn):
+        return
+    conn.execute(text("DROP TRIGGER IF EXISTS products_fts_au"))
+    conn.execute(text(UPDATE_TRIGGER_DDL))
+
+
+def init_search_index(engine: Engine) -> None:
+    """
+    Runs `create_search_index` in its own transaction.
+
+    Args:
+        engine (Engine): Engine bound to the application database.
+    """
+    with engine.begin() as conn:
+        create_search_index(conn)
+
+
+def build_match_query(keyword: str) -> str:
+    """
+    Turns free text into an FTS5 MATCH expression with prefix matching.
+
+    Every word must match (implicit AND) and is treated as a prefix, so
+    "blu shi" finds "Blue Shirt". Words are quoted so user input can never
+    inject FTS5 operators.
+
+    Args:
+        keyword (str): Raw search text from the client.
+
+    Returns:
+        str: MATCH expression, or an empty string if there are no words.
+    """
+    tokens = TOKEN_PATTERN.findall(keyword)
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def search_products(db: Session, keyword: str, limit: int, offset: int) -> list[Product]:
+    """
+    Returns products matching `keyword`, most relevant first.
+
+    Uses the FTS5 index ranked by bm25 on SQLite and falls back to a
+    case-insensitive substring match on other backends.
+
+    Args:
+        db (Session): Database session.
+        keyword (str): Search text.
+        limit (int): Maximum number of products to return.
+        offset (int): Number of ranked matches to skip.
+
+    Returns:
+        list[Product]: Matching products.
+    """
+    if not search_supported(db.get_bind()):
+        pattern = f"%{keyword}%"
+        return (
+            db.query(Product)
+            .filter(or_(
+                Product.name.ilike(pattern),
+                Product.description.ilike(pattern),
+                Product.category.ilike(pattern),
+            ))
+            .order_by(Product.id)
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+
+    match = build_match_query(keyword)
+    if not match:
+        return []
+
+    statement = text(
+        "SELECT products.* FROM products_fts "
+        "JOIN products ON products.id = products_fts.rowid "
+        "WHERE products_fts MATCH :match "
+        "ORDER BY bm25(products_fts, :w_name, :w_description, :w_category) "
+        "LIMIT :limit OFFSET :offset"
+    )
+    return (
+        db.query(Product)
+        .from_statement(statement)
+        .params(
+            match=match,
+            w_name=RANK_WEIGHTS[0],
+            w_description=RANK_WEIGHTS[1],
+            w_category=RANK_WEIGHTS[2],
+            limit=limit,
+            offset=offset,
+        )
+        .all()
+    )
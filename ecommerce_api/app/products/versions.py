@@ -0,0 +1,61 @@
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from app.core.etags import make_etag
+from app.products import models, schemas
+
+
+def get_catalog_version(db: Session) -> int:
+    """
+    Reads the catalog version.
+
+    Read it before the data it describes. The driver issues no BEGIN before
+    a SELECT, so each read sees its own snapshot: a write committed between
+    the two reads lands in rows tagged (and cached) under the older version.
+    Such a page is only newer than its tag, and the bump that came with the
+    write moves the next request to a fresh key.
+
+    Args:
+        db (Session): Database session.
+
+    Returns:
+        int: Current catalog version.
+    """
+    return db.execute(
+        select(models.CatalogVersion.version).where(models.CatalogVersion.id == 1)
+    ).scalar_one()
+
+
+def bump_catalog_version(db: Session) -> None:
+    """
+    Increments the catalog version. Call in the transaction that writes products.
+
+    Args:
+        db (Session): Database session.
+    """
+    db.execute(
+        update(models.CatalogVersion)
+        .where(models.CatalogVersion.id == 1)
+        .values(version=models.CatalogVersion.version + 1)
+    )
+
+
+def catalog_etag(version: int) -> str:
+    """
+    Args:
+        version (int): Catalog version.
+
+    Returns:
+        str: ETag shared by every catalog listing at this version.
+    """
+    return make_etag("c", version)
+
+
+def product_etag(product: schemas.ProductOut) -> str:
+    """
+    Args:
+        product (ProductOut): Product being returned.
+
+    Returns:
+        str: ETag of the product's representation.
+    """
+    return make_etag("p", product.id, product.version)
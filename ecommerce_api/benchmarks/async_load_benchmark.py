@@ -0,0 +1,88 @@
+"""
+Load test comparing the sync (threadpool) and async (DB_ASYNC) modes.
+
+Starts a real uvicorn server per mode and drives it with many concurrent
+keep-alive clients implemented on raw asyncio streams, mixing catalog
+reads, product detail and cart views. Reports throughput and latency
+percentiles per mode.
+
+Usage (from the ecommerce_api directory):
+    python -m benchmarks.async_load_benchmark [seconds] [clients]
+"""
+import asyncio
+import statistics
+import sys
+import time
+from benchmarks.server import running_server, seed_over_http
+
+PORT = 8766
+
+
+async def client(paths: list[str], token: str, stop: float, latencies: list, errors: list) -> None:
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", PORT)
+    except OSError:
+        errors.append(1)
+        return
+    n = 0
+    try:
+        while time.monotonic() < stop:
+            path = paths[n % len(paths)]
+            n += 1
+            request = (
+                f"GET {path} HTTP/1.1\r\nHost: bench\r\nAuthorization: Bearer {token}\r\n\r\n"
+            ).encode()
+            started = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode().partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if not status_line.startswith(b"HTTP/1.1 2"):
+                errors.append(1)
+    except (OSError, asyncio.IncompleteReadError):
+        errors.append(1)
+    finally:
+        writer.close()
+
+
+async def drive(seconds: float, clients: int, token: str) -> dict:
+    paths = ["/products/?page=1", "/products/?page=3&sort_by=price", "/products/7", "/cart/"]
+    latencies, errors = [], []
+    stop = time.monotonic() + seconds
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        client(paths[n % len(paths):] + paths[:n % len(paths)], token, stop, latencies, errors)
+        for n in range(clients)
+    ))
+    elapsed = time.perf_counter() - started
+    cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+    return {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(cuts[49], 2),
+        "p95_ms": round(cuts[94], 2),
+        "p99_ms": round(cuts[98], 2),
+        "errors": len(errors),
+    }
+
+
+def run(label: str, async_mode: bool, seconds: float, clients: int) -> None:
+    with running_server(PORT, env={"DB_ASYNC": str(async_mode).lower()}) as base_url:
+        tokens = seed_over_http(base_url)
+        print(f"{label:<6} {asyncio.run(drive(seconds, clients, tokens['user']))}")
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 20
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    run("sync", False, seconds, clients)
+    run("async", True, seconds, clients)
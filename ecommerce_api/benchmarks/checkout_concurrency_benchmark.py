@@ -0,0 +1,155 @@
+"""
+Runs hundreds of simultaneous checkouts against a low-stock product.
+
+Every user's cart holds one unit of a hot product with only `stock` units
+left, plus one unit of a well-stocked product. All users check out at the
+same moment against a real uvicorn server. Exactly `stock` checkouts must
+succeed and the rest must be rejected with 409; afterwards the hot
+product's stock must be zero, and the orders must account for every unit
+taken. The run fails if anything oversold, errored, or if throughput falls
+below the given minimum.
+
+Runs once with sync routes and once with DB_ASYNC=true.
+
+Usage (from the ecommerce_api directory):
+    python -m benchmarks.checkout_concurrency_benchmark [users] [stock] [min_checkouts_per_s]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+
+from sqlalchemy import create_engine, func, insert, select
+from app.auth.models import User, UserRole
+from app.auth.utils import create_access_token
+from app.cart.models import CartItem
+from app.core.migrations import run_migrations
+from app.orders.models import Order, OrderItem
+from app.products.models import Product
+from benchmarks.server import call, running_server
+
+PORT = 8767
+BASE_URL = f"http://127.0.0.1:{PORT}"
+HOT, COLD = 1, 2
+
+
+def seed(database_url: str, users: int, stock: int) -> list[str]:
+    """
+    Creates the products, the users and one two-line cart per user.
+
+    Args:
+        database_url (str): Database to seed.
+        users (int): Number of users checking out.
+        stock (int): Units of the hot product.
+
+    Returns:
+        list[str]: One access token per user.
+    """
+    engine = create_engine(database_url)
+    run_migrations(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Product), [
+            {"id": HOT, "name": "Hot", "description": "d", "price": 10.0, "stock": stock,
+             "category": "bench", "image_url": "img"},
+            {"id": COLD, "name": "Cold", "description": "d", "price": 1.0, "stock": users * 10,
+             "category": "bench", "image_url": "img"},
+        ])
+        conn.execute(insert(User), [
+            {"id": n, "name": f"user{n}", "email": f"user{n}@bench.io", "hashed_password": "-",
+             "role": UserRole.user}
+            for n in range(1, users + 1)
+        ])
+        conn.execute(insert(CartItem), [
+            {"user_id": n, "product_id": product_id, "quantity": 1}
+            for n in range(1, users + 1) for product_id in (HOT, COLD)
+        ])
+    engine.dispose()
+    return [create_access_token({"sub": str(n), "role": "user"}) for n in range(1, users + 1)]
+
+
+def stampede(tokens: list[str]) -> tuple[list[tuple[int, float]], float]:
+    """
+    Sends one checkout per token, all released at the same moment.
+
+    Args:
+        tokens (list[str]): Access tokens, one per user.
+
+    Returns:
+        tuple: ([(status, latency_ms)], elapsed seconds).
+    """
+    results = []
+    lock = threading.Lock()
+    gate = threading.Barrier(len(tokens) + 1)
+
+    def checkout(token: str) -> None:
+        gate.wait()
+        started = time.perf_counter()
+        status, _ = call(BASE_URL, "POST", "/checkout/", token=token)
+        with lock:
+            results.append((status, (time.perf_counter() - started) * 1000))
+
+    threads = [threading.Thread(target=checkout, args=(token,)) for token in tokens]
+    for thread in threads:
+        thread.start()
+    gate.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - started
+
+
+def verify(database_url: str, successes: int, stock: int) -> dict:
+    """
+    Checks stock and orders after the run.
+
+    Args:
+        database_url (str): Database the server used.
+        successes (int): Checkouts that returned 200.
+        stock (int): Initial units of the hot product.
+
+    Returns:
+        dict: Remaining hot stock, orders and hot units sold.
+    """
+    engine = create_engine(database_url)
+    with engine.connect() as conn:
+        remaining = conn.execute(select(Product.stock).where(Product.id == HOT)).scalar_one()
+        orders = conn.execute(select(func.count()).select_from(Order)).scalar_one()
+        sold = conn.execute(
+            select(func.coalesce(func.sum(OrderItem.quantity), 0)).where(OrderItem.product_id == HOT)
+        ).scalar_one()
+    engine.dispose()
+    assert remaining >= 0, f"stock went negative: {remaining}"
+    assert sold == stock - remaining, f"{sold} units ordered but {stock - remaining} taken from stock"
+    assert orders == successes and sold == successes, f"{successes} checkouts, {orders} orders, {sold} units sold"
+    return {"remaining_stock": remaining, "orders": orders, "hot_units_sold": sold}
+
+
+def run(label: str, env: dict, users: int, stock: int, min_rate: float) -> None:
+    database_url = f"sqlite:///{tempfile.mkdtemp(prefix='checkout-bench-')}/bench.db"
+    tokens = seed(database_url, users, stock)
+    with running_server(PORT, env=env, database_url=database_url):
+        results, elapsed = stampede(tokens)
+
+    statuses = [status for status, _ in results]
+    successes, rejected = statuses.count(200), statuses.count(409)
+    assert successes + rejected == users, f"unexpected statuses: {sorted(set(statuses))}"
+    assert successes == min(stock, users), f"{successes} checkouts succeeded for {stock} units"
+    checks = verify(database_url, successes, stock)
+
+    cuts = statistics.quantiles([latency for _, latency in results], n=100)
+    rate = users / elapsed
+    print(f"{label:<6} {users} checkouts in {elapsed:.2f}s ({rate:.0f}/s), "
+          f"{successes} ok, {rejected} rejected, p50 {cuts[49]:.0f} ms, p99 {cuts[98]:.0f} ms, {checks}")
+    assert rate >= min_rate, f"throughput {rate:.0f}/s below {min_rate:g}/s"
+
+
+if __name__ == "__main__":
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    stock = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    min_rate = float(sys.argv[3]) if len(sys.argv) > 3 else 20
+    run("sync", {"DB_ASYNC": "false"}, users, stock, min_rate)
+    run("async", {"DB_ASYNC": "true"}, users, stock, min_rate)
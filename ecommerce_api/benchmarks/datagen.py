@@ -0,0 +1,204 @@
+"""
+Seeded synthetic data for benchmarks: users, products, carts and orders.
+
+Rows are written through the application models with batched inserts and
+explicit primary keys, so the same scale and seed always produce the same
+database. User 1 is an admin; every user's password is `PASSWORD`.
+
+Usage (from the ecommerce_api directory):
+    python -m benchmarks.datagen <database file> [scale] [seed]
+
+`scale` is the number of products (default 10000); the other tables are
+sized from it, e.g. 1000000 gives 100k users and 500k orders.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# The engine is created at import time, so make sure it has a valid URL
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='datagen-')}/placeholder.db")
+
+from sqlalchemy import func, insert, select  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+from app.auth.models import User, UserRole  # noqa: E402
+from app.auth.utils import pwd_context  # noqa: E402
+from app.cart.models import CartItem  # noqa: E402
+from app.orders.models import Order, OrderItem, OrderStatus  # noqa: E402
+from app.products.models import Product  # noqa: E402
+
+PASSWORD = "Bench@123"
+BATCH_SIZE = 10_000
+CATEGORIES = ["apparel", "footwear", "home", "electronics", "outdoors", "toys", "books", "garden"]
+VOCABULARY = [
+    "blue", "red", "green", "cotton", "leather", "wireless", "steel", "classic",
+    "shirt", "shoe", "lamp", "chair", "phone", "cable", "watch", "bottle",
+]
+WORDS = VOCABULARY + [f"term{n}" for n in range(2_000)]
+# Orders are spread over the year before this date
+ORDERS_UNTIL = datetime(2025, 1, 1)
+
+
+def scale_counts(scale: int) -> dict:
+    """
+    Sizes every table from the number of products.
+
+    Args:
+        scale (int): Number of products.
+
+    Returns:
+        dict: Row counts for users, products, orders and users with a cart.
+    """
+    return {
+        "users": max(scale // 10, 10),
+        "products": scale,
+        "orders": scale // 2,
+        "carts": max(scale // 20, 1),
+    }
+
+
+def insert_batches(engine: Engine, model, rows) -> int:
+    """
+    Inserts rows from an iterator in batches of `BATCH_SIZE`, one transaction per batch.
+
+    Args:
+        engine (Engine): Target engine.
+        model: Mapped class to insert into.
+        rows: Iterator of column dicts.
+
+    Returns:
+        int: Number of rows inserted.
+    """
+    total = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            with engine.begin() as conn:
+                conn.execute(insert(model), batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        with engine.begin() as conn:
+            conn.execute(insert(model), batch)
+        total += len(batch)
+    return total
+
+
+def generate(engine: Engine, scale: int, seed: int = 42) -> dict:
+    """
+    Fills an empty, migrated database with deterministic synthetic data.
+
+    Args:
+        engine (Engine): Engine bound to the database.
+        scale (int): Number of products; other tables are sized from it.
+        seed (int): Random seed.
+
+    Returns:
+        dict: Row counts written per table.
+    """
+    counts = scale_counts(scale)
+    rng = random.Random(seed)
+    hashed = pwd_context.hash(PASSWORD)
+    prices = [0.0] * (counts["products"] + 1)
+
+    def order_lines(order_id: int) -> list[tuple[int, int]]:
+        # Each order has its own generator so its lines can be rebuilt for order_items
+        order_rng = random.Random(seed * 1_000_003 + order_id)
+        lines = order_rng.sample(range(1, counts["products"] + 1), order_rng.randint(1, 4))
+        return [(product_id, order_rng.randint(1, 3)) for product_id in lines]
+
+    def users():
+        for user_id in range(1, counts["users"] + 1):
+            yield {
+                "id": user_id,
+                "name": f"User {user_id}",
+                "email": f"user{user_id}@bench.io",
+                "hashed_password": hashed,
+                "role": UserRole.admin if user_id == 1 else UserRole.user,
+            }
+
+    def products():
+        for product_id in range(1, counts["products"] + 1):
+            price = round(rng.uniform(1, 500), 2)
+            prices[product_id] = price
+            yield {
+                "id": product_id,
+                "name": " ".join(rng.sample(WORDS, 3)),
+                "description": " ".join(rng.choices(WORDS, k=12)),
+                "price": price,
+                "stock": 1_000_000,
+                "category": rng.choice(CATEGORIES),
+                "image_url": f"https://img.example.com/{product_id}.png",
+                "sku": f"SKU-{product_id:08d}",
+            }
+
+    def orders():
+        for order_id in range(1, counts["orders"] + 1):
+            total = sum(prices[product_id] * quantity for product_id, quantity in order_lines(order_id))
+            yield {
+                "id": order_id,
+                # User 1 is the admin, who cannot place orders
+                "user_id": rng.randint(2, counts["users"]),
+                "total_amount": round(total, 2),
+                "status": OrderStatus.paid,
+                "created_at": ORDERS_UNTIL - timedelta(seconds=rng.randint(0, 365 * 86400)),
+            }
+
+    def order_items():
+        for order_id in range(1, counts["orders"] + 1):
+            for product_id, quantity in order_lines(order_id):
+                yield {
+                    "order_id": order_id,
+                    "product_id": product_id,
+                    "quantity": quantity,
+                    "price_at_purchase": prices[product_id],
+                }
+
+    def carts():
+        for user_id in rng.sample(range(2, counts["users"] + 1), min(counts["carts"], counts["users"] - 1)):
+            for product_id in rng.sample(range(1, counts["products"] + 1), rng.randint(1, 3)):
+                yield {"user_id": user_id, "product_id": product_id, "quantity": rng.randint(1, 2)}
+
+    return {
+        "users": insert_batches(engine, User, users()),
+        "products": insert_batches(engine, Product, products()),
+        "orders": insert_batches(engine, Order, orders()),
+        "order_items": insert_batches(engine, OrderItem, order_items()),
+        "cart": insert_batches(engine, CartItem, carts()),
+    }
+
+
+def is_empty(engine: Engine) -> bool:
+    """
+    Checks whether the database has no users yet.
+
+    Args:
+        engine (Engine): Engine bound to the database.
+
+    Returns:
+        bool: True if nothing has been generated.
+    """
+    with engine.connect() as conn:
+        return not conn.execute(select(func.count()).select_from(User)).scalar()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    from app.core.database import create_db_engine
+    from app.core.migrations import run_migrations
+
+    target = create_db_engine(f"sqlite:///{os.path.abspath(sys.argv[1])}")
+    run_migrations(target)
+    if not is_empty(target):
+        sys.exit(f"{sys.argv[1]} already contains data")
+    started = time.perf_counter()
+    result = generate(
+        target,
+        scale=int(sys.argv[2]) if len(sys.argv) > 2 else 10_000,
+        seed=int(sys.argv[3]) if len(sys.argv) > 3 else 42,
+    )
+    print(f"{result} in {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,146 @@
+"""
+Measures the public listing cache under bursts of identical requests.
+
+A generated catalog is served in-process (ASGI calls, no network). Each
+round fires `burst` concurrent requests for one popular listing page, the
+way a front page is hit when a CDN entry expires. Every `write_every`
+rounds the catalog version is bumped, as an admin write would, so the next
+burst arrives at a cold cache and its misses must be coalesced into one
+query.
+
+The same rounds run with the cache disabled (max size 0) and enabled, and
+the bodies must match. Reports throughput, SQL statements per request,
+hit ratio and coalesced requests.
+
+Runs the sync routes unless DB_ASYNC=true is set.
+
+Usage (from the ecommerce_api directory):
+    python -m benchmarks.listing_cache_benchmark [rounds] [burst] [write_every]
+"""
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='listing-bench-')}/bench.db")
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+
+from sqlalchemy import event  # noqa: E402
+from app.core import database  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import SessionLocal, get_engine  # noqa: E402
+from app.core.migrations import run_migrations  # noqa: E402
+from app.products import versions  # noqa: E402
+from app.products.cache import listing_cache  # noqa: E402
+from benchmarks.datagen import generate  # noqa: E402
+from benchmarks.load_test import AsgiClient, asgi_lifespan  # noqa: E402
+
+SCALE = 20000
+# Popular pages, requested round-robin
+PATHS = [
+    "/products/?page_size=20",
+    "/products/?page_size=20&sort_by=price&include_total=true",
+    "/products/?category=apparel&page_size=20",
+    "/products/?category=electronics&sort_by=name&page=3&page_size=20",
+]
+
+
+def bump_version() -> None:
+    with SessionLocal() as db:
+        versions.bump_catalog_version(db)
+        db.commit()
+
+
+async def run_rounds(client: AsgiClient, rounds: int, burst: int, write_every: int) -> tuple[float, dict]:
+    """
+    Args:
+        client (AsgiClient): In-process client.
+        rounds (int): Number of bursts.
+        burst (int): Concurrent requests per burst.
+        write_every (int): Bump the catalog version after this many rounds.
+
+    Returns:
+        tuple: (elapsed seconds, {path: last body}).
+    """
+    bodies = {}
+    elapsed = 0.0
+    for n in range(rounds):
+        if n and n % write_every == 0:
+            bump_version()
+        path = PATHS[n % len(PATHS)]
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(client.request("GET", path) for _ in range(burst)))
+        elapsed += time.perf_counter() - started
+        assert all(status == 200 for status, _, _ in responses), {status for status, _, _ in responses}
+        assert len({body for _, _, body in responses}) == 1, f"{path} answered differently within a burst"
+        bodies[path] = responses[0][2]
+    return elapsed, bodies
+
+
+def run(rounds: int, burst: int, write_every: int) -> None:
+    from app.main import app
+
+    engine = get_engine()
+    run_migrations(engine)
+    generate(engine, SCALE, seed=1)
+
+    statements = [0]
+
+    def count(*args) -> None:
+        statements[0] += 1
+
+    engines = [engine] + ([database.async_engine.sync_engine] if database.async_engine is not None else [])
+    for counted in engines:
+        event.listen(counted, "before_cursor_execute", count)
+
+    async def measure(max_size: int) -> tuple[dict, dict]:
+        listing_cache.clear()
+        listing_cache.max_size = max_size
+        before = listing_cache.stats()
+        statements[0] = 0
+        elapsed, bodies = await run_rounds(AsgiClient(app), rounds, burst, write_every)
+        after = listing_cache.stats()
+        lookups = (after["hits"] - before["hits"]) + (after["misses"] - before["misses"])
+        requests = rounds * burst
+        return bodies, {
+            "req/s": requests / elapsed,
+            "sql/req": statements[0] / requests,
+            "hit ratio": (after["hits"] - before["hits"]) / lookups if lookups else 0.0,
+            "coalesced": after["coalesced"] - before["coalesced"],
+        }
+
+    async def main() -> dict:
+        channel = {}
+        await asgi_lifespan(app, "startup", channel)
+        try:
+            return {
+                label: await measure(max_size)
+                for label, max_size in (("off", 0), ("on", settings.LISTING_CACHE_MAX_SIZE or 1000))
+            }
+        finally:
+            await asgi_lifespan(app, "shutdown", channel)
+
+    logging.disable(logging.INFO)
+    results = asyncio.run(main())
+    logging.disable(logging.NOTSET)
+
+    (off_bodies, off), (on_bodies, on) = results["off"], results["on"]
+    assert off_bodies == on_bodies, "cached listings differ from uncached ones"
+
+    print(f"\nListing cache, {'async' if settings.DB_ASYNC else 'sync'} routes, {SCALE} products: "
+          f"{rounds} bursts of {burst} identical requests, catalog write every {write_every} bursts")
+    print(f"{'cache':<8}{'req/s':>10}{'sql/req':>10}{'hit ratio':>12}{'coalesced':>12}")
+    for label, stats in (("off", off), ("on", on)):
+        print(f"{label:<8}{stats['req/s']:>10.0f}{stats['sql/req']:>10.2f}"
+              f"{stats['hit ratio']:>12.2f}{stats['coalesced']:>12}")
+    print(f"speedup {on['req/s'] / off['req/s']:.1f}x, "
+          f"{off['sql/req'] / on['sql/req']:.1f}x fewer statements per request")
+
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    burst = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    write_every = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    run(rounds, burst, write_every)
@@ -0,0 +1,402 @@
+"""
+Reproducible load test over scripted user journeys.
+
+Generates a seeded synthetic database (see benchmarks/datagen.py), then runs
+each scenario in benchmarks/scenarios.py for a fixed time with concurrent
+virtual users. It can run against the app in-process (ASGI calls, no
+network) and/or against a real uvicorn server on the same database.
+Reports throughput and p50/p95/p99 per endpoint and writes a JSON file that
+`--compare` can diff against a later run.
+
+Usage (from the ecommerce_api directory):
+    python -m benchmarks.load_test [--scale 10000] [--seed 42] [--mode both]
+        [--scenarios browse,search,add_to_cart,checkout,order_history]
+        [--duration 10] [--warmup 2] [--concurrency 20] [--workers 1]
+        [--db FILE] [--output FILE] [--compare BASELINE.json]
+
+Scenarios write orders, so compare runs that start from a freshly generated
+database (the default) rather than a reused `--db`.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+PORT = 8767
+
+
+class AsgiClient:
+    """
+    Calls an ASGI app directly, without sockets.
+
+    Args:
+        app: The ASGI application.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def request(self, method: str, path: str, body: dict = None, token: str = None):
+        url = urlsplit(path)
+        data = json.dumps(body).encode() if body is not None else b""
+        headers = [(b"host", b"bench"), (b"content-length", str(len(data)).encode())]
+        if body is not None:
+            headers.append((b"content-type", b"application/json"))
+        if token:
+            headers.append((b"authorization", f"Bearer {token}".encode()))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": url.path,
+            "raw_path": url.path.encode(),
+            "query_string": url.query.encode(),
+            "root_path": "",
+            "headers": headers,
+            "client": ("127.0.0.1", 0),
+            "server": ("bench", 80),
+        }
+        done = asyncio.Event()
+        sent = False
+        response = {"status": 500, "headers": {}, "body": []}
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": data, "more_body": False}
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = {k.decode().lower(): v.decode() for k, v in message.get("headers", [])}
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+                if not message.get("more_body"):
+                    done.set()
+
+        await self.app(scope, receive, send)
+        done.set()
+        return response["status"], response["headers"], b"".join(response["body"])
+
+    async def close(self) -> None:
+        pass
+
+
+class HttpClient:
+    """
+    Minimal HTTP/1.1 keep-alive client on asyncio streams (one connection).
+
+    Args:
+        host (str): Server host.
+        port (int): Server port.
+    """
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method: str, path: str, body: dict = None, token: str = None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        data = json.dumps(body).encode() if body is not None else b""
+        head = f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Length: {len(data)}\r\n"
+        if body is not None:
+            head += "Content-Type: application/json\r\n"
+        if token:
+            head += f"Authorization: Bearer {token}\r\n"
+        self.writer.write(head.encode() + b"\r\n" + data)
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode().partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding") == "chunked":
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).strip(), 16)
+                chunk = await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                chunks.append(chunk[:-2])
+            payload = b"".join(chunks)
+        else:
+            payload = await self.reader.readexactly(int(headers.get("content-length", 0)))
+        if headers.get("connection") == "close":
+            await self.close()
+        return status, headers, payload
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = self.reader = None
+
+
+async def asgi_lifespan(app, phase: str, channel: dict) -> None:
+    """
+    Drives the ASGI lifespan protocol so in-process runs see startup and shutdown.
+
+    Args:
+        app: The ASGI application.
+        phase (str): "startup" to start the app, "shutdown" to stop it.
+        channel (dict): State shared between the two calls.
+    """
+    if phase == "startup":
+        channel["events"] = asyncio.Queue()
+        channel["replies"] = asyncio.Queue()
+        await channel["events"].put({"type": "lifespan.startup"})
+        channel["task"] = asyncio.create_task(app(
+            {"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}},
+            channel["events"].get,
+            channel["replies"].put,
+        ))
+    else:
+        await channel["events"].put({"type": "lifespan.shutdown"})
+    reply = await channel["replies"].get()
+    if not reply["type"].endswith(".complete"):
+        raise RuntimeError(f"lifespan {phase} failed: {reply}")
+    if phase == "shutdown":
+        await channel["task"]
+
+
+def summarize(samples: list[tuple[int, float]], seconds: float) -> dict:
+    latencies = sorted(ms for _, ms in samples)
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100)
+    else:
+        cuts = [latencies[0] if latencies else 0.0] * 99
+    return {
+        "requests": len(samples),
+        "rps": round(len(samples) / seconds, 1),
+        "p50_ms": round(cuts[49], 2),
+        "p95_ms": round(cuts[94], 2),
+        "p99_ms": round(cuts[98], 2),
+        "errors": sum(status >= 400 for status, _ in samples),
+    }
+
+
+async def run_scenario(open_client, scenario, users: list, duration: float, warmup: float) -> dict:
+    """
+    Runs one scenario with every virtual user looping until the time is up.
+
+    Args:
+        open_client: Callable returning a new client for one virtual user.
+        scenario: Scenario coroutine from benchmarks.scenarios.
+        users (list[VirtualUser]): One entry per concurrent user.
+        duration (float): Measured seconds.
+        warmup (float): Seconds run before measuring starts.
+
+    Returns:
+        dict: Totals and per-endpoint statistics.
+    """
+    samples: dict[str, list] = {}
+    measure_from = time.monotonic() + warmup
+    stop = measure_from + duration
+
+    def record(endpoint: str, status: int, ms: float) -> None:
+        if measure_from <= time.monotonic() <= stop:
+            samples.setdefault(endpoint, []).append((status, ms))
+
+    async def virtual_user(user) -> None:
+        client = open_client()
+        try:
+            while time.monotonic() < stop:
+                await scenario(client, user, record)
+        finally:
+            await client.close()
+
+    await asyncio.gather(*(virtual_user(user) for user in users))
+    return {
+        "total": summarize([sample for endpoint in samples.values() for sample in endpoint], duration),
+        "endpoints": {endpoint: summarize(rows, duration) for endpoint, rows in sorted(samples.items())},
+    }
+
+
+async def run_all(open_client, scenarios: dict, users: list, args) -> dict:
+    results = {}
+    for name, scenario in scenarios.items():
+        results[name] = await run_scenario(open_client, scenario, users, args.duration, args.warmup)
+    return results
+
+
+def print_results(mode: str, results: dict) -> None:
+    print(f"\n[{mode}]")
+    print(f"{'scenario':<14}{'endpoint':<30}{'requests':>9}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    for scenario, result in results.items():
+        for endpoint, stats in result["endpoints"].items():
+            print(
+                f"{scenario:<14}{endpoint:<30}{stats['requests']:>9}{stats['rps']:>9}"
+                f"{stats['p50_ms']:>9}{stats['p95_ms']:>9}{stats['p99_ms']:>9}{stats['errors']:>8}"
+            )
+
+
+def compare(current: dict, baseline: dict) -> None:
+    """
+    Prints per-endpoint changes in throughput and latency against a baseline run.
+
+    Args:
+        current (dict): Results of this run.
+        baseline (dict): Results loaded from a previous run's JSON file.
+    """
+    def change(new: float, old: float) -> str:
+        return f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+
+    print(f"\nCompared with {baseline['meta'].get('started_at')} ({baseline['meta'].get('git_commit')})")
+    print(f"{'mode':<10}{'scenario':<14}{'endpoint':<30}{'rps':>9}{'p50':>9}{'p99':>9}")
+    for mode, scenarios in current["results"].items():
+        for scenario, result in scenarios.items():
+            old_endpoints = baseline["results"].get(mode, {}).get(scenario, {}).get("endpoints", {})
+            for endpoint, stats in result["endpoints"].items():
+                old = old_endpoints.get(endpoint)
+                if old is None:
+                    continue
+                print(
+                    f"{mode:<10}{scenario:<14}{endpoint:<30}{change(stats['rps'], old['rps']):>9}"
+                    f"{change(stats['p50_ms'], old['p50_ms']):>9}{change(stats['p99_ms'], old['p99_ms']):>9}"
+                )
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the scripted load test.")
+    parser.add_argument("--scale", type=int, default=10_000, help="Number of generated products")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--mode", choices=["inprocess", "server", "both"], default="both")
+    parser.add_argument("--scenarios", default="browse,search,add_to_cart,checkout,order_history")
+    parser.add_argument("--duration", type=float, default=10, help="Measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=2, help="Unmeasured seconds before each scenario")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers in server mode")
+    parser.add_argument("--db", help="Database file to reuse (generated if empty)")
+    parser.add_argument("--output", help="Results file (default: load_test_<timestamp>.json)")
+    parser.add_argument("--compare", help="Results file of a previous run to diff against")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> None:
+    args = parse_args(argv)
+    started_at = datetime.now(timezone.utc)
+    db_path = os.path.abspath(args.db or os.path.join(tempfile.mkdtemp(prefix="load-test-"), "bench.db"))
+    database_url = f"sqlite:///{db_path}"
+
+    # The app reads its settings at import time
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("SECRET_KEY", "bench-secret")
+    from app.auth.utils import create_access_token
+    from app.core.config import settings
+    from app.core.database import get_engine
+    from app.core.migrations import run_migrations
+    from app.main import app
+    from benchmarks import datagen
+    from benchmarks.scenarios import SCENARIOS, VirtualUser
+
+    unknown = set(args.scenarios.split(",")) - set(SCENARIOS)
+    if unknown:
+        sys.exit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+    scenarios = {name: SCENARIOS[name] for name in args.scenarios.split(",")}
+
+    engine = get_engine()
+    run_migrations(engine)
+    if datagen.is_empty(engine):
+        generating = time.perf_counter()
+        rows = datagen.generate(engine, args.scale, args.seed)
+        print(f"Generated {rows} in {time.perf_counter() - generating:.1f}s at {db_path}")
+    else:
+        rows = {"reused": db_path}
+    counts = datagen.scale_counts(args.scale)
+
+    # Virtual users are distinct shoppers (user 1 is the admin)
+    users = [
+        VirtualUser(
+            user_id=user_id,
+            token=create_access_token({"sub": str(user_id), "role": "user"}),
+            products=counts["products"],
+            rng=random.Random(args.seed + user_id),
+        )
+        for user_id in range(2, min(args.concurrency, counts["users"] - 1) + 2)
+    ]
+
+    report = {
+        "meta": {
+            "started_at": started_at.isoformat(),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "db_async": settings.DB_ASYNC,
+            "scale": args.scale,
+            "seed": args.seed,
+            "rows": rows,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "concurrency": len(users),
+            "workers": args.workers,
+        },
+        "results": {},
+    }
+
+    if args.mode in ("inprocess", "both"):
+        # Request logging would flood the console; the server mode discards it instead
+        logging.disable(logging.INFO)
+
+        async def in_process() -> dict:
+            channel = {}
+            await asgi_lifespan(app, "startup", channel)
+            try:
+                return await run_all(lambda: AsgiClient(app), scenarios, users, args)
+            finally:
+                await asgi_lifespan(app, "shutdown", channel)
+
+        report["results"]["inprocess"] = asyncio.run(in_process())
+        logging.disable(logging.NOTSET)
+        print_results("inprocess", report["results"]["inprocess"])
+
+    if args.mode in ("server", "both"):
+        from benchmarks.server import running_server
+
+        engine.dispose()
+        with running_server(PORT, workers=args.workers, database_url=database_url):
+            report["results"]["server"] = asyncio.run(
+                run_all(lambda: HttpClient("127.0.0.1", PORT), scenarios, users, args)
+            )
+        print_results("server", report["results"]["server"])
+
+    output = args.output or f"load_test_{started_at.strftime('%Y%m%dT%H%M%SZ')}.json"
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            compare(report, json.load(file))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,154 @@
+"""
+Measures what request logging costs the request path.
+
+Two parts, each run against a fast sink (/dev/null) and a slow one that
+sleeps on every write, standing in for a blocked stdout or a busy pipe:
+
+- per call: one hot-route INFO line, logged eagerly with an f-string through
+  a synchronous handler (the previous setup) versus the lazy, queued and
+  sampled configurations of app.core.logs;
+- per request: GET /products/{id} and GET /products/ driven in-process
+  through the full middleware stack, with logging disabled as the baseline.
+  A request costs about a millisecond here, so differences of a few
+  microseconds are below its noise; the per-call table resolves them.
+
+Usage (from the ecommerce_api directory):
+    python -m benchmarks.logging_benchmark [requests] [slow_sink_us]
+"""
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='logging-bench-')}/bench.db")
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+os.environ.setdefault("PRODUCT_CACHE_WARM_SIZE", "0")
+
+from app.core.config import settings
+from app.core.logs import setup_logging, stop_logging
+
+SCALE = 2000
+CHUNK = 100
+HOT_LOGGER = "app.products.public_routes"
+
+# name -> (LOG_FORMAT, LOG_QUEUE_SIZE, LOG_SAMPLE_RATES, LOG_LEVEL)
+CONFIGS = {
+    "off": ("text", 0, "", "WARNING"),
+    "sync text (before)": ("text", 0, "", "INFO"),
+    "sync json": ("json", 0, "", "INFO"),
+    "queued json": ("json", 100_000, "", "INFO"),
+    "queued json, 1% sampled": ("json", 100_000, f"{HOT_LOGGER}=0.01", "INFO"),
+}
+
+
+class SlowSink:
+    """
+    Text stream that blocks for a fixed time on every write.
+
+    Args:
+        delay (float): Seconds each write blocks.
+    """
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def write(self, text: str) -> int:
+        time.sleep(self.delay)
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def configure(name: str, sink) -> None:
+    settings.LOG_FORMAT, settings.LOG_QUEUE_SIZE, settings.LOG_SAMPLE_RATES, settings.LOG_LEVEL = CONFIGS[name]
+    setup_logging(stream=sink)
+
+
+def per_call(name: str, sink, calls: int, eager: bool) -> float:
+    configure(name, sink)
+    logger = logging.getLogger(HOT_LOGGER)
+    category, page, page_size = "books", 3, 20
+    started = time.perf_counter()
+    if eager:
+        for _ in range(calls):
+            logger.info(f"Listing products - category: {category}, page: {page}, size: {page_size}")
+    else:
+        for _ in range(calls):
+            logger.info("Listing products - category: %s, page: %s, size: %s", category, page, page_size)
+    elapsed = time.perf_counter() - started
+    stop_logging()
+    return elapsed / calls * 1e6
+
+
+async def per_request(client, name: str, sink, paths: list[str]) -> tuple[float, float]:
+    configure(name, sink)
+    started, cpu_started = time.perf_counter(), time.process_time()
+    for path in paths:
+        status, _, _ = await client.request("GET", path)
+        assert status == 200, (path, status)
+    # Stopping drains the queue, so background formatting is part of the CPU time
+    stop_logging()
+    elapsed, cpu = time.perf_counter() - started, time.process_time() - cpu_started
+    return elapsed / len(paths) * 1e6, cpu / len(paths) * 1e6
+
+
+async def run(requests: int, slow_us: float) -> None:
+    from app.core.database import get_engine
+    from app.core.migrations import run_migrations
+    from app.main import app
+    from benchmarks.datagen import generate
+    from benchmarks.load_test import AsgiClient, asgi_lifespan
+
+    engine = get_engine()
+    run_migrations(engine)
+    generate(engine, SCALE, seed=1)
+
+    sinks = {"devnull": open(os.devnull, "w"), f"slow {slow_us:g}us": SlowSink(slow_us / 1e6)}
+    calls = max(requests * 5, 10_000)
+
+    print(f"\nPer log call, one hot-route INFO line ({calls} calls), µs on the calling thread")
+    print(f"{'config':<28}" + "".join(f"{sink:>16}" for sink in sinks))
+    rows = [("sync text, f-string (before)", "sync text (before)", True)]
+    rows += [(f"{name}, lazy", name, False) for name in CONFIGS if name != "sync text (before)"]
+    for label, name, eager in rows:
+        cells = [per_call(name, sink, calls, eager) for sink in sinks.values()]
+        print(f"{label:<28}" + "".join(f"{value:>16.2f}" for value in cells))
+
+    channel = {}
+    await asgi_lifespan(app, "startup", channel)
+    try:
+        client = AsgiClient(app)
+        paths = [f"/products/{n % 500 + 1}" if n % 2 else f"/products/?page={n % 5 + 1}" for n in range(CHUNK)]
+        for path in paths:
+            await client.request("GET", path)
+        # Configs take turns on short chunks and the median chunk is kept, so
+        # drift in machine speed affects every config alike
+        samples = {(name, sink_name): [] for name in CONFIGS for sink_name in sinks}
+        for _ in range(max(requests // CHUNK, 1)):
+            for name in CONFIGS:
+                for sink_name, sink in sinks.items():
+                    samples[name, sink_name].append(await per_request(client, name, sink, paths))
+        for column, title in ((0, "wall time"), (1, "process CPU time, including the log thread")):
+            print(f"\nPer request, GET /products/{{id}} and GET /products/ ({requests} per config), µs of {title}")
+            print(f"{'config':<28}" + "".join(f"{sink:>16}{'overhead':>10}" for sink in sinks))
+            for name in CONFIGS:
+                line = f"{name:<28}"
+                for sink_name in sinks:
+                    micros = statistics.median(sample[column] for sample in samples[name, sink_name])
+                    baseline = statistics.median(sample[column] for sample in samples["off", sink_name])
+                    line += f"{micros:>16.1f}{micros - baseline:>+10.1f}"
+                print(line)
+    finally:
+        setup_logging(stream=open(os.devnull, "w"))
+        await asgi_lifespan(app, "shutdown", channel)
+        stop_logging()
+
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    slow_us = float(sys.argv[2]) if len(sys.argv) > 2 else 50
+    asyncio.run(run(requests, slow_us))
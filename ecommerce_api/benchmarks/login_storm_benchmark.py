@@ -0,0 +1,79 @@
+"""
+Measures catalog latency while a burst of /auth/signin calls is in flight.
+
+Starts a real uvicorn server twice: once hashing passwords inline on the
+request threads (BCRYPT_WORKERS=0) and once with the dedicated bcrypt
+process pool, and reports catalog p50/p99 under the same login storm.
+
+Usage (from the ecommerce_api directory):
+    python -m benchmarks.login_storm_benchmark [seconds] [login_clients] [catalog_clients]
+"""
+import os
+import statistics
+import sys
+import threading
+import time
+from benchmarks.server import PASSWORD, call as http_call, running_server, seed_over_http
+
+PORT = 8765
+BASE_URL = f"http://127.0.0.1:{PORT}"
+
+
+def call(method: str, path: str, body: dict = None, token: str = None) -> tuple[int, dict]:
+    return http_call(BASE_URL, method, path, body, token)
+
+
+def storm(seconds: float, login_clients: int, catalog_clients: int) -> dict:
+    stop = time.monotonic() + seconds
+    catalog, logins, rejected = [], [], []
+    lock = threading.Lock()
+
+    def login_client() -> None:
+        done, busy = 0, 0
+        while time.monotonic() < stop:
+            status, _ = call("POST", "/auth/signin", {"email": "user@bench.io", "password": PASSWORD})
+            done += status == 200
+            busy += status == 503
+        with lock:
+            logins.append(done)
+            rejected.append(busy)
+
+    def catalog_client(offset: int) -> None:
+        local, n = [], offset
+        while time.monotonic() < stop:
+            started = time.perf_counter()
+            call("GET", f"/products/?page={n % 5 + 1}")
+            local.append((time.perf_counter() - started) * 1000)
+            n += 1
+        with lock:
+            catalog.extend(local)
+
+    threads = [threading.Thread(target=login_client) for _ in range(login_clients)]
+    threads += [threading.Thread(target=catalog_client, args=(n,)) for n in range(catalog_clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    cuts = statistics.quantiles(catalog, n=100)
+    return {
+        "catalog_requests": len(catalog),
+        "catalog_p50_ms": round(cuts[49], 2),
+        "catalog_p99_ms": round(cuts[98], 2),
+        "logins_per_s": round(sum(logins) / seconds, 1),
+        "logins_rejected": sum(rejected),
+    }
+
+
+def run(label: str, workers: int, seconds: float, login_clients: int, catalog_clients: int) -> None:
+    with running_server(PORT, env={"BCRYPT_WORKERS": str(workers)}):
+        seed_over_http(BASE_URL)
+        print(f"{label:<14} {storm(seconds, login_clients, catalog_clients)}")
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 15
+    login_clients = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    catalog_clients = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    run("inline bcrypt", 0, seconds, login_clients, catalog_clients)
+    run("bcrypt pool", min(4, os.cpu_count() or 1), seconds, login_clients, catalog_clients)
@@ -0,0 +1,92 @@
+"""
+Scripted user journeys for the load test.
+
+Each scenario is a coroutine running one iteration of a journey for a
+virtual user. It calls `client.request(...)` and reports every call to
+`record(endpoint, status, milliseconds)`, where `endpoint` is the route
+template so results group the same way as the /metrics labels.
+"""
+import json
+import time
+from urllib.parse import urlencode
+from benchmarks.datagen import CATEGORIES, VOCABULARY
+
+
+class VirtualUser:
+    """
+    State kept by one simulated shopper across scenario iterations.
+
+    Attributes:
+        user_id (int): Generated user ID.
+        token (str): Bearer token for the user.
+        products (int): Number of generated products (IDs are 1..products).
+        rng (random.Random): Per-user random generator.
+    """
+
+    def __init__(self, user_id: int, token: str, products: int, rng):
+        self.user_id = user_id
+        self.token = token
+        self.products = products
+        self.rng = rng
+
+
+async def timed(client, record, endpoint: str, method: str, path: str, user: VirtualUser, body: dict = None):
+    started = time.perf_counter()
+    status, headers, payload = await client.request(method, path, body=body, token=user.token)
+    record(endpoint, status, (time.perf_counter() - started) * 1000)
+    return status, headers, payload
+
+
+async def browse(client, user: VirtualUser, record) -> None:
+    rng = user.rng
+    sort_by = rng.choice(["id", "price", "name"])
+    await timed(client, record, "GET /products/", "GET",
+                f"/products/?page={rng.randint(1, 5)}&sort_by={sort_by}", user)
+    query = {"category": rng.choice(CATEGORIES), "sort_by": "price", "page_size": 20}
+    _, headers, _ = await timed(client, record, "GET /products/", "GET", f"/products/?{urlencode(query)}", user)
+    if headers.get("x-next-cursor"):
+        query["cursor"] = headers["x-next-cursor"]
+        await timed(client, record, "GET /products/", "GET", f"/products/?{urlencode(query)}", user)
+    for _ in range(3):
+        await timed(client, record, "GET /products/{product_id}", "GET",
+                    f"/products/{rng.randint(1, user.products)}", user)
+
+
+async def search(client, user: VirtualUser, record) -> None:
+    rng = user.rng
+    words = rng.sample(VOCABULARY, rng.randint(1, 2))
+    keyword = " ".join(word[:rng.randint(3, len(word))] for word in words)
+    await timed(client, record, "GET /products/search", "GET", f"/products/search?{urlencode({'keyword': keyword})}", user)
+
+
+async def add_to_cart(client, user: VirtualUser, record) -> None:
+    rng = user.rng
+    product_id = rng.randint(1, user.products)
+    await timed(client, record, "POST /cart/", "POST", "/cart/", user, {"product_id": product_id, "quantity": 1})
+    await timed(client, record, "GET /cart/", "GET", "/cart/", user)
+    await timed(client, record, "DELETE /cart/{product_id}", "DELETE", f"/cart/{product_id}", user)
+
+
+async def checkout(client, user: VirtualUser, record) -> None:
+    rng = user.rng
+    for product_id in rng.sample(range(1, user.products + 1), 2):
+        await timed(client, record, "POST /cart/", "POST", "/cart/", user,
+                    {"product_id": product_id, "quantity": rng.randint(1, 3)})
+    await timed(client, record, "POST /checkout/", "POST", "/checkout/", user)
+
+
+async def order_history(client, user: VirtualUser, record) -> None:
+    status, _, payload = await timed(client, record, "GET /orders/", "GET", "/orders/?page_size=20", user)
+    await timed(client, record, "GET /orders/summary", "GET", "/orders/summary?page_size=20", user)
+    orders = json.loads(payload) if status == 200 else []
+    if orders:
+        await timed(client, record, "GET /orders/{order_id}", "GET", f"/orders/{orders[0]['id']}", user)
+
+
+SCENARIOS = {
+    "browse": browse,
+    "search": search,
+    "add_to_cart": add_to_cart,
+    "checkout": checkout,
+    "order_history": order_history,
+}
@@ -0,0 +1,89 @@
+"""
+Benchmarks /products/search query latency: FTS5 index vs. the old ILIKE scan.
+
+Usage (from the ecommerce_api directory):
+    python -m benchmarks.search_benchmark [sizes...]
+
+Each size gets its own throwaway SQLite database under a temp directory.
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# The engine is created at import time, so point it at a scratch database first
+WORKDIR = tempfile.mkdtemp(prefix="search-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{WORKDIR}/placeholder.db"
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from app.core.database import Base  # noqa: E402
+from app.products.models import Product  # noqa: E402
+from app.products.search import init_search_index, search_products  # noqa: E402
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+VOCABULARY = [
+    "blue", "red", "green", "cotton", "leather", "wireless", "steel", "classic",
+    "shirt", "shoe", "lamp", "chair", "phone", "cable", "watch", "bottle",
+]
+# Pad the vocabulary with synthetic words so term frequencies look like a real catalog
+WORDS = VOCABULARY + [f"term{n}" for n in range(5_000)]
+CATEGORIES = ["apparel", "footwear", "home", "electronics", "outdoors"]
+KEYWORDS = ["blue shirt", "wire", "leather shoe", "lamp", "stee bott"]
+BATCH_SIZE = 10_000
+REPEATS = 20
+
+
+def seed(engine, size: int) -> None:
+    rng = random.Random(size)
+    with engine.begin() as conn:
+        for start in range(0, size, BATCH_SIZE):
+            rows = [
+                {
+                    "name": " ".join(rng.sample(WORDS, 3)),
+                    "description": " ".join(rng.choices(WORDS, k=12)),
+                    "price": round(rng.uniform(1, 500), 2),
+                    "stock": rng.randint(0, 100),
+                    "category": rng.choice(CATEGORIES),
+                    "image_url": f"https://img.example.com/{start}.png",
+                }
+                for _ in range(min(BATCH_SIZE, size - start))
+            ]
+            conn.execute(insert(Product), rows)
+
+
+def time_ms(fn) -> list[float]:
+    samples = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def run(size: int) -> None:
+    engine = create_engine(f"sqlite:///{WORKDIR}/products_{size}.db")
+    Base.metadata.create_all(bind=engine)
+    init_search_index(engine)
+    seed(engine, size)
+    Session = sessionmaker(bind=engine)
+
+    with Session() as db:
+        for keyword in KEYWORDS:
+            fts = time_ms(lambda: search_products(db, keyword, limit=20, offset=0))
+            scan = time_ms(
+                lambda: db.query(Product).filter(Product.name.ilike(f"%{keyword}%")).all()
+            )
+            print(
+                f"{size:>9} | {keyword:<13} | fts p50 {statistics.median(fts):8.2f} ms "
+                f"| ilike p50 {statistics.median(scan):8.2f} ms"
+            )
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        run(size)
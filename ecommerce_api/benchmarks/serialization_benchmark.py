@@ -0,0 +1,148 @@
+"""
+Measures the bytes and CPU each response body costs.
+
+Rows for typical responses are loaded once from a generated catalog:
+public listing pages, a search page, an admin page and an order history
+page. Each is then encoded in-process two ways:
+
+- before: FastAPI's response_model path, validating the ORM rows into the
+  schema and encoding them with the standard library (JSONResponse);
+- after: the route's precompiled Serializer and `dumps` (orjson if installed).
+
+The encoded body is then compressed with gzip, and brotli when the `brotli`
+package is installed, at the configured levels, to show the wire size and
+the CPU paid for it.
+
+Usage (from the ecommerce_api directory):
+    python -m benchmarks.serialization_benchmark [iterations]
+"""
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import zlib
+from typing import List
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='serialization-bench-')}/bench.db")
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
+from app.core.config import settings
+from app.core.compression import brotli
+from app.core.serialization import orjson
+
+SCALE = 2000
+REPEATS = 7
+
+
+def load_responses(db) -> dict:
+    """
+    Loads the rows behind each benchmarked response.
+
+    Args:
+        db (Session): Database session.
+
+    Returns:
+        dict: name -> (schema, serializer, rows).
+    """
+    from app.orders.models import Order
+    from app.orders.schemas import OrderOut, order_serializer
+    from app.products import search
+    from app.products.models import Product
+    from app.products.schemas import ProductOut, product_serializer
+
+    busiest_user = (
+        db.query(Order.user_id).group_by(Order.user_id).order_by(func.count().desc()).limit(1).scalar()
+    )
+    return {
+        "public list, 20 products": (
+            ProductOut, product_serializer, db.query(Product).order_by(Product.id).limit(20).all()
+        ),
+        "public list, 100 products": (
+            ProductOut, product_serializer, db.query(Product).order_by(Product.id).limit(100).all()
+        ),
+        "search, 20 products": (ProductOut, product_serializer, search.search_products(db, "blue", limit=20, offset=0)),
+        "admin list, 500 products": (
+            ProductOut, product_serializer, db.query(Product).order_by(Product.id).limit(500).all()
+        ),
+        "order history, 20 orders": (
+            OrderOut, order_serializer,
+            db.query(Order).options(selectinload(Order.items))
+            .filter(Order.user_id == busiest_user).order_by(Order.id.desc()).limit(20).all()
+        ),
+    }
+
+
+def encode_before(field, rows) -> bytes:
+    # serialize_response never suspends for a coroutine endpoint, so it is
+    # stepped directly instead of paying for an event loop per call
+    try:
+        serialize_response(field=field, response_content=rows).send(None)
+    except StopIteration as done:
+        return JSONResponse(done.value).body
+    raise RuntimeError("serialize_response suspended")
+
+
+def timed(func, iterations: int) -> tuple[float, bytes]:
+    """
+    Args:
+        func: Callable returning the encoded body.
+        iterations (int): Calls per sample.
+
+    Returns:
+        tuple[float, bytes]: Median µs per call over REPEATS samples, and the last result.
+    """
+    samples = []
+    for _ in range(REPEATS):
+        started = time.process_time()
+        for _ in range(iterations):
+            result = func()
+        samples.append((time.process_time() - started) / iterations * 1e6)
+    return statistics.median(samples), result
+
+
+def run(iterations: int) -> None:
+    from app.core.database import SessionLocal, get_engine
+    from app.core.migrations import run_migrations
+    from benchmarks.datagen import generate
+
+    engine = get_engine()
+    run_migrations(engine)
+    generate(engine, SCALE, seed=1)
+
+    codecs = {"gzip": lambda body: zlib.compress(body, settings.GZIP_LEVEL, wbits=31)}
+    if brotli is not None:
+        codecs["br"] = lambda body: brotli.compress(body, quality=settings.BROTLI_QUALITY)
+
+    print(f"\nJSON encoder: {'orjson' if orjson is not None else 'json (orjson not installed)'}")
+    print(f"\nEncoding, µs of CPU per response ({iterations} iterations, median of {REPEATS})")
+    print(f"{'response':<28}{'before':>12}{'after':>12}{'speedup':>10}{'bytes':>10}")
+    bodies = {}
+    with SessionLocal() as db:
+        for name, (schema, serializer, rows) in load_responses(db).items():
+            field = create_model_field(name="Response", type_=List[schema], mode="serialization")
+            before, old_body = timed(lambda: encode_before(field, rows), iterations)
+            after, body = timed(lambda: serializer.response(rows).body, iterations)
+            assert json.loads(old_body) == json.loads(body), name
+            print(f"{name:<28}{before:>12.1f}{after:>12.1f}{before / after:>9.1f}x{len(body):>10}")
+            bodies[name] = body
+
+    print(f"\nCompression, µs of CPU and bytes on the wire (gzip level {settings.GZIP_LEVEL}"
+          + (f", brotli quality {settings.BROTLI_QUALITY})" if brotli is not None else "; brotli not installed)"))
+    print(f"{'response':<28}{'identity':>10}" + "".join(f"{codec + ' µs':>10}{codec + ' bytes':>12}" for codec in codecs))
+    for name, body in bodies.items():
+        line = f"{name:<28}{len(body):>10}"
+        for compress in codecs.values():
+            micros, compressed = timed(lambda: compress(body), iterations)
+            line += f"{micros:>10.1f}{len(compressed):>12}"
+        print(line)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
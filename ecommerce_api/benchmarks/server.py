@@ -0,0 +1,101 @@
+"""
+Helpers for benchmarks that drive a real uvicorn server over HTTP.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+
+PASSWORD = "Bench@123"
+
+
+def call(base_url: str, method: str, path: str, body: dict = None, token: str = None) -> tuple[int, dict]:
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(base_url + path, data=data, method=method)
+    request.add_header("Content-Type", "application/json")
+    if token:
+        request.add_header("Authorization", f"Bearer {token}")
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            return response.status, json.loads(response.read() or b"null")
+    except urllib.error.HTTPError as error:
+        return error.code, {}
+
+
+@contextmanager
+def running_server(port: int, env: dict = None, workers: int = 1, database_url: str = None):
+    """
+    Runs `uvicorn app.main:app`, by default against a fresh SQLite database.
+
+    Args:
+        port (int): Port to listen on.
+        env (dict, optional): Extra environment variables for the server.
+        workers (int): Number of uvicorn worker processes.
+        database_url (str, optional): Existing database to serve instead of a fresh one.
+
+    Yields:
+        str: Base URL of the running server.
+    """
+    if database_url is None:
+        database_url = f"sqlite:///{tempfile.mkdtemp(prefix='bench-server-')}/bench.db"
+    server_env = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        SECRET_KEY=os.environ.get("SECRET_KEY", "bench-secret"),
+        **(env or {}),
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env=server_env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(200):
+            try:
+                call(base_url, "GET", "/")
+                break
+            except OSError:
+                time.sleep(0.1)
+        else:
+            raise RuntimeError("server did not start")
+        yield base_url
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
+
+
+def seed_over_http(base_url: str, products: int = 50) -> dict:
+    """
+    Creates an admin, a normal user and some products through the API.
+
+    Args:
+        base_url (str): Base URL of the server.
+        products (int): Number of products to create.
+
+    Returns:
+        dict: Access tokens keyed by "admin" and "user".
+    """
+    tokens = {}
+    for role in ("admin", "user"):
+        email = f"{role}@bench.io"
+        call(base_url, "POST", "/auth/signup", {"name": role, "email": email, "password": PASSWORD, "role": role})
+        _, body = call(base_url, "POST", "/auth/signin", {"email": email, "password": PASSWORD})
+        tokens[role] = body["access_token"]
+    for n in range(products):
+        call(base_url, "POST", "/admin/products/", {
+            "name": f"Product {n}", "description": "desc", "price": 9.99,
+            "stock": 10, "category": "bench", "image_url": "img",
+        }, token=tokens["admin"])
+    return tokens
@@ -0,0 +1,111 @@
+"""
+Compares the default SQLite connection settings with the tuned profile
+from app/core/database.py under a mixed read/write load.
+
+Usage (from the ecommerce_api directory):
+    python -m benchmarks.sqlite_profile_benchmark [seconds] [readers] [writers]
+
+Readers fetch random products; writers add cart rows and commit one at a
+time, the same shape as POST /cart/.
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+WORKDIR = tempfile.mkdtemp(prefix="sqlite-profile-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{WORKDIR}/placeholder.db"
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from app.core.database import Base, create_db_engine  # noqa: E402
+from app.auth.models import User  # noqa: E402,F401
+from app.cart.models import CartItem  # noqa: E402
+from app.orders.models import Order  # noqa: E402,F401
+from app.products.models import Product  # noqa: E402
+
+PRODUCTS = 20_000
+
+
+def seed(engine) -> None:
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Product), [
+            {"name": f"Product {n}", "description": "desc", "price": n % 100 + 0.99,
+             "stock": 10, "category": f"cat{n % 20}", "image_url": "img"}
+            for n in range(PRODUCTS)
+        ])
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    return statistics.quantiles(samples, n=100)[int(pct) - 1] if len(samples) > 1 else samples[0]
+
+
+def run(label: str, engine, seconds: float, readers: int, writers: int) -> None:
+    seed(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    stop = time.monotonic() + seconds
+    reads, writes, errors = [], [], []
+    lock = threading.Lock()
+
+    def reader(seed_value: int) -> None:
+        rng = random.Random(seed_value)
+        local = []
+        while time.monotonic() < stop:
+            started = time.perf_counter()
+            with Session() as db:
+                db.query(Product).filter(Product.id == rng.randint(1, PRODUCTS)).first()
+            local.append((time.perf_counter() - started) * 1000)
+        with lock:
+            reads.extend(local)
+
+    def writer(seed_value: int) -> None:
+        rng = random.Random(seed_value)
+        local, failed = [], 0
+        while time.monotonic() < stop:
+            started = time.perf_counter()
+            try:
+                with Session() as db:
+                    db.add(CartItem(user_id=seed_value, product_id=rng.randint(1, PRODUCTS), quantity=1))
+                    db.commit()
+            except OperationalError:
+                failed += 1
+                continue
+            local.append((time.perf_counter() - started) * 1000)
+        with lock:
+            writes.extend(local)
+            errors.append(failed)
+
+    threads = [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+    threads += [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    print(
+        f"{label:<8} | reads {len(reads) / seconds:8.0f}/s p50 {percentile(reads, 50):6.2f} ms "
+        f"p99 {percentile(reads, 99):7.2f} ms | writes {len(writes) / seconds:6.0f}/s "
+        f"p50 {percentile(writes, 50):6.2f} ms p99 {percentile(writes, 99):7.2f} ms "
+        f"| write errors {sum(errors)}"
+    )
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    readers = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    writers = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+
+    baseline = create_engine(
+        f"sqlite:///{WORKDIR}/baseline.db",
+        connect_args={"check_same_thread": False}
+    )
+    run("default", baseline, seconds, readers, writers)
+    run("tuned", create_db_engine(f"sqlite:///{WORKDIR}/tuned.db"), seconds, readers, writers)
@@ -0,0 +1,112 @@
+"""
+Measures worker spawn cost: module import time and cold start to readiness.
+
+Import time is taken in fresh interpreters and also checks that importing
+the app does not create or open the database. Cold start spawns uvicorn and
+polls /health/ready until it returns 200, against an empty database (schema
+created by migrations) and against a generated one (see benchmarks/datagen.py),
+and reports the per-phase timings the app publishes.
+
+The last line of output is a JSON summary that can be stored to track the
+numbers over time.
+
+Usage (from the ecommerce_api directory):
+    python -m benchmarks.startup_benchmark [runs] [scale]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+PORT = 8768
+IMPORT_PROBE = (
+    "import time; started = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - started)"
+)
+
+
+def import_time(runs: int) -> dict:
+    workdir = tempfile.mkdtemp(prefix="startup-bench-")
+    db_path = os.path.join(workdir, "untouched.db")
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}", SECRET_KEY="bench-secret")
+    samples = []
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, "-c", IMPORT_PROBE], env=env, stderr=subprocess.DEVNULL)
+        samples.append(float(output.decode().split()[-1]) * 1000)
+    return {
+        "median_ms": round(statistics.median(samples), 1),
+        "min_ms": round(min(samples), 1),
+        "touched_database": os.path.exists(db_path),
+    }
+
+
+def cold_start(database_url: str) -> dict:
+    env = dict(os.environ, DATABASE_URL=database_url, SECRET_KEY="bench-secret")
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(PORT), "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError("server exited during startup")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{PORT}/health/ready", timeout=5) as response:
+                    body = json.loads(response.read())
+                    break
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.005)
+        return {"ready_ms": (time.perf_counter() - started) * 1000, "phases": body["startup_ms"]}
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
+
+
+def cold_starts(runs: int, make_database) -> dict:
+    results = [cold_start(make_database()) for _ in range(runs)]
+    phases = results[0]["phases"].keys()
+    return {
+        "ready_median_ms": round(statistics.median(result["ready_ms"] for result in results), 1),
+        "ready_min_ms": round(min(result["ready_ms"] for result in results), 1),
+        "phases_median_ms": {
+            phase: round(statistics.median(result["phases"][phase] for result in results), 2) for phase in phases
+        },
+    }
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    scale = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+
+    summary = {"runs": runs, "scale": scale, "import": import_time(runs)}
+    print(f"import app.main   {summary['import']}")
+
+    def empty_database() -> str:
+        return f"sqlite:///{tempfile.mkdtemp(prefix='startup-bench-')}/empty.db"
+
+    summary["cold_start_empty"] = cold_starts(runs, empty_database)
+    print(f"cold start, empty {summary['cold_start_empty']}")
+
+    seeded = os.path.join(tempfile.mkdtemp(prefix="startup-bench-"), "seeded.db")
+    subprocess.run(
+        [sys.executable, "-m", "benchmarks.datagen", seeded, str(scale)],
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    summary["cold_start_seeded"] = cold_starts(runs, lambda: f"sqlite:///{seeded}")
+    print(f"cold start, {scale} products {summary['cold_start_seeded']}")
+
+    print(json.dumps(summary))
@@ -0,0 +1,57 @@
+import os
+import tempfile
+
+# Settings and the engine are read at import time, so point them at a
+# throwaway database before the app is imported
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='ecommerce-tests-')}/test.db"
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("IDEMPOTENCY_SWEEP_SECONDS", "0")
+
+import itertools  # noqa: E402
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from app.main import app  # noqa: E402
+from helpers import sign_up  # noqa: E402
+
+CATEGORIES = ("apparel", "home", "toys")
+user_numbers = itertools.count(1)
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client) -> dict:
+    return sign_up(client, "admin@example.com", "admin")
+
+
+@pytest.fixture
+def user_headers(client) -> dict:
+    """
+    A new user per test, so carts and orders do not leak between tests.
+    """
+    return sign_up(client, f"user{next(user_numbers)}@example.com", "user")
+
+
+@pytest.fixture(scope="session")
+def product_ids(client, admin_headers) -> list[int]:
+    """
+    Thirty products spread over three categories, with plenty of stock.
+    """
+    ids = []
+    for n in range(30):
+        response = client.post("/admin/products/", headers=admin_headers, json={
+            "name": f"Product {n}",
+            "description": "blue cotton item",
+            "price": float(n % 7 + 1),
+            "stock": 1000,
+            "category": CATEGORIES[n % len(CATEGORIES)],
+            "image_url": "https://example.com/image.png",
+        })
+        assert response.status_code == 200, response.text
+        ids.append(response.json()["id"])
+    return ids
@@ -0,0 +1,50 @@
+from fastapi.testclient import TestClient
+
+PASSWORD = "Test@123"
+
+
+def sign_up(client: TestClient, email: str, role: str) -> dict:
+    """
+    Creates an account and signs it in.
+
+    Args:
+        client (TestClient): Client for the app.
+        email (str): Account email.
+        role (str): "admin" or "user".
+
+    Returns:
+        dict: Authorization header for the account.
+    """
+    response = client.post("/auth/signup", json={"name": "Test", "email": email, "password": PASSWORD, "role": role})
+    assert response.status_code == 200, response.text
+    response = client.post("/auth/signin", json={"email": email, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def fill_cart(client: TestClient, headers: dict, product_ids: list[int]) -> None:
+    """
+    Sets one unit of each product in the user's cart.
+
+    Args:
+        client (TestClient): Client for the app.
+        headers (dict): The user's Authorization header.
+        product_ids (list[int]): Products to add.
+    """
+    response = client.patch("/cart/", headers=headers, json={
+        "operations": [{"op": "set", "product_id": product_id, "quantity": 1} for product_id in product_ids]
+    })
+    assert response.status_code == 200, response.text
+
+
+def place_order(client: TestClient, headers: dict, product_ids: list[int]) -> int:
+    """
+    Checks out a cart holding one unit of each product.
+
+    Returns:
+        int: ID of the new order.
+    """
+    fill_cart(client, headers, product_ids)
+    response = client.post("/checkout/", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["order_id"]
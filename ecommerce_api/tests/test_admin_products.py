@@ -0,0 +1,55 @@
+"""
+Admin product writes: SKU clashes and bulk import accounting.
+"""
+import json
+import sqlite3
+import pytest
+from sqlalchemy.exc import IntegrityError
+from app.products.routes import is_sku_clash
+
+PRODUCT = {
+    "name": "Bulk item",
+    "description": "blue cotton item",
+    "price": 3.0,
+    "stock": 10,
+    "category": "home",
+    "image_url": "https://example.com/image.png",
+}
+
+
+def test_duplicate_sku_is_a_conflict(client, admin_headers):
+    response = client.post("/admin/products/", headers=admin_headers, json={**PRODUCT, "sku": "CLASH-1"})
+    assert response.status_code == 200, response.text
+    response = client.post("/admin/products/", headers=admin_headers, json={**PRODUCT, "sku": "CLASH-1"})
+    assert response.status_code == 409, response.text
+    assert "CLASH-1" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("message, clash", [
+    ("UNIQUE constraint failed: products.sku", True),
+    ('duplicate key value violates unique constraint "ix_products_sku"', True),
+    ("NOT NULL constraint failed: products.name", False),
+    ("FOREIGN KEY constraint failed", False),
+])
+def test_only_sku_index_errors_are_clashes(message, clash):
+    error = IntegrityError("INSERT INTO products ...", {}, sqlite3.IntegrityError(message))
+    assert is_sku_clash(error) is clash
+
+
+def test_bulk_reports_repeated_skus(client, admin_headers):
+    rows = [
+        {**PRODUCT, "sku": "BULK-1", "stock": 1},
+        {**PRODUCT, "sku": "BULK-2"},
+        {**PRODUCT, "sku": "BULK-1", "stock": 2},
+        {**PRODUCT},
+    ]
+    body = "\n".join(json.dumps(row) for row in rows)
+    response = client.post(
+        "/admin/products/bulk?format=ndjson",
+        headers=admin_headers,
+        files={"file": ("products.ndjson", body.encode(), "application/x-ndjson")},
+    )
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert (result["received"], result["imported"], result["failed"]) == (4, 3, 1)
+    assert result["errors"] == [{"row": 1, "errors": ["sku: superseded by row 3 with the same SKU"]}]
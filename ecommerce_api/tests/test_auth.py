@@ -0,0 +1,34 @@
+"""
+Sign-in and password reset with bcrypt running in the worker pool.
+"""
+import threading
+from app.auth import utils
+from app.core.config import settings
+from helpers import PASSWORD, sign_up
+
+
+def test_signin_and_reset_password(client):
+    sign_up(client, "reset-me@example.com", "user")
+    token = client.post("/auth/forgot-password", json={"email": "reset-me@example.com"}).json()["reset_token"]
+    response = client.post("/auth/reset-password", json={"token": token, "new_password": "New@1234"})
+    assert response.status_code == 200, response.text
+
+    response = client.post("/auth/signin", json={"email": "reset-me@example.com", "password": PASSWORD})
+    assert response.status_code == 401, response.text
+    response = client.post("/auth/signin", json={"email": "reset-me@example.com", "password": "New@1234"})
+    assert response.status_code == 200, response.text
+    # A reset token works once
+    response = client.post("/auth/reset-password", json={"token": token, "new_password": "New@1234"})
+    assert response.status_code == 400, response.text
+
+
+def test_signin_busy_when_hash_queue_full(client, monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_WORKERS", 1)
+    monkeypatch.setattr(utils, "_hash_slots", threading.BoundedSemaphore(1))
+    utils._hash_slots.acquire()
+    response = client.post("/auth/signin", json={"email": "nobody@example.com", "password": PASSWORD})
+    # Unknown emails skip the hash
+    assert response.status_code == 401, response.text
+    response = client.post("/auth/signup", json={"name": "Test", "email": "busy@example.com", "password": PASSWORD, "role": "user"})
+    assert response.status_code == 503, response.text
+    assert response.headers["retry-after"] == "1"
@@ -0,0 +1,35 @@
+"""
+Checkout must never take a negative or zero quantity from a cart.
+"""
+from sqlalchemy import update
+from app.cart.models import CartItem
+from app.core.database import SessionLocal
+
+
+def stock_of(client, product_id: int) -> int:
+    return client.get(f"/products/{product_id}").json()["stock"]
+
+
+def test_cart_rejects_non_positive_quantity(client, user_headers, product_ids):
+    for quantity in (0, -5):
+        response = client.post("/cart/", headers=user_headers, json={"product_id": product_ids[0], "quantity": quantity})
+        assert response.status_code == 422, response.text
+    assert client.get("/cart/", headers=user_headers).json() == []
+
+
+def test_negative_line_cannot_be_checked_out(client, user_headers, product_ids):
+    product_id = product_ids[0]
+    response = client.post("/cart/", headers=user_headers, json={"product_id": product_id, "quantity": 1})
+    assert response.status_code == 200, response.text
+    # A line written before the schema check existed, or by other code
+    with SessionLocal() as db:
+        db.execute(update(CartItem).where(CartItem.id == response.json()["id"]).values(quantity=-5))
+        db.commit()
+    stock = stock_of(client, product_id)
+
+    response = client.post("/checkout/", headers=user_headers)
+    assert response.status_code == 409, response.text
+    assert stock_of(client, product_id) == stock
+    assert client.get("/orders/", headers=user_headers).json() == []
+    # The rejected checkout keeps the cart
+    assert [line["quantity"] for line in client.get("/cart/", headers=user_headers).json()] == [-5]
@@ -0,0 +1,23 @@
+"""
+Compressible responses always vary on Accept-Encoding.
+"""
+import pytest
+
+
+@pytest.mark.parametrize("accept_encoding, content_encoding", [
+    ("gzip", "gzip"),
+    ("identity", None),
+    ("gzip;q=0", None),
+])
+def test_listing_varies_on_accept_encoding(client, product_ids, accept_encoding, content_encoding):
+    response = client.get("/products/?page_size=30", headers={"Accept-Encoding": accept_encoding})
+    assert response.status_code == 200, response.text
+    assert response.headers.get("content-encoding") == content_encoding
+    assert response.headers.get_list("vary") == ["Accept-Encoding"]
+
+
+def test_small_body_varies_on_accept_encoding(client):
+    response = client.get("/products/0", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 404, response.text
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
@@ -0,0 +1,31 @@
+"""
+Stopping logging hands the root logger back instead of leaving a queue behind.
+"""
+import io
+import logging
+from app.core import logs
+from app.core.config import settings
+
+
+def test_stop_logging_restores_root_handlers(monkeypatch):
+    monkeypatch.setattr(settings, "LOG_QUEUE_SIZE", 10)
+    root = logging.getLogger()
+    logs.stop_logging()
+    before = list(root.handlers)
+    sink = io.StringIO()
+    try:
+        logs.setup_logging(stream=sink)
+        assert any(isinstance(handler, logs.RequestQueueHandler) for handler in root.handlers)
+        logging.getLogger("tests.logging").warning("while running")
+        logs.stop_logging()
+
+        assert "while running" in sink.getvalue()
+        assert root.handlers == before
+        for _ in range(20):
+            logging.getLogger("tests.logging").warning("after shutdown")
+        assert logs.dropped_records() == 0
+        assert "after shutdown" not in sink.getvalue()
+    finally:
+        # Back to the configuration the app's lifespan installed
+        monkeypatch.undo()
+        logs.setup_logging()
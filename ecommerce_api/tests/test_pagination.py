@@ -0,0 +1,39 @@
+"""
+Cursor tokens are validated before they reach a keyset comparison.
+"""
+import base64
+import json
+import pytest
+from app.core.pagination import encode_cursor
+
+
+def token(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("cursor", [
+    "zz",
+    token({"id": 1}),
+    token(["price", {"a": 1}, 3]),
+    token(["price", [1], 3]),
+    token(["price", 2.0, "3"]),
+    token(["price", 2.0, True]),
+    token(["price", None, 3]),
+    token(["price", 2.0]),
+])
+def test_malformed_product_cursor_is_rejected(client, product_ids, cursor):
+    response = client.get("/products/", params={"sort_by": "price", "cursor": cursor})
+    assert response.status_code == 400, response.text
+
+
+@pytest.mark.parametrize("cursor", [token([{"a": 1}, 3]), token(["2024-01-01T00:00:00", [3]])])
+def test_malformed_order_cursor_is_rejected(client, user_headers, cursor):
+    response = client.get("/orders/", headers=user_headers, params={"cursor": cursor})
+    assert response.status_code == 400, response.text
+
+
+def test_admin_cursor_must_hold_an_id(client, admin_headers, product_ids):
+    response = client.get("/admin/products/", headers=admin_headers, params={"cursor": token([{"a": 1}])})
+    assert response.status_code == 400, response.text
+    response = client.get("/admin/products/", headers=admin_headers, params={"cursor": encode_cursor([product_ids[0]])})
+    assert response.status_code == 200, response.text
@@ -0,0 +1,93 @@
+"""
+Routes must stay within their QUERY_BUDGETS entry with strict budgets on.
+
+Carts and orders hold many lines, so a per-line query (N+1) pushes a route
+over its budget and the request raises QueryBudgetExceeded. Caches are
+cleared before each call, matching the cold-cache counts the budgets assume.
+"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app.auth.dependencies import user_cache
+from app.cart.cache import summary_cache
+from app.core.config import settings
+from app.core.database import get_engine
+from app.core.instrumentation import QueryBudgetExceeded, assert_max_queries, track_queries
+from app.main import QUERY_BUDGETS
+from app.products.cache import listing_cache, product_cache
+from helpers import fill_cart, place_order
+
+LINES = 20
+
+
+@pytest.fixture(autouse=True)
+def strict_budgets(monkeypatch):
+    monkeypatch.setattr(settings, "SQL_STRICT_QUERY_BUDGETS", True)
+
+
+def cold_call(client, method: str, path: str, **kwargs):
+    """
+    Sends a request with every cache empty and checks it succeeded.
+    """
+    for cache in (user_cache, listing_cache, product_cache, summary_cache):
+        cache.clear()
+    response = client.request(method, path, **kwargs)
+    assert response.status_code == 200, response.text
+    return response
+
+
+@pytest.mark.parametrize("path", [
+    "/products/",
+    "/products/?sort_by=price&page=2&include_total=true",
+    "/products/?category=home&min_price=2&sort_by=name",
+])
+def test_listing_within_budget(client, product_ids, path):
+    cold_call(client, "GET", path)
+
+
+def test_cart_routes_within_budget(client, user_headers, product_ids):
+    fill_cart(client, user_headers, product_ids[:LINES])
+    assert len(cold_call(client, "GET", "/cart/", headers=user_headers).json()) == LINES
+    assert len(cold_call(client, "GET", "/cart/summary", headers=user_headers).json()["items"]) == LINES
+    cold_call(client, "PATCH", "/cart/", headers=user_headers, json={
+        "operations": [{"op": "add", "product_id": product_id, "quantity": 1} for product_id in product_ids[:LINES]]
+    })
+    cold_call(client, "POST", "/checkout/", headers=user_headers)
+
+
+def test_order_routes_within_budget(client, user_headers, product_ids):
+    order_id = place_order(client, user_headers, product_ids[:LINES])
+    place_order(client, user_headers, product_ids[LINES:])
+    orders = cold_call(client, "GET", "/orders/", headers=user_headers).json()
+    assert sum(len(order["items"]) for order in orders) == len(product_ids)
+    assert len(cold_call(client, "GET", f"/orders/{order_id}", headers=user_headers).json()["items"]) == LINES
+    cold_call(client, "GET", "/orders/summary", headers=user_headers)
+
+
+def test_budgets_cover_the_checked_routes():
+    for route in ("GET /products/", "GET /cart/", "GET /cart/summary", "PATCH /cart/",
+                  "POST /checkout/", "GET /orders/", "GET /orders/{order_id}", "GET /orders/summary"):
+        assert route in QUERY_BUDGETS, route
+
+
+def test_overrun_fails_in_strict_mode(client, product_ids, monkeypatch):
+    monkeypatch.setitem(QUERY_BUDGETS, "GET /products/", 0)
+    listing_cache.clear()
+    with pytest.raises(QueryBudgetExceeded):
+        client.get("/products/?page_size=3")
+
+
+def test_assert_max_queries(client, product_ids):
+    listing_cache.clear()
+    with pytest.raises(QueryBudgetExceeded):
+        with assert_max_queries(1):
+            client.get("/products/?page_size=4")
+
+
+def test_failed_statement_leaves_no_start_time():
+    with get_engine().connect() as conn, track_queries() as stats:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM no_such_table"))
+        conn.execute(text("SELECT 1"))
+        assert conn.info.get("query_start_time") == []
+    assert stats.statements == 1
@@ -0,0 +1,131 @@
+"""
+Every statement the hot routes run must be served by an index.
+
+The statements are captured from real requests with `track_queries` and
+cold caches, then explained against the same database, so the check
+follows the routes as they change. A plan step that walks any table
+without an index fails the test, unless the table is in ALLOWED_SCANS or
+the step is an unfiltered walk in primary-key order that stops at a LIMIT
+(the default listing page).
+"""
+import re
+import pytest
+from app.cart.cache import summary_cache
+from app.core.database import get_engine
+from app.core.instrumentation import track_queries
+from app.products.cache import listing_cache, product_cache
+from helpers import PASSWORD, fill_cart, place_order, sign_up
+
+FULL_SCAN = re.compile(r"^SCAN (\w+)\b(?!.* USING (COVERING )?INDEX)")
+# Scans that are intended, keyed by table, with the reason
+ALLOWED_SCANS = {
+    "products_fts": "full-text MATCH, answered by the FTS5 index of the virtual table",
+}
+EXPLAINABLE = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+# (name, method, path, body); paths are formatted with the `ids` fixture below
+ROUTES = [
+    ("list by id", "GET", "/products/?page=2", None),
+    ("list by price", "GET", "/products/?sort_by=price", None),
+    ("list by name", "GET", "/products/?sort_by=name&page_size=5", None),
+    ("list category", "GET", "/products/?category=home&min_price=2&max_price=5&include_total=true", None),
+    ("list cursor", "GET", "/products/?sort_by=price&cursor={price_cursor}", None),
+    ("search", "GET", "/products/search?keyword=blue", None),
+    ("product", "GET", "/products/{product}", None),
+    ("batch", "POST", "/products/batch", {"ids": "{batch}"}),
+    ("cart", "GET", "/cart/", None),
+    ("cart summary", "GET", "/cart/summary", None),
+    ("cart update", "PATCH", "/cart/", {"operations": [{"op": "add", "product_id": "{product}", "quantity": 1}]}),
+    ("checkout", "POST", "/checkout/", None),
+    ("orders", "GET", "/orders/", None),
+    ("orders cursor", "GET", "/orders/?page_size=1&cursor={order_cursor}", None),
+    ("order", "GET", "/orders/{order}", None),
+    ("order summary", "GET", "/orders/summary", None),
+    ("admin list", "GET", "/admin/products/?category=toys", None),
+    ("signin", "POST", "/auth/signin", {"email": "{email}", "password": PASSWORD}),
+    ("forgot password", "POST", "/auth/forgot-password", {"email": "{email}"}),
+    ("reset password", "POST", "/auth/reset-password", {"token": "{reset_token}", "new_password": PASSWORD}),
+]
+
+
+@pytest.fixture
+def ids(client, user_headers, product_ids) -> dict:
+    """
+    Gives the user two orders and a non-empty cart, gives a second account a
+    pending password reset, and collects the IDs, cursors and token the
+    routes refer to.
+    """
+    order = place_order(client, user_headers, product_ids[:3])
+    place_order(client, user_headers, product_ids[3:5])
+    fill_cart(client, user_headers, product_ids[5:8])
+    email = f"reset{order}@example.com"
+    sign_up(client, email, "user")
+    response = client.post("/auth/forgot-password", json={"email": email})
+    assert response.status_code == 200, response.text
+    return {
+        "email": email,
+        "reset_token": response.json()["reset_token"],
+        "product": product_ids[0],
+        "batch": product_ids[:5],
+        "order": order,
+        "price_cursor": client.get("/products/?sort_by=price").headers["x-next-cursor"],
+        "order_cursor": client.get("/orders/?page_size=1", headers=user_headers).headers["x-next-cursor"],
+    }
+
+
+def fill(value, ids: dict):
+    """
+    Substitutes "{name}" placeholders in a path or JSON body.
+    """
+    if isinstance(value, str):
+        if value.startswith("{") and value.endswith("}") and value[1:-1] in ids:
+            return ids[value[1:-1]]
+        return value.format(**ids)
+    if isinstance(value, list):
+        return [fill(item, ids) for item in value]
+    if isinstance(value, dict):
+        return {key: fill(item, ids) for key, item in value.items()}
+    return value
+
+
+def explain(statement: str, parameters) -> list[str]:
+    """
+    Returns the EXPLAIN QUERY PLAN details of a captured statement.
+    """
+    with get_engine().connect() as conn:
+        return [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters or ())]
+
+
+def bounded_key_walk(statement: str, plan: list[str]) -> bool:
+    """
+    Whether a scan reads rows in rowid order without filtering or sorting
+    them, so it stops after LIMIT (plus OFFSET) rows.
+    """
+    statement = " ".join(statement.split()).upper()
+    return " WHERE " not in statement and " LIMIT " in statement and not any("TEMP B-TREE" in detail for detail in plan)
+
+
+@pytest.mark.parametrize("name, method, path, body", ROUTES, ids=[route[0] for route in ROUTES])
+def test_route_queries_use_indexes(client, admin_headers, user_headers, ids, name, method, path, body):
+    headers = admin_headers if path.startswith("/admin") else user_headers
+    # Cold caches, so the route runs every query it can
+    for cache in (listing_cache, product_cache, summary_cache):
+        cache.clear()
+    with track_queries(capture=True) as stats:
+        response = client.request(method, fill(path, ids), headers=headers, json=fill(body, ids))
+    assert response.status_code == 200, response.text
+
+    explained = [
+        (statement, explain(statement, parameters))
+        for statement, parameters in stats.executed
+        if statement.lstrip().upper().startswith(EXPLAINABLE)
+    ]
+    assert explained, f"{name} ran no queries to check"
+    scans = [
+        (" ".join(statement.split()), detail)
+        for statement, plan in explained for detail in plan
+        if (match := FULL_SCAN.match(detail))
+        and match.group(1) not in ALLOWED_SCANS
+        and not bounded_key_walk(statement, plan)
+    ]
+    assert not scans, f"{name} scans a table: {scans}"
@@ -0,0 +1,79 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.core.cache import SingleFlightCache
+
+
+def test_concurrent_misses_load_once():
+    cache = SingleFlightCache(max_size=10, ttl=60)
+    calls = []
+    start = threading.Barrier(8)
+
+    def load():
+        calls.append(1)
+        time.sleep(0.1)
+        return "value"
+
+    def lookup(results):
+        start.wait()
+        results.append(cache.get_or_load("key", load))
+
+    results = []
+    threads = [threading.Thread(target=lookup, args=(results,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["value"] * 8
+    assert len(calls) == 1
+    assert cache.stats()["coalesced"] == 7
+
+
+def test_waiter_loads_directly_after_timeout():
+    cache = SingleFlightCache(max_size=10, ttl=60, wait_timeout=0.05)
+    release = threading.Event()
+    leader = threading.Thread(target=cache.get_or_load, args=("key", lambda: release.wait(5) and "slow"))
+    leader.start()
+    time.sleep(0.02)
+    started = time.monotonic()
+    assert cache.get_or_load("key", lambda: "direct") == "direct"
+    assert time.monotonic() - started < 1
+    release.set()
+    leader.join()
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    cache = SingleFlightCache(max_size=10, ttl=60)
+
+    async def boom():
+        await asyncio.sleep(0.05)
+        raise ValueError("boom")
+
+    async def lookups():
+        return await asyncio.gather(*(cache.get_or_load_async("key", boom) for _ in range(5)), return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in asyncio.run(lookups()))
+    assert cache.get("key") is None
+
+
+def test_async_waiter_loads_directly_after_timeout():
+    cache = SingleFlightCache(max_size=10, ttl=60, wait_timeout=0.05)
+
+    async def slow():
+        await asyncio.sleep(1)
+        return "slow"
+
+    async def direct():
+        return "direct"
+
+    async def lookups():
+        leader = asyncio.create_task(cache.get_or_load_async("key", slow))
+        await asyncio.sleep(0.01)
+        result = await cache.get_or_load_async("key", direct)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return result
+
+    assert asyncio.run(lookups()) == "direct"